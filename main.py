@@ -7,10 +7,9 @@ Main application entry point
 import sys
 import argparse
 from src.utils.logger import setup_logger
+from src.utils.ssl_setup import configure_ca_bundle
 from src.config import config
 from nicegui import ui
-import platform
-import os
 
 # Setup logging
 logger = setup_logger(__name__)
@@ -53,14 +52,23 @@ def main():
         # (see src/app.py for lambda: self.add_jira_ticket())
         # No further action needed here, but this comment documents the async support
 
-        # Run the application
-        ui.run(
-            host=host,
-            port=port,
-            title=config.app_config['title'],
-            show=True,
-            reload=args.debug
-        )
+        # Run the application; only debug mode pays for the reload file watcher
+        if args.debug:
+            ui.run(
+                host=host,
+                port=port,
+                title=config.app_config['title'],
+                show=False,
+                reload=True
+            )
+        else:
+            ui.run(
+                host=host,
+                port=port,
+                title=config.app_config['title'],
+                show=True,
+                reload=False
+            )
         
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
@@ -72,15 +80,6 @@ def main():
 
 if __name__ == "__main__":
     # Set the path for the PEM file used for SSL certificate verification
-    platformtype = platform.system()
-
-    if platformtype == "Linux":
-        os.environ['REQUESTS_CA_BUNDLE'] = "/etc/ssl/certs/ca-certificates.crt"
-        os.environ['SSL_CERT_FILE']      = "/etc/ssl/certs/ca-certificates.crt"
-    elif platformtype == "Darwin":
-        pem_path = "/usr/local/etc/openssl@3/certs/../cert.pem"
-        os.environ['REQUESTS_CA_BUNDLE'] = pem_path
-        os.environ['SSL_CERT_FILE'] = pem_path
-    else:
+    if not configure_ca_bundle():
         print("Unsupported platform. Please set the SSL_CERT_FILE environment variable manually.")
     main()
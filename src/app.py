@@ -4,13 +4,25 @@ MCP-based Root Cause Analysis Tool
 Main application using NiceGUI
 """
 
+import ast
 import asyncio
+import copy
+import json
+import logging
+import os
+import re
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
-from nicegui import ui, app
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import orjson
+from nicegui import ui, app, background_tasks
 from src.utils.logger import setup_logger
 from src.utils.file_handler import FileHandler
+from src.utils.llm_cache import ResponseCache
+from src.utils.json_blob import extract_json_blob
+from src.utils.markdown_render import markdown_converter
 from src.config import config
 from src.mcp_client import mcp_client
 from src.rca_generator import rca_generator
@@ -18,6 +30,222 @@ from src.rca_generator import rca_generator
 # Setup logging
 logger = setup_logger(__name__)
 
+# Analysis keys that carry metadata rather than report sections
+_NON_SECTION_KEYS = frozenset({'sources_used', 'raw_response', 'raw_analysis'})
+
+# An opening bracket followed by a single quote: a Python literal (str() of a dict reply), never JSON
+_PY_LITERAL_RE = re.compile(r"[\[{]\s*'")
+
+# A markdown table header row followed by its |---| separator row
+_MD_TABLE_RE = re.compile(r'\|.*\|\s*\n\s*\|?\s*:?-+')
+
+# Stringified values that mean a KT section has no real content
+_KT_PLACEHOLDER_VALUES = frozenset({"", "N/A", "None", "..."})
+
+# Only this much of a section is scanned when deciding whether it holds a table
+MD_TABLE_SCAN_CHARS = 512
+
+# Branding assets shipped with the refactored UI, served once so browsers cache them
+_UI_STATIC_DIR = Path(__file__).parent / "ui" / "static"
+app.add_static_files('/static', _UI_STATIC_DIR)
+
+# Favicon and branding stylesheet added to every page
+_NETAPP_HEAD_HTML = (
+    '<link rel="icon" type="image/svg+xml" href="/static/favicon.svg">'
+    '<link rel="stylesheet" href="/static/app_styles.css">'
+)
+
+# LLM providers, in agentic chat fallback order
+_LLM_PROVIDERS = ('openai', 'anthropic', 'openrouter', 'llmproxy')
+
+# Report directories already served as static files, mapped to their URL prefix
+_STATIC_DIR_URLS: Dict[str, str] = {}
+
+# Agentic chat instructions; the leading part of the cacheable system prompt
+_AGENT_INSTRUCTIONS = (
+    "You are an expert RCA agent. Your job is to deeply analyze all provided case data, Jira tickets, and supporting documents. "
+    "You can extract, expand, or rewrite any RCA section on request, and answer follow-up questions using all available context. "
+    "If the user asks to rewrite or expand a section, return only the improved text for that section. "
+    "If the user asks a question, answer concisely and reference the RCA data. "
+    "If you need more information, ask the user for clarification. "
+    "Always use as much detail as possible from the context and prior analysis.\n\n"
+)
+
+# Browser SpeechSynthesis call wrapped around the JSON-encoded text to read aloud
+_SPEAK_JS_HEAD = "if ('speechSynthesis' in window) { var utter = new window.SpeechSynthesisUtterance("
+_SPEAK_JS_TAIL = "); utter.lang = 'en-US'; window.speechSynthesis.speak(utter); }"
+
+# Section cards built between yields to the event loop, so long reports paint progressively
+_RENDER_BATCH = 3
+
+# Seconds a provider that just failed is skipped by agentic chat fallback
+PROVIDER_COOLDOWN = 60
+
+# Minimum seconds between chat bubble updates while a reply streams in (a few frames)
+_STREAM_UPDATE_INTERVAL = 0.05
+
+# Separators accepted between Jira ticket IDs pasted into the ticket input
+_TICKET_SPLIT_RE = re.compile(r'[,\s]+')
+
+# Filler words ignored when deriving key variants from a section header
+_HEADER_STOP_WORDS = frozenset({'the', 'a', 'an', 'of', 'for', 'to', 'in', 'on', 'at'})
+
+# KT section headers: (words that select the group, ((sub-words, header), ...), group default).
+# Groups are tried in order and the first whose words all occur in the key wins.
+_KT_HEADER_RULES = (
+    (("problem",), (
+        (("statement",), "Problem Statement"),
+        (("description",), "Problem Description"),
+        (("analysis",), "Problem Analysis"),
+        (("details",), "Problem Details"),
+        (("history",), "Problem History"),
+        (("assessment",), "Problem Assessment"),
+    ), None),
+    (("cause",), (
+        (("root",), "Root Cause"),
+        (("potential",), "Potential Causes"),
+        (("possible",), "Potential Causes"),
+        (("validation",), "Validation of Causes"),
+        (("analysis",), "Cause Analysis"),
+    ), None),
+    (("solution",), (
+        (("development",), "Solution Development"),
+        (("evaluation",), "Solution Evaluation"),
+        (("recommended",), "Recommended Solution"),
+        (("possible",), "Possible Solutions"),
+    ), "Solution"),
+    (("action", "plan"), (), "Action Plan"),
+    (("follow",), (), "Follow-up"),
+    (("data", "collection"), (), "Data Collection"),
+)
+
+# Analysis keys come from a small set that recurs in every report and chat reply
+@lru_cache(maxsize=256)
+def _title_header(key: str) -> str:
+    """Display header for an analysis key, e.g. root_cause -> Root Cause"""
+    return key.replace("_", " ").title()
+
+# KT renders detect the same analysis keys every time
+@lru_cache(maxsize=256)
+def _kt_section_header(key: str) -> str:
+    """Readable KT section header for an analysis key"""
+    key_lower = key.lower()
+    for group_words, sub_rules, default in _KT_HEADER_RULES:
+        if all(word in key_lower for word in group_words):
+            for sub_words, header in sub_rules:
+                if all(word in key_lower for word in sub_words):
+                    return header
+            return default or _title_header(key)
+    return _title_header(key)
+
+def _normalize_key(key: str) -> str:
+    """Normalize an analysis key for lookup (lowercase, spaces as underscores)"""
+    return key.lower().replace(" ", "_")
+
+# Detected sections (KT, unmapped prompts) repeat across renders, so results are kept
+@lru_cache(maxsize=256)
+def _section_synonyms(header: str, key: str) -> Tuple[str, ...]:
+    """Normalized key variants the LLM may have used for a report section, in match order"""
+    header_lower = header.lower()
+    main_words = [w for w in header_lower.split() if w not in _HEADER_STOP_WORDS]
+    variants = (
+        key,
+        key.replace("_", ""),
+        header_lower.replace(" ", "_"),
+        header_lower.replace(" ", ""),
+        "_".join(main_words),
+        "".join(main_words),
+    )
+    return tuple(dict.fromkeys(_normalize_key(v) for v in variants))
+
+# How a section value is rendered, picked once per value by _classify_value
+_RENDER_HTML, _RENDER_MD_TABLE, _RENDER_LIST, _RENDER_MD = range(4)
+
+def _classify_value(value) -> int:
+    """Pick the renderer for a section value"""
+    if isinstance(value, list):
+        return _RENDER_LIST
+    if isinstance(value, str):
+        if "<table" in value:
+            return _RENDER_HTML
+        if _MD_TABLE_RE.search(value[:MD_TABLE_SCAN_CHARS]):
+            return _RENDER_MD_TABLE
+    return _RENDER_MD
+
+def _render_md_table(value: str) -> None:
+    """Render a markdown table as HTML, or as code if markdown is not installed"""
+    convert = markdown_converter()
+    if convert:
+        ui.html(convert(value))
+    else:
+        ui.code(value).classes('w-full')
+
+# Indexed by the _RENDER_* tags
+_VALUE_RENDERERS = (
+    lambda value: ui.html(value),
+    _render_md_table,
+    lambda value: ui.markdown("\n".join(f"- {v}" for v in value)),
+    lambda value: ui.markdown(str(value)),
+)
+
+def _render_section_value(value) -> None:
+    """Render a section value as HTML, a markdown table, a bullet list or plain markdown"""
+    _VALUE_RENDERERS[_classify_value(value)](value)
+
+def _render_on_first_open(expansion, value) -> None:
+    """Render value into a collapsed expansion the first time it is opened"""
+    def render(e):
+        if e.value and not expansion.default_slot.children:
+            with expansion:
+                _render_section_value(value)
+    expansion.on_value_change(render)
+
+@lru_cache(maxsize=8)
+def _speak_script(text: str) -> str:
+    """SpeechSynthesis call for text, encoded once however often it is read aloud"""
+    return _SPEAK_JS_HEAD + json.dumps(text) + _SPEAK_JS_TAIL
+
+def _static_url(doc_path: str) -> str:
+    """URL for a generated report, serving its directory as static files on first use"""
+    static_dir = os.path.dirname(doc_path)
+    url_prefix = _STATIC_DIR_URLS.get(static_dir)
+    if url_prefix is None:
+        # Mounts are matched in order, so each further directory needs its own prefix
+        url_prefix = f"/output-{len(_STATIC_DIR_URLS)}" if _STATIC_DIR_URLS else "/output"
+        app.add_static_files(url_prefix, static_dir)
+        _STATIC_DIR_URLS[static_dir] = url_prefix
+    return f"{url_prefix}/{os.path.basename(doc_path)}"
+
+def _parse_dict_reply(content: str):
+    """Parse a JSON or Python literal object out of an agent reply, or None"""
+    stripped = content.strip()
+    if stripped.startswith(('{', '[')):
+        # Non-streamed replies are str() of a dict, so skip the JSON attempt that would only fail
+        if not _PY_LITERAL_RE.match(stripped):
+            try:
+                return orjson.loads(stripped)
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            return ast.literal_eval(stripped)
+        except Exception:
+            pass
+    # Fall back to a JSON object or array embedded in surrounding text
+    blob = extract_json_blob(content)
+    if blob:
+        try:
+            return orjson.loads(blob)
+        except orjson.JSONDecodeError:
+            pass
+    return None
+
+def _format_agent_content(content) -> Optional[str]:
+    """Markdown key/value rendering of a dict-like agent reply, or None to show it as-is"""
+    parsed = content if isinstance(content, dict) else _parse_dict_reply(str(content))
+    if not isinstance(parsed, dict):
+        return None
+    return "\n\n".join(f"**{_title_header(str(k))}**:\n{v}" for k, v in parsed.items())
+
 class RCAApp:
     # Centralized mapping of prompt options to their reporting sections
     PROMPT_REPORT_MAP = {
@@ -70,6 +298,8 @@ class RCAApp:
         ("Overview Analysis", "initial_analysis_prompt"),
         ("Problem Assessment", "kt-analysis_prompt"),
     ]
+    _PROMPT_LABEL_MAP = {value: label for label, value in PROMPT_OPTIONS}
+    _PROMPT_VALUES = [value for _, value in PROMPT_OPTIONS]
 
     def __init__(self):
         self.config = config.app_config
@@ -81,55 +311,81 @@ class RCAApp:
         self.uploaded_files: List[str] = []
         self.urls: List[str] = []
         self.jira_tickets: List[str] = []
+        # Set mirrors of urls/jira_tickets for O(1) dedupe; the lists keep display order
+        self._urls_set: Set[str] = set()
+        self._tickets_set: Set[str] = set()
+        # Basenames of uploaded_files, derived once per upload for display and chat context
+        self._file_names: Dict[str, str] = {}
+        # Agentic chat system prompt and the (analysis, files, urls, tickets) it was built from
+        self._chat_context = ""
+        self._chat_context_key: Optional[tuple] = None
+        # Prompt lines for chat_messages, extended as messages arrive; rebuilt when the list is replaced
+        self._chat_lines: List[str] = []
+        self._chat_lines_source: Optional[List[dict]] = None
+        # In-flight agentic chat tasks, referenced until done so they are not garbage collected
+        self._bg_tasks: Set[asyncio.Task] = set()
+        # Bumped on every results refresh; a render paused between batches stops once it changes
+        self._render_generation = 0
         self.analysis_result: Optional[dict] = None
         self.selected_prompt: str = "formal_rca_prompt"
+        # Display rows keyed by file path / URL / ticket for incremental updates
+        self._file_rows: Dict[str, ui.row] = {}
+        self._url_rows: Dict[str, ui.row] = {}
+        self._ticket_rows: Dict[str, ui.row] = {}
+        # Reports for repeated identical file-only inputs; kept across context resets
+        self._response_cache = ResponseCache()
+        # Held while a report is generated so double clicks can't start a second LLM run
+        self._analysis_lock = asyncio.Lock()
+        self.generate_button = None
+        # When each LLM provider last failed in agentic chat; cleared on success
+        self._provider_failed_at: Dict[str, float] = {}
+    
+    @classmethod
+    def _build_lookup_tables(cls):
+        """Precompute (header, key, synonyms) lookups for every mapped prompt"""
+        cls._SECTION_LOOKUPS = {
+            prompt: [(header, key, _section_synonyms(header, key)) for header, key in sections]
+            for prompt, sections in cls.PROMPT_REPORT_MAP.items()
+        }
         
     async def initialize(self):
         """Initialize MCP client and other components"""
-        try:
-            await mcp_client.initialize()
-            logger.info("MCP client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize MCP client: {e}")
+        # The LLM client is independent of MCP setup, so prepare both at once
+        mcp_result, _ = await asyncio.gather(
+            mcp_client.initialize(),
+            rca_generator.warm_up(),
+            return_exceptions=True
+        )
+        if isinstance(mcp_result, Exception):
+            logger.error(f"Failed to initialize MCP client: {mcp_result}")
             ui.notify("Failed to initialize MCP client", type='negative')
+        else:
+            logger.info("MCP client initialized successfully")
     
     def create_ui(self):
         """Create the NiceGUI interface with NetApp branding"""
         # Set page title and favicon
         ui.page_title("NetApp RCA Tool")
-        ui.add_head_html("""
-        <link rel="icon" type="image/png" href="https://www.netapp.com/wp-content/uploads/2021/05/cropped-netapp-favicon-32x32.png">
-        <style>
-            body { background: #f7f9fa; }
-            .netapp-header { background: #0067c5; color: white; border-radius: 8px; }
-            .netapp-logo { height: 48px; margin-right: 18px; }
-            .netapp-title { font-size: 2.2rem; font-weight: 700; letter-spacing: 1px; }
-            .netapp-subtitle { font-size: 1.1rem; color: #e3eaf2; }
-            .netapp-card { border: 1px solid #e3eaf2; border-radius: 8px; background: white; }
-            .netapp-btn-primary { background: #0067c5 !important; color: white !important; }
-            .netapp-btn-secondary { background: #e3eaf2 !important; color: #0067c5 !important; }
-        </style>
-        """)
+        ui.add_head_html(_NETAPP_HEAD_HTML)
 
         # Main container
         with ui.column().classes('w-full max-w-4xl mx-auto p-4'):
             # NetApp Header with logo
             with ui.row().classes('w-full items-center mb-6 netapp-header p-4'):
-                ui.image('https://www.netapp.com/wp-content/uploads/2021/05/netapp-logo.png').classes('netapp-logo')
+                ui.image('/static/netapp_logo.png').classes('netapp-logo')
                 ui.label('Root Cause Analysis Tool').classes('netapp-title')
                 ui.label('Powered by MCP & LLM').classes('ml-4 netapp-subtitle')
 
             # Prompt Selection Dropdown
             with ui.card().classes('w-full mb-6 netapp-card'):
                 ui.label('Select Analysis Type').classes('text-lg font-semibold mb-2 text-[#0067c5]')
-                self.prompt_label_map = {value: label for label, value in self.PROMPT_OPTIONS}
                 self.prompt_select = ui.select(
-                    options=[value for _, value in self.PROMPT_OPTIONS],
+                    options=self._PROMPT_VALUES,
                     value=self.selected_prompt,
                     on_change=self.on_prompt_select
                 ).classes('w-full mb-2')
                 # Show the label for the current selection
-                ui.label(f"Current: {self.prompt_label_map.get(self.selected_prompt, self.selected_prompt)}").classes('text-xs text-gray-500 mb-1')
+                ui.label(f"Current: {self._PROMPT_LABEL_MAP.get(self.selected_prompt, self.selected_prompt)}").classes('text-xs text-gray-500 mb-1')
                 ui.markdown(
                     "Choose the type of analysis you want to generate. "
                     "**Formal RCA**: Full root cause analysis. "
@@ -184,12 +440,15 @@ class RCAApp:
             with ui.card().classes('w-full mb-4 netapp-card'):
                 ui.label('Generate Report').classes('text-lg font-semibold mb-2 text-[#0067c5]')
                 with ui.row().classes('w-full'):
-                    ui.button('Generate Report', on_click=self.generate_analysis).classes('netapp-btn-primary')
+                    self.generate_button = ui.button('Generate Report', on_click=self.generate_analysis).classes('netapp-btn-primary')
                     ui.button('Clear All', on_click=self.clear_all).classes('ml-2 netapp-btn-secondary')
                     ui.button('Reset Context', on_click=self.reset_context).classes('ml-2 netapp-btn-secondary')
                 self.progress_bar = ui.linear_progress(value=0).classes('w-full mt-2')
                 self.progress_bar.visible = False
                 self.results_container = ui.column().classes('w-full mt-4')
+                with self.results_container:
+                    # Async refreshable; nothing to render yet, so don't block page creation on it
+                    background_tasks.create(self._render_results())
 
             # Chat/Agentic RCA Refinement Section
             with ui.card().classes('w-full mb-4 netapp-card'):
@@ -198,23 +457,22 @@ class RCAApp:
                     "Use this chat to ask deep questions about the uploaded cases, request section rewrites, or instruct the agent to extract or expand on specific RCA sections. "
                     "The agent will use all available context and prior analysis to answer or refine the RCA."
                 ).classes('text-sm mb-2')
-                self.chat_history = ui.column().classes('w-full min-h-[120px] max-h-[300px] overflow-y-auto bg-[#f7f9fa] p-2 rounded')
                 self.chat_messages: List[dict] = []
+                self.chat_history = ui.column().classes('w-full min-h-[120px] max-h-[300px] overflow-y-auto bg-[#f7f9fa] p-2 rounded')
                 with ui.row().classes('w-full'):
                     self.chat_input = ui.input('Ask a question, request a section rewrite, or instruct the agent...').classes('flex-grow')
                     ui.button('Send', on_click=self.handle_chat_message).classes('ml-2 netapp-btn-primary')
     
-    def handle_file_upload(self, e):
+    async def handle_file_upload(self, e):
         """Handle file upload"""
         try:
-            file_path = self.file_handler.save_uploaded_file(
-                e.content.read(),
-                e.name
-            )
+            # e.content is a spooled temp file; stream it to disk off the event loop
+            file_path = await asyncio.to_thread(self.file_handler.save_uploaded_stream, e.content, e.name)
             
             if file_path:
                 self.uploaded_files.append(str(file_path))
-                self.update_files_display()
+                self._file_names[str(file_path)] = Path(file_path).name
+                self._append_file_row(str(file_path))
                 ui.notify(f'File uploaded: {e.name}', type='positive')
                 logger.info(f"File uploaded successfully: {file_path}")
             else:
@@ -229,9 +487,10 @@ class RCAApp:
         """Add URL to list"""
         url = self.url_input.value.strip()
         if url:
-            if url not in self.urls:
+            if url not in self._urls_set:
                 self.urls.append(url)
-                self.update_urls_display()
+                self._urls_set.add(url)
+                self._append_url_row(url)
                 ui.notify(f'URL added: {url}', type='positive')
             else:
                 ui.notify('URL already added', type='warning')
@@ -240,36 +499,46 @@ class RCAApp:
             ui.notify('Please enter a valid URL', type='negative')
     
     async def add_jira_ticket(self):
-        """Add Jira ticket to list and fetch linked issues for user selection, always show dialog for confirmation."""
-        ticket = self.ticket_input.value.strip().upper()
-        if not ticket:
+        """Add Jira tickets (comma/space separated) and fetch linked issues for user selection, always show dialog for confirmation."""
+        requested = [t for t in _TICKET_SPLIT_RE.split(self.ticket_input.value.strip().upper()) if t]
+        if not requested:
             ui.notify('Please enter a valid Jira ticket ID', type='negative')
             return
 
-        if ticket in self.jira_tickets:
+        tickets = [t for t in dict.fromkeys(requested) if t not in self._tickets_set]
+        if not tickets:
             ui.notify('Ticket already added', type='warning')
             self.ticket_input.value = ''
             return
 
-        # Fetch linked issues using MCP client directly for accurate grouping
-        try:
-            from src.mcp_client import mcp_client
-            grouped = await mcp_client.get_linked_issues_grouped(ticket)
-            # Flatten grouped dict into a list of dicts with link_type and direction
-            linked_issues = []
-            for link_type, issues in grouped.items():
-                for issue in issues:
-                    issue['link_type'] = link_type
-                    linked_issues.append(issue)
-        except Exception as e:
-            logger.error(f"Failed to fetch linked issues for {ticket}: {e}")
-            linked_issues = []
+        # Fetch linked issues for all tickets concurrently using MCP client directly for accurate grouping
+        results = await asyncio.gather(
+            *(mcp_client.get_linked_issues_grouped(ticket) for ticket in tickets),
+            return_exceptions=True
+        )
+
+        # Flatten grouped dicts into a list of dicts with link_type, direction and parent ticket,
+        # copying each issue so the client's results are never mutated
+        linked_issues = []
+        for ticket, grouped in zip(tickets, results):
+            if isinstance(grouped, Exception):
+                logger.error(f"Failed to fetch linked issues for {ticket}: {grouped}")
+                continue
+            linked_issues.extend(
+                {**issue, 'link_type': link_type, 'parent': ticket}
+                for link_type, issues in grouped.items()
+                for issue in issues
+            )
 
         # Always show a dialog, even if no linked issues, for confirmation
-        await self.show_linked_issues_dialog(linked_issues, main_ticket=ticket)
+        await self.show_linked_issues_dialog(linked_issues, main_tickets=tickets)
 
-    async def show_linked_issues_dialog(self, linked_issues, main_ticket=None):
-        """Show a dialog with a checklist of linked issues for user to add, and always add the main ticket if confirmed.
+    def invalidate_linked_cache(self):
+        """Forget cached linked-issue lookups so the next ticket add asks Jira again"""
+        mcp_client.invalidate_linked_cache()
+
+    async def show_linked_issues_dialog(self, linked_issues, main_tickets: List[str]):
+        """Show a dialog with a checklist of linked issues for user to add, and always add the main tickets if confirmed.
         No file upload for tickets in this dialog.
         The dialog is less opaque and more condensed for better UX.
         """
@@ -279,38 +548,44 @@ class RCAApp:
             with ui.column().classes('gap-2 p-2'):
                 if linked_issues:
                     ui.label('Add Linked Jira Issues').classes('text-base font-semibold mb-1')
-                    ui.markdown('Select any linked Jira issues to include. The main ticket will always be included.').classes('text-sm mb-2')
+                    ui.markdown('Select any linked Jira issues to include. The main tickets will always be included.').classes('text-sm mb-2')
                 else:
                     ui.label('Add Jira Ticket').classes('text-base font-semibold mb-1')
-                    ui.markdown('No linked issues found. Confirm to add this ticket.').classes('text-sm mb-2')
+                    ui.markdown('No linked issues found. Confirm to add the entered tickets.').classes('text-sm mb-2')
 
-                # Show the main ticket as always checked and disabled
-                if main_ticket:
-                    ui.checkbox(f"{main_ticket} (Main ticket)", value=True).props('disable').classes('text-xs')
+                # Show each main ticket as always checked and disabled, followed by its linked issues
                 checkboxes = []
-                for issue in linked_issues:
-                    key = issue.get('key', '')
-                    summary = issue.get('summary', '')
-                    link_type = issue.get('link_type', '')
-                    direction = issue.get('direction', '')
-                    label = f"{key} ({link_type}, {direction}) - {summary}"
-                    cb = ui.checkbox(label, value=False).classes('text-xs')
-                    checkboxes.append((cb, key))
+                for main_ticket in main_tickets:
+                    ui.checkbox(f"{main_ticket} (Main ticket)", value=True).props('disable').classes('text-xs')
+                    for issue in linked_issues:
+                        key = issue.get('key', '')
+                        if issue.get('parent') != main_ticket or key in main_tickets:
+                            continue
+                        summary = issue.get('summary', '')
+                        link_type = issue.get('link_type', '')
+                        direction = issue.get('direction', '')
+                        label = f"{key} ({link_type}, {direction}) - {summary}"
+                        cb = ui.checkbox(label, value=False).classes('text-xs ml-4' if len(main_tickets) > 1 else 'text-xs')
+                        checkboxes.append((cb, key))
                 with ui.row().classes('gap-2 mt-2'):
                     async def on_confirm():
-                        added = 0
-                        # Always add the main ticket if not already present
-                        if main_ticket and main_ticket not in self.jira_tickets:
-                            self.jira_tickets.append(main_ticket)
-                            added += 1
+                        added_keys = []
+                        # Always add the main tickets if not already present
+                        for main_ticket in main_tickets:
+                            if main_ticket not in self._tickets_set:
+                                self.jira_tickets.append(main_ticket)
+                                self._tickets_set.add(main_ticket)
+                                added_keys.append(main_ticket)
                         # Read checkbox values for linked issues
                         for cb, key in checkboxes:
-                            if cb.value and key not in self.jira_tickets:
+                            if cb.value and key not in self._tickets_set:
                                 self.jira_tickets.append(key)
-                                added += 1
-                        self.update_tickets_display()
-                        if added == 1 and main_ticket:
-                            ui.notify(f"Added main Jira ticket: {main_ticket}", type='positive')
+                                self._tickets_set.add(key)
+                                added_keys.append(key)
+                        self._append_ticket_rows(added_keys)
+                        added = len(added_keys)
+                        if added == 1 and len(main_tickets) == 1:
+                            ui.notify(f"Added main Jira ticket: {main_tickets[0]}", type='positive')
                         elif added > 0:
                             ui.notify(f"Added {added} Jira issues", type='positive')
                         else:
@@ -322,338 +597,266 @@ class RCAApp:
         dialog.open()
     
     def update_files_display(self):
-        """Update the files display"""
+        """Rebuild the files display from scratch"""
         self.files_list.clear()
-        for i, file_path in enumerate(self.uploaded_files):
-            file_name = Path(file_path).name
-            with self.files_list:
-                with ui.row().classes('w-full items-center'):
-                    ui.icon('attach_file').classes('text-blue-600')
-                    ui.label(file_name).classes('flex-grow')
-                    ui.button(icon='delete', on_click=lambda idx=i: self.remove_file(idx)).classes('text-red-600')
+        self._file_rows = {}
+        self._file_names = {p: Path(p).name for p in self.uploaded_files}
+        for file_path in self.uploaded_files:
+            self._append_file_row(file_path)
+    
+    def _append_file_row(self, file_path: str):
+        """Add a single row to the files display"""
+        with self.files_list:
+            with ui.row().classes('w-full items-center') as row:
+                ui.icon('attach_file').classes('text-blue-600')
+                ui.label(self._file_names[file_path]).classes('flex-grow')
+                ui.button(icon='delete', on_click=lambda p=file_path: self.remove_file(p)).classes('text-red-600')
+        self._file_rows[file_path] = row
     
     def update_urls_display(self):
-        """Update the URLs display"""
+        """Rebuild the URLs display from scratch"""
         self.urls_list.clear()
-        for i, url in enumerate(self.urls):
-            with self.urls_list:
-                with ui.row().classes('w-full items-center'):
-                    ui.icon('link').classes('text-green-600')
-                    ui.label(url).classes('flex-grow')
-                    ui.button(icon='delete', on_click=lambda idx=i: self.remove_url(idx)).classes('text-red-600')
+        self._url_rows = {}
+        self._urls_set = set(self.urls)
+        for url in self.urls:
+            self._append_url_row(url)
+    
+    def _append_url_row(self, url: str):
+        """Add a single row to the URLs display"""
+        with self.urls_list:
+            with ui.row().classes('w-full items-center') as row:
+                ui.icon('link').classes('text-green-600')
+                ui.label(url).classes('flex-grow')
+                ui.button(icon='delete', on_click=lambda u=url: self.remove_url(u)).classes('text-red-600')
+        self._url_rows[url] = row
     
     def update_tickets_display(self):
-        """Update the Jira tickets display, showing linked issues visually."""
+        """Rebuild the Jira tickets display from scratch (initial render), showing linked issues visually."""
         self.tickets_list.clear()
+        self._ticket_rows = {}
+        self._tickets_set = set(self.jira_tickets)
         for i, ticket in enumerate(self.jira_tickets):
-            is_linked = False
-            # Heuristic: if ticket is not the first/main ticket, mark as linked
-            if i > 0:
-                is_linked = True
-            with self.tickets_list:
-                with ui.row().classes('w-full items-center'):
-                    if is_linked:
-                        ui.icon('call_merge').classes('text-purple-600')
-                        ui.label(f"{ticket} (Linked)").classes('flex-grow text-purple-800')
-                    else:
-                        ui.icon('confirmation_number').classes('text-orange-600')
-                        ui.label(ticket).classes('flex-grow')
-                    ui.button(icon='delete', on_click=lambda idx=i: self.remove_ticket(idx)).classes('text-red-600')
+            self._append_ticket_row(ticket, is_linked=i > 0)
     
-    def remove_file(self, index: int):
+    def _append_ticket_row(self, ticket: str, is_linked: bool):
+        """Add a single row to the Jira tickets display"""
+        # Heuristic: any ticket after the first/main ticket is shown as linked
+        with self.tickets_list:
+            with ui.row().classes('w-full items-center') as row:
+                if is_linked:
+                    ui.icon('call_merge').classes('text-purple-600')
+                    ui.label(f"{ticket} (Linked)").classes('flex-grow text-purple-800')
+                else:
+                    ui.icon('confirmation_number').classes('text-orange-600')
+                    ui.label(ticket).classes('flex-grow')
+                ui.button(icon='delete', on_click=lambda t=ticket: self.remove_ticket(t)).classes('text-red-600')
+        self._ticket_rows[ticket] = row
+    
+    def _append_ticket_rows(self, tickets: List[str]):
+        """Add rows for tickets that were just appended to jira_tickets"""
+        first_index = len(self.jira_tickets) - len(tickets)
+        for offset, ticket in enumerate(tickets):
+            self._append_ticket_row(ticket, is_linked=first_index + offset > 0)
+    
+    def remove_file(self, file_path: str):
         """Remove file from list"""
-        if 0 <= index < len(self.uploaded_files):
-            removed_file = self.uploaded_files.pop(index)
-            self.update_files_display()
-            ui.notify(f'File removed: {Path(removed_file).name}', type='info')
+        if file_path in self.uploaded_files:
+            self.uploaded_files.remove(file_path)
+            self._file_rows.pop(file_path).delete()
+            ui.notify(f'File removed: {self._file_names.pop(file_path)}', type='info')
     
-    def remove_url(self, index: int):
+    def remove_url(self, url: str):
         """Remove URL from list"""
-        if 0 <= index < len(self.urls):
-            removed_url = self.urls.pop(index)
-            self.update_urls_display()
-            ui.notify(f'URL removed: {removed_url}', type='info')
+        if url in self._urls_set:
+            self.urls.remove(url)
+            self._urls_set.discard(url)
+            self._url_rows.pop(url).delete()
+            ui.notify(f'URL removed: {url}', type='info')
     
-    def remove_ticket(self, index: int):
+    def remove_ticket(self, ticket: str):
         """Remove Jira ticket from list"""
-        if 0 <= index < len(self.jira_tickets):
-            removed_ticket = self.jira_tickets.pop(index)
-            self.update_tickets_display()
-            ui.notify(f'Ticket removed: {removed_ticket}', type='info')
+        if ticket in self._tickets_set:
+            was_main = self.jira_tickets[0] == ticket
+            self.jira_tickets.remove(ticket)
+            self._tickets_set.discard(ticket)
+            if was_main and self.jira_tickets:
+                # The next ticket becomes the main one, so its row changes
+                self.update_tickets_display()
+            else:
+                self._ticket_rows.pop(ticket).delete()
+            ui.notify(f'Ticket removed: {ticket}', type='info')
     
     def display_results(self):
         """Display analysis results"""
+        self._render_generation += 1
+        self._render_results.refresh()
+
+    @ui.refreshable
+    async def _render_results(self):
+        """Render the result cards for the current analysis"""
         if not self.analysis_result:
             return
+        generation = self._render_generation
 
-        self.results_container.clear()
-
-        with self.results_container:
-            # Use the prompt file that was actually used for generation
-            prompt_file = self.analysis_result.get('prompt_file_used', self.selected_prompt)
-            
-            # Debug logging
-            logger.info(f"Displaying results for prompt: {prompt_file}")
-            logger.info(f"Current selected_prompt: {self.selected_prompt}")
-            logger.info(f"Analysis keys: {list(self.analysis_result.get('analysis', {}).keys())}")
+        # Use the prompt file that was actually used for generation
+        prompt_file = self.analysis_result.get('prompt_file_used', self.selected_prompt)
+        
+        # Debug logging
+        logger.info(f"Displaying results for prompt: {prompt_file}")
+        logger.info(f"Current selected_prompt: {self.selected_prompt}")
+        logger.debug("Analysis keys: %s", self.analysis_result.get('analysis', {}).keys())
+        
+        # Special debug logging for KT analysis, skipped entirely unless DEBUG is on
+        if prompt_file == "kt-analysis_prompt" and logger.isEnabledFor(logging.DEBUG):
+            analysis = self.analysis_result['analysis']
+            logger.debug("=== KT ANALYSIS DEBUG ===")
+            for key, value in analysis.items():
+                if key not in _NON_SECTION_KEYS:
+                    logger.debug("KT Key: '%s' -> Value: '%s'", key, value)
+            logger.debug("=== END KT DEBUG ===")
+        
+        # Use the predefined PROMPT_REPORT_MAP instead of dynamic parsing
+        section_mapping = self.PROMPT_REPORT_MAP.get(prompt_file, [])
+        
+        # If no predefined mapping exists, or for KT analysis, try intelligent section detection
+        if not section_mapping or prompt_file == "kt-analysis_prompt":
+            logger.warning(f"Using intelligent section detection for prompt: {prompt_file}")
+            analysis = self.analysis_result['analysis']
             
-            # Special debug logging for KT analysis
+            # For KT analysis, always use intelligent detection since the predefined mapping often doesn't match LLM output
             if prompt_file == "kt-analysis_prompt":
-                analysis = self.analysis_result['analysis']
-                logger.info("=== KT ANALYSIS DEBUG ===")
-                for key, value in analysis.items():
-                    if key not in ['sources_used', 'raw_response', 'raw_analysis']:
-                        logger.info(f"KT Key: '{key}' -> Value: '{str(value)}'")
-                logger.info("=== END KT DEBUG ===")
-            
-            # Use the predefined PROMPT_REPORT_MAP instead of dynamic parsing
-            section_mapping = self.PROMPT_REPORT_MAP.get(prompt_file, [])
-            
-            # If no predefined mapping exists, or for KT analysis, try intelligent section detection
-            if not section_mapping or prompt_file == "kt-analysis_prompt":
-                logger.warning(f"Using intelligent section detection for prompt: {prompt_file}")
-                analysis = self.analysis_result['analysis']
+                detected_mapping = []
                 
-                # For KT analysis, always use intelligent detection since the predefined mapping often doesn't match LLM output
-                if prompt_file == "kt-analysis_prompt":
-                    detected_mapping = []
-                    
-                    # Look for keys that might be KT sections
-                    for key in analysis.keys():
-                        if key in ['sources_used', 'raw_response', 'raw_analysis']:
-                            continue
-                            
-                        # Convert key to a readable header
-                        header = key.replace("_", " ").title()
-                        
-                        # Special handling for common KT terms
-                        if "problem" in key.lower():
-                            if "statement" in key.lower():
-                                header = "Problem Statement"
-                            elif "description" in key.lower():
-                                header = "Problem Description"
-                            elif "analysis" in key.lower():
-                                header = "Problem Analysis"
-                            elif "details" in key.lower():
-                                header = "Problem Details"
-                            elif "history" in key.lower():
-                                header = "Problem History"
-                            elif "assessment" in key.lower():
-                                header = "Problem Assessment"
-                        elif "cause" in key.lower():
-                            if "root" in key.lower():
-                                header = "Root Cause"
-                            elif "potential" in key.lower() or "possible" in key.lower():
-                                header = "Potential Causes"
-                            elif "validation" in key.lower():
-                                header = "Validation of Causes"
-                            elif "analysis" in key.lower():
-                                header = "Cause Analysis"
-                        elif "solution" in key.lower():
-                            if "development" in key.lower():
-                                header = "Solution Development"
-                            elif "evaluation" in key.lower():
-                                header = "Solution Evaluation"
-                            elif "recommended" in key.lower():
-                                header = "Recommended Solution"
-                            elif "possible" in key.lower():
-                                header = "Possible Solutions"
-                            else:
-                                header = "Solution"
-                        elif "action" in key.lower() and "plan" in key.lower():
-                            header = "Action Plan"
-                        elif "follow" in key.lower():
-                            header = "Follow-up"
-                        elif "data" in key.lower() and "collection" in key.lower():
-                            header = "Data Collection"
+                # Look for keys that might be KT sections
+                for key in analysis.keys():
+                    if key in _NON_SECTION_KEYS:
+                        continue
                         
-                        detected_mapping.append((header, key))
+                    header = _kt_section_header(key)
                     
-                    # Always use detected mapping for KT analysis
-                    section_mapping = detected_mapping
-                    logger.info(f"Detected {len(detected_mapping)} KT sections: {[h for h, k in detected_mapping]}")
+                    detected_mapping.append((header, key))
                 
-                # Fallback to analysis keys if no mapping found
-                if not section_mapping:
-                    section_mapping = [(k.replace("_", " ").title(), k) for k in analysis.keys() if k != "raw_analysis"]
+                # Always use detected mapping for KT analysis
+                section_mapping = detected_mapping
+                logger.info(f"Detected {len(detected_mapping)} KT sections: {[h for h, k in detected_mapping]}")
             
-            ui.label(f"Report: {prompt_file.replace('_', ' ').title()}").classes('text-xl font-semibold mb-4')
+            # Fallback to analysis keys if no mapping found
+            if not section_mapping:
+                section_mapping = [(_title_header(k), k) for k in analysis.keys() if k != "raw_analysis"]
+        
+        ui.label(f"Report: {_title_header(prompt_file)}").classes('text-xl font-semibold mb-4')
 
-            analysis = self.analysis_result['analysis']
+        analysis = self.analysis_result['analysis']
+        
+        # Special handling for KT analysis - if the processed fields are mostly empty,
+        # check if we should use the raw_analysis instead
+        if prompt_file == "kt-analysis_prompt" and 'raw_analysis' in analysis:
+            # Check if the processed fields have actual content
+            main_fields = ['problem_description', 'possible_causes', 'data_collection', 'solution']
+            empty_fields = sum(1 for field in main_fields if not analysis.get(field, '').strip())
             
-            # Special handling for KT analysis - if the processed fields are mostly empty,
-            # check if we should use the raw_analysis instead
-            if prompt_file == "kt-analysis_prompt" and 'raw_analysis' in analysis:
-                # Check if the processed fields have actual content
-                main_fields = ['problem_description', 'possible_causes', 'data_collection', 'solution']
-                empty_fields = sum(1 for field in main_fields if not analysis.get(field, '').strip())
-                
-                # If most fields are empty, use raw_analysis which likely has the correct structure
-                if empty_fields >= len(main_fields) - 1:  # If 3 or more fields are empty
-                    logger.info("KT processed fields are mostly empty, using raw_analysis")
-                    raw_analysis = analysis.get('raw_analysis', {})
-                    if isinstance(raw_analysis, dict) and raw_analysis:
-                        # Merge raw_analysis with current analysis, keeping sources_used from processed
-                        sources_used = analysis.get('sources_used', [])
-                        analysis = raw_analysis.copy()
-                        analysis['sources_used'] = sources_used
-                        logger.info(f"Using raw_analysis with keys: {list(analysis.keys())}")
-
-            # Show sources used at the top
-            sources = analysis.get("sources_used")
-            if sources:
-                with ui.card().classes('w-full mb-4'):
-                    ui.label("Sources Used").classes('text-lg font-semibold mb-2')
-                    for src in sources:
-                        ui.markdown(f"- {src}")
-
-            # Use the predefined section mapping with fallback logic
-            for header, expected_key in section_mapping:
-                # Try exact match first
-                value = analysis.get(expected_key)
-                
-                # If no exact match, try fuzzy matching
-                if value is None:
-                    # Try variations of the key
-                    possible_keys = [
-                        expected_key,
-                        expected_key.replace("_", ""),
-                        expected_key.replace("_", " "),
-                        expected_key.lower(),
-                        expected_key.upper(),
-                        header.lower().replace(" ", "_"),
-                        header.lower().replace(" ", ""),
-                    ]
-                    
-                    # For KT analysis, also try numbered variations
-                    if prompt_file == "kt-analysis_prompt":
-                        # Try with numbers and sub-numbers (e.g., "1. Problem Statement", "2.1. Problem Details")
-                        header_words = header.lower().split()
-                        if header_words:
-                            # Try just the main words without articles
-                            main_words = [w for w in header_words if w not in ['the', 'a', 'an', 'of', 'for', 'to', 'in', 'on', 'at']]
-                            possible_keys.extend([
-                                "_".join(main_words),
-                                "".join(main_words),
-                                " ".join(main_words),
-                            ])
-                        
-                        # Try partial matches for compound headers
-                        for key in analysis.keys():
-                            key_lower = key.lower().replace("_", " ")
-                            header_lower = header.lower()
-                            # Check if any significant words match
-                            key_words = set(key_lower.split())
-                            header_words = set(header_lower.split())
-                            if len(key_words.intersection(header_words)) >= min(2, len(header_words)):
-                                possible_keys.append(key)
-                    
-                    for possible_key in possible_keys:
-                        if possible_key in analysis:
-                            value = analysis[possible_key]
-                            logger.info(f"Found section '{header}' using key '{possible_key}' instead of '{expected_key}'")
-                            break
-                
-                # Only show sections that have data (be more lenient for KT analysis)
-                if prompt_file == "kt-analysis_prompt":
-                    # For KT analysis, show section if it has any non-empty content
-                    show_section = value is not None and str(value).strip() not in ["", "N/A", "None", "..."]
-                else:
-                    # For other analysis types, use stricter criteria
-                    show_section = value is not None and value != "" and value != "N/A"
-                
-                if show_section:
-                    with ui.card().classes('w-full mb-4'):
-                        ui.label(header).classes('text-lg font-semibold mb-2')
-                        # Render HTML table if present
-                        if isinstance(value, str) and "<table" in value:
-                            ui.html(value)
-                        # Render markdown table if present
-                        elif isinstance(value, str) and "|" in value and value.count("|") > 2:
-                            # Convert markdown table to HTML for nice formatting
-                            try:
-                                import markdown
-                                from markdown.extensions.tables import TableExtension
-                                html = markdown.markdown(value, extensions=[TableExtension()])
-                                ui.html(html)
-                            except ImportError:
-                                # Fallback if markdown is not installed
-                                ui.code(value).classes('w-full')
-                        # Render list as bullet points
-                        elif isinstance(value, list):
-                            for v in value:
-                                ui.markdown(f"• {v}")
-                        # Render as plain text
-                        else:
-                            ui.markdown(str(value))
-                else:
-                    logger.debug(f"Skipping section '{header}' - no data found for key '{expected_key}'")
+            # If most fields are empty, use raw_analysis which likely has the correct structure
+            if empty_fields >= len(main_fields) - 1:  # If 3 or more fields are empty
+                logger.info("KT processed fields are mostly empty, using raw_analysis")
+                raw_analysis = analysis.get('raw_analysis', {})
+                if isinstance(raw_analysis, dict) and raw_analysis:
+                    # Merge raw_analysis with current analysis, keeping sources_used from processed
+                    sources_used = analysis.get('sources_used', [])
+                    analysis = raw_analysis.copy()
+                    analysis['sources_used'] = sources_used
+                    logger.info(f"Using raw_analysis with keys: {list(analysis.keys())}")
+
+        # Show sources used at the top
+        sources = analysis.get("sources_used")
+        if sources:
+            with ui.card().classes('w-full mb-4'):
+                ui.label("Sources Used").classes('text-lg font-semibold mb-2')
+                ui.markdown("\n".join(f"- {src}" for src in sources))
+
+        # Static mappings use the precomputed lookups; detected ones are built here
+        if section_mapping is self.PROMPT_REPORT_MAP.get(prompt_file):
+            section_lookups = self._SECTION_LOOKUPS[prompt_file]
+        else:
+            section_lookups = [(h, k, _section_synonyms(h, k)) for h, k in section_mapping]
+        normalized = {_normalize_key(k): v for k, v in analysis.items()}
+        mapped_keys = {key for _, key in section_mapping}
+        # KT keys (especially from raw_analysis) vary most, so sections still unresolved fall back
+        # to a word-overlap match against keys no mapping claims; their words are split once here
+        overlap_keys = [
+            (k, set(k.lower().replace("_", " ").split())) for k in analysis
+            if k not in mapped_keys and k not in _NON_SECTION_KEYS
+        ] if prompt_file == "kt-analysis_prompt" else []
+
+        rendered = 0
+        for header, expected_key, synonyms in section_lookups:
+            # Exact match first, then any normalized variant of the key/header
+            value = analysis.get(expected_key)
+            if value is None:
+                value = next((normalized[s] for s in synonyms if s in normalized), None)
+            if value is None and overlap_keys:
+                header_words = set(header.lower().split())
+                needed = min(2, len(header_words))
+                match = next((k for k, words in overlap_keys if len(words & header_words) >= needed), None)
+                if match is not None:
+                    value = analysis[match]
+                    logger.info(f"Found section '{header}' using key '{match}' instead of '{expected_key}'")
             
-            # Show any unmapped sections that exist in the analysis
-            mapped_keys = [key for _, key in section_mapping]
-            unmapped_keys = [k for k in analysis.keys() if k not in mapped_keys and k not in ['sources_used', 'raw_response', 'raw_analysis']]
+            # Only show sections that have data (be more lenient for KT analysis)
+            if prompt_file == "kt-analysis_prompt":
+                # For KT analysis, show section if it has any non-empty content
+                show_section = value is not None and str(value).strip() not in _KT_PLACEHOLDER_VALUES
+            else:
+                # For other analysis types, use stricter criteria
+                show_section = value is not None and value != "" and value != "N/A"
             
-            if unmapped_keys:
-                logger.info(f"Found unmapped analysis keys: {unmapped_keys}")
+            if show_section:
                 with ui.card().classes('w-full mb-4'):
-                    ui.label("Additional Sections").classes('text-lg font-semibold mb-2')
-                    for key in unmapped_keys:
-                        value = analysis[key]
-                        if value and value != "" and value != "N/A":
-                            ui.label(key.replace("_", " ").title()).classes('text-md font-medium mb-1')
-                            if isinstance(value, str) and "<table" in value:
-                                ui.html(value)
-                            elif isinstance(value, str) and "|" in value and value.count("|") > 2:
-                                try:
-                                    import markdown
-                                    from markdown.extensions.tables import TableExtension
-                                    html = markdown.markdown(value, extensions=[TableExtension()])
-                                    ui.html(html)
-                                except ImportError:
-                                    ui.code(value).classes('w-full')
-                            elif isinstance(value, list):
-                                for v in value:
-                                    ui.markdown(f"• {v}")
-                            else:
-                                ui.markdown(str(value))
-                            ui.separator().classes('my-2')
-
-            # Download Report for formal RCA only
-            if prompt_file == "formal_rca_prompt":
-                with ui.card().classes('w-full mb-4'):
-                    ui.label('Report Download').classes('text-lg font-semibold mb-2')
-                    doc_path = self.analysis_result['document_path']
-                    ui.markdown(f"Report saved to: `{doc_path}`")
-                    if doc_path.endswith('.docx'):
-                        from nicegui import app
-                        import os
-                        static_url = None
-                        static_dir = os.path.dirname(doc_path)
-                        static_file = os.path.basename(doc_path)
-                        if not hasattr(app, "_rca_static_registered"):
-                            app.add_static_files('/output', static_dir)
-                            app._rca_static_registered = True
-                        static_url = f"/output/{static_file}"
-                        ui.markdown(f"[⬇️ Download Word Report]({static_url})")
-                    elif doc_path.endswith('.json'):
-                        from nicegui import app
-                        import os
-                        static_url = None
-                        static_dir = os.path.dirname(doc_path)
-                        static_file = os.path.basename(doc_path)
-                        if not hasattr(app, "_rca_static_registered_json"):
-                            app.add_static_files('/output', static_dir)
-                            app._rca_static_registered_json = True
-                        static_url = f"/output/{static_file}"
-                        ui.markdown(f"[⬇️ Download JSON Report]({static_url})")
-
-            # Raw Response (if available)
-            if analysis.get('raw_response'):
-                with ui.card().classes('w-full mb-4'):
-                    ui.label('Raw LLM Response').classes('text-lg font-semibold mb-2')
-                    ui.markdown("⚠️ **Note**: This analysis used fallback parsing due to JSON format issues.")
-                    with ui.expansion('View Raw Response', icon='code').classes('w-full'):
-                        ui.code(analysis['raw_response']).classes('w-full')
+                    ui.label(header).classes('text-lg font-semibold mb-2')
+                    _render_section_value(value)
+                rendered += 1
+                if rendered % _RENDER_BATCH == 0:
+                    # Let the cards built so far reach the browser before building more
+                    await asyncio.sleep(0)
+                    if generation != self._render_generation:
+                        # A newer refresh cleared this container and is rendering into it
+                        return
+            else:
+                logger.debug(f"Skipping section '{header}' - no data found for key '{expected_key}'")
+        
+        # Show any unmapped sections that exist in the analysis
+        unmapped_keys = [k for k in analysis if k not in mapped_keys and k not in _NON_SECTION_KEYS]
+        
+        if unmapped_keys:
+            logger.info(f"Found unmapped analysis keys: {unmapped_keys}")
+            with ui.card().classes('w-full mb-4'):
+                ui.label("Additional Sections").classes('text-lg font-semibold mb-2')
+                for key in unmapped_keys:
+                    value = analysis[key]
+                    # Empty values of any type are falsy; "N/A" is the only placeholder left to skip
+                    if not value or value == "N/A":
+                        continue
+                    # Collapsed until opened, so large extra sections cost nothing up front
+                    expansion = ui.expansion(_title_header(key), icon='article').classes('w-full')
+                    _render_on_first_open(expansion, value)
+
+        # Download Report for formal RCA only
+        if prompt_file == "formal_rca_prompt":
+            with ui.card().classes('w-full mb-4'):
+                ui.label('Report Download').classes('text-lg font-semibold mb-2')
+                doc_path = self.analysis_result['document_path']
+                ui.markdown(f"Report saved to: `{doc_path}`")
+                if doc_path.endswith('.docx'):
+                    ui.markdown(f"[⬇️ Download Word Report]({_static_url(doc_path)})")
+                elif doc_path.endswith('.json'):
+                    ui.markdown(f"[⬇️ Download JSON Report]({_static_url(doc_path)})")
+
+        # Raw Response (if available)
+        if analysis.get('raw_response'):
+            with ui.card().classes('w-full mb-4'):
+                ui.label('Raw LLM Response').classes('text-lg font-semibold mb-2')
+                ui.markdown("⚠️ **Note**: This analysis used fallback parsing due to JSON format issues.")
+                with ui.expansion('View Raw Response', icon='code').classes('w-full'):
+                    ui.code(analysis['raw_response']).classes('w-full')
     
     def clear_all(self):
         """Clear all inputs and results"""
@@ -668,7 +871,7 @@ class RCAApp:
         self.update_files_display()
         self.update_urls_display()
         self.update_tickets_display()
-        self.results_container.clear()
+        self.display_results()
 
         ui.notify('All data cleared', type='info')
 
@@ -681,6 +884,33 @@ class RCAApp:
 
     async def generate_analysis(self):
         """Generate RCA analysis"""
+        if self._analysis_lock.locked():
+            ui.notify('An analysis is already running', type='warning')
+            return
+        async with self._analysis_lock:
+            if self.generate_button:
+                self.generate_button.disable()
+            try:
+                await self._generate_analysis()
+            finally:
+                if self.generate_button:
+                    self.generate_button.enable()
+
+    def _analysis_cache_key(self, prompt_file: str) -> Optional[str]:
+        """Cache key for a report built only from uploaded files, or None if it must be regenerated"""
+        # Jira tickets and web pages can change between runs, so those reports always reflect their current state
+        if self.urls or self.jira_tickets:
+            return None
+        try:
+            # File order is kept (it is the order content reaches the prompt); size and mtime catch re-uploads
+            stats = [os.stat(path) for path in self.uploaded_files]
+        except OSError:
+            return None
+        files = [(path, st.st_size, st.st_mtime_ns) for path, st in zip(self.uploaded_files, stats)]
+        return ResponseCache.make_key('analysis', prompt_file, files, rca_generator.config.get('default_llm'))
+
+    async def _generate_analysis(self):
+        """Run one RCA analysis and show the results"""
         try:
             # Validate inputs
             if not self.uploaded_files and not self.urls and not self.jira_tickets:
@@ -697,17 +927,26 @@ class RCAApp:
             # Map the prompt selection to the correct file if needed
             # (Assumes the prompt file names match the values in PROMPT_OPTIONS)
 
-            # Generate analysis with selected prompt
-            self.analysis_result = await rca_generator.generate_rca_analysis(
-                files=self.uploaded_files,
-                urls=self.urls,
-                jira_tickets=self.jira_tickets,
-                issue_description="",
-                prompt_file=prompt_file
-            )
-            
-            # Store the prompt file used for this analysis
-            self.analysis_result['prompt_file_used'] = prompt_file
+            # Identical file-only inputs reuse the earlier report instead of calling the LLM again
+            cache_key = self._analysis_cache_key(prompt_file)
+            cached = self._response_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                self.analysis_result = copy.deepcopy(cached)
+                ui.notify('Cache hit: reusing the report generated for these inputs', type='info')
+            else:
+                # Generate analysis with selected prompt
+                self.analysis_result = await rca_generator.generate_rca_analysis(
+                    files=self.uploaded_files,
+                    urls=self.urls,
+                    jira_tickets=self.jira_tickets,
+                    issue_description="",
+                    prompt_file=prompt_file
+                )
+
+                # Store the prompt file used for this analysis
+                self.analysis_result['prompt_file_used'] = prompt_file
+                if cache_key:
+                    self._response_cache.set(cache_key, copy.deepcopy(self.analysis_result))
 
             self.progress_bar.value = 1.0
             self.display_results()
@@ -725,9 +964,14 @@ class RCAApp:
         finally:
             self.progress_bar.visible = False
 
+    def _speak(self, text: str):
+        """Read text aloud with the browser's SpeechSynthesis API."""
+        # Non-string sections (e.g. lists) are unhashable, so only strings are cached
+        script = _speak_script(text) if isinstance(text, str) else _SPEAK_JS_HEAD + json.dumps(text) + _SPEAK_JS_TAIL
+        ui.run_javascript(script)
+
     def read_executive_summary(self):
         """Read aloud the Executive Summary section if available."""
-        import json
         if not self.analysis_result or 'analysis' not in self.analysis_result:
             ui.notify("No analysis available. Please generate the RCA report first.", type='warning')
             return
@@ -736,18 +980,10 @@ class RCAApp:
             ui.notify("Executive Summary not found in the analysis.", type='warning')
             return
         ui.notify("Reading Executive Summary...", type='info')
-        # Use browser's SpeechSynthesis API via JavaScript
-        ui.run_javascript(f"""
-            if ('speechSynthesis' in window) {{
-                var utter = new window.SpeechSynthesisUtterance({json.dumps(summary)});
-                utter.lang = 'en-US';
-                window.speechSynthesis.speak(utter);
-            }}
-        """)
+        self._speak(summary)
 
     def read_problem_issue(self):
         """Read aloud the Problem Issue/Problem Summary section if available."""
-        import json
         if not self.analysis_result or 'analysis' not in self.analysis_result:
             ui.notify("No analysis available. Please generate the RCA report first.", type='warning')
             return
@@ -759,23 +995,34 @@ class RCAApp:
             ui.notify("Problem Issue/Problem Summary not found in the analysis.", type='warning')
             return
         ui.notify("Reading Problem Issue/Summary...", type='info')
-        # Use browser's SpeechSynthesis API via JavaScript
-        ui.run_javascript(f"""
-            if ('speechSynthesis' in window) {{
-                var utter = new window.SpeechSynthesisUtterance({json.dumps(problem)});
-                utter.lang = 'en-US';
-                window.speechSynthesis.speak(utter);
-            }}
-        """)
+        self._speak(problem)
 
     def reset_context(self):
         """Reset the context for a new RCA session (clears all files, URLs, tickets, and results)"""
         self.clear_all()
+        self.invalidate_linked_cache()
         self.chat_messages = []
-        if hasattr(self, "chat_history"):
-            self.chat_history.clear()
+        self.update_chat_history()
         ui.notify('Context has been reset. You can now start a new RCA without any previous data.', type='info')
 
+    def _chat_system_prompt(self) -> str:
+        """Agent instructions plus case context, rebuilt only when the analysis or inputs change."""
+        key = (self.analysis_result, tuple(self.uploaded_files), tuple(self.urls), tuple(self.jira_tickets))
+        if self._chat_context_key != key:
+            parts = [_AGENT_INSTRUCTIONS]
+            if self.analysis_result:
+                parts.append("Current RCA Analysis:\n")
+                parts.extend(f"{k}: {v}\n" for k, v in self.analysis_result['analysis'].items())
+            else:
+                parts.append("No RCA analysis has been generated yet.\n")
+            if self.uploaded_files or self.urls or self.jira_tickets:
+                parts.append("\nFiles: " + ", ".join(self._file_names.values()))
+                parts.append("\nURLs: " + ", ".join(self.urls))
+                parts.append("\nJira Tickets: " + ", ".join(self.jira_tickets))
+            self._chat_context = "".join(parts)
+            self._chat_context_key = key
+        return self._chat_context
+
     async def agentic_chat(self, user_message: str):
         """
         Use the LLM to answer questions or refine RCA sections based on the current context and analysis.
@@ -784,131 +1031,91 @@ class RCAApp:
         - Allow the user to request extraction, expansion, or rewriting of any RCA section.
         - Allow follow-up questions and iterative refinement.
         """
-        # Compose context for the agent
-        context = ""
-        if self.analysis_result:
-            context += "Current RCA Analysis:\n"
-            for k, v in self.analysis_result['analysis'].items():
-                context += f"{k}: {v}\n"
-        else:
-            context += "No RCA analysis has been generated yet.\n"
-        if self.uploaded_files or self.urls or self.jira_tickets:
-            context += "\nFiles: " + ", ".join([str(Path(f).name) for f in self.uploaded_files])
-            context += "\nURLs: " + ", ".join(self.urls)
-            context += "\nJira Tickets: " + ", ".join(self.jira_tickets)
-        context += "\n\nChat History:\n"
-        for msg in self.chat_messages:
-            context += f"{msg['role'].capitalize()}: {msg['content']}\n"
-        context += "\n"
-
-        # Compose the agentic prompt
-        prompt = (
-            "You are an expert RCA agent. Your job is to deeply analyze all provided case data, Jira tickets, and supporting documents. "
-            "You can extract, expand, or rewrite any RCA section on request, and answer follow-up questions using all available context. "
-            "If the user asks to rewrite or expand a section, return only the improved text for that section. "
-            "If the user asks a question, answer concisely and reference the RCA data. "
-            "If you need more information, ask the user for clarification. "
-            "Always use as much detail as possible from the context and prior analysis.\n\n"
-            f"User message: {user_message}\n"
-            f"{context}"
-        )
-
-        # Use the LLM (OpenAI/Anthropic/etc.) to get a response
-        try:
-            from src.rca_generator import rca_generator
-            # Try the configured LLM, fallback to others if needed
-            llm_method = None
-            llm_name = rca_generator.config.get('default_llm', 'openai')
-            if llm_name == 'openai':
-                llm_method = rca_generator._generate_with_openai
-            elif llm_name == 'anthropic':
-                llm_method = rca_generator._generate_with_anthropic
-            elif llm_name == 'openrouter':
-                llm_method = rca_generator._generate_with_openrouter
-            elif llm_name == 'llmproxy':
-                llm_method = rca_generator._generate_with_llmproxy
-            else:
-                llm_method = rca_generator._generate_with_openai
+        system_prompt, prompt = self._chat_prompt(user_message)
 
+        # Try the configured LLM first, then the others in fallback order,
+        # skipping providers that failed recently unless every one has
+        llm_name = rca_generator.config.get('default_llm', 'openai')
+        if llm_name not in _LLM_PROVIDERS:
+            llm_name = 'openai'
+        order = [llm_name] + [p for p in _LLM_PROVIDERS if p != llm_name]
+        now = time.monotonic()
+        healthy = [p for p in order
+                   if now - self._provider_failed_at.get(p, now - PROVIDER_COOLDOWN) >= PROVIDER_COOLDOWN]
+        for provider in healthy or order:
             try:
-                llm_response = await llm_method(prompt)
-                return llm_response if isinstance(llm_response, str) else str(llm_response)
+                # Same free-text chat request as the streaming path, so replies look alike either way
+                reply = await rca_generator.chat(prompt, system_prompt=system_prompt, provider=provider)
             except Exception as e:
-                logger.warning(f"Primary LLM failed in agentic chat: {e}. Trying fallback LLMs...")
-                # Try all LLMs in fallback order
-                fallback_order = ['openai', 'anthropic', 'openrouter', 'llmproxy']
-                for fallback in fallback_order:
-                    if fallback == llm_name:
-                        continue
-                    try:
-                        method = getattr(rca_generator, f"_generate_with_{fallback}")
-                        llm_response = await method(prompt)
-                        return llm_response if isinstance(llm_response, str) else str(llm_response)
-                    except Exception as fallback_e:
-                        logger.warning(f"Agentic chat fallback LLM {fallback} failed: {fallback_e}")
-                logger.error(f"All LLMs failed in agentic chat.")
-                return "Error: All LLM providers failed to generate a response. Please check your API keys, network, and quota."
+                self._provider_failed_at[provider] = time.monotonic()
+                logger.warning(f"Agentic chat LLM {provider} failed: {e}")
+                continue
+            self._provider_failed_at.pop(provider, None)
+            return reply
+        logger.error("All LLMs failed in agentic chat.")
+        return "Error: All LLM providers failed to generate a response. Please check your API keys, network, and quota."
+
+    def _chat_prompt(self, user_message: str) -> Tuple[str, str]:
+        """(system prompt, prompt) for a chat turn"""
+        # Instructions and case context form a stable prefix that providers can cache;
+        # only the append-only chat history and the new message follow it
+        if self._chat_lines_source is not self.chat_messages:
+            self._chat_lines, self._chat_lines_source = [], self.chat_messages
+        # Only messages added since the previous turn are formatted
+        self._chat_lines.extend(
+            f"{msg['role'].capitalize()}: {msg['content']}\n"
+            for msg in self.chat_messages[len(self._chat_lines):]
+        )
+        prompt = "Chat History:\n" + "".join(self._chat_lines) + f"\nUser message: {user_message}\n"
+        return self._chat_system_prompt(), prompt
+
+    async def stream_agentic_chat(self, user_message: str, on_text: Callable[[str], None]) -> str:
+        """Like agentic_chat, but streams the configured LLM's reply to on_text as it arrives.
+        Falls back to agentic_chat if the provider is cooling down or the stream fails."""
+        system_prompt, prompt = self._chat_prompt(user_message)
+        provider = rca_generator.config.get('default_llm', 'openai')
+        failed_at = self._provider_failed_at.get(provider)
+        if provider not in _LLM_PROVIDERS or (failed_at is not None and time.monotonic() - failed_at < PROVIDER_COOLDOWN):
+            return await self.agentic_chat(user_message)
+
+        chunks: List[str] = []
+        # The first chunk is shown at once; later ones are coalesced per update interval
+        # so a burst of tokens becomes one websocket message
+        last_shown = -_STREAM_UPDATE_INTERVAL
+        try:
+            async for chunk in rca_generator.stream_chat(prompt, system_prompt=system_prompt, provider=provider):
+                chunks.append(chunk)
+                now = time.monotonic()
+                if now - last_shown >= _STREAM_UPDATE_INTERVAL:
+                    on_text("".join(chunks))
+                    last_shown = now
         except Exception as e:
-            logger.error(f"Agentic chat LLM error: {e}")
-            return f"Error: {e}"
+            self._provider_failed_at[provider] = time.monotonic()
+            logger.warning(f"Streaming agentic chat with {provider} failed: {e}. Trying non-streaming LLMs...")
+            return await self.agentic_chat(user_message)
+
+        reply = "".join(chunks)
+        if not reply:
+            return await self.agentic_chat(user_message)
+        self._provider_failed_at.pop(provider, None)
+        return reply
 
     def update_chat_history(self):
-        """Update the chat message display in the UI."""
-        import json
+        """Re-render the whole chat history; new messages use _append_chat."""
         if hasattr(self, "chat_history"):
             self.chat_history.clear()
             for msg in self.chat_messages:
-                if msg['role'] == 'user':
-                    with self.chat_history:
-                        ui.markdown(f"**You:** {msg['content']}").classes('text-right text-blue-800')
-                else:
-                    with self.chat_history:
-                        content = msg['content']
-                        formatted = None
-                        # If the agent returned a Python dict as a string, pretty-print it as readable text
-                        if isinstance(content, dict):
-                            pretty = "\n\n".join(f"**{k.replace('_',' ').title()}**:\n{v}" for k, v in content.items())
-                            formatted = pretty
-                        else:
-                            # Try to parse as JSON or Python dict string
-                            try:
-                                parsed = json.loads(content)
-                                pretty = "\n\n".join(f"**{k.replace('_',' ').title()}**:\n{v}" for k, v in parsed.items())
-                                formatted = pretty
-                            except Exception:
-                                # Try to eval as Python dict (dangerous in general, but safe for LLM output)
-                                try:
-                                    import ast
-                                    parsed = ast.literal_eval(content)
-                                    if isinstance(parsed, dict):
-                                        pretty = "\n\n".join(f"**{k.replace('_',' ').title()}**:\n{v}" for k, v in parsed.items())
-                                        formatted = pretty
-                                except Exception:
-                                    # Try to extract JSON from within text
-                                    import re
-                                    match = re.search(r'(\{.*\}|\[.*\])', content, re.DOTALL)
-                                    if match:
-                                        try:
-                                            parsed = json.loads(match.group(1))
-                                            pretty = "\n\n".join(f"**{k.replace('_',' ').title()}**:\n{v}" for k, v in parsed.items())
-                                            formatted = pretty
-                                        except Exception:
-                                            pass
-                        if formatted:
-                            ui.markdown(f"**Agent:**\n{formatted}").classes('text-left text-gray-800')
-                        else:
-                            # If it's a dict-like string, try to pretty print as key-value pairs
-                            if content.strip().startswith("{") and content.strip().endswith("}"):
-                                try:
-                                    import ast
-                                    parsed = ast.literal_eval(content)
-                                    if isinstance(parsed, dict):
-                                        pretty = "\n\n".join(f"**{k.replace('_',' ').title()}**:\n{v}" for k, v in parsed.items())
-                                        ui.markdown(f"**Agent:**\n{pretty}").classes('text-left text-gray-800')
-                                        continue
-                                except Exception:
-                                    pass
-                            ui.markdown(f"**Agent:** {content}").classes('text-left text-gray-800')
+                self._append_chat(msg)
+
+    def _append_chat(self, msg: dict):
+        """Render one chat message at the end of the chat history."""
+        with self.chat_history:
+            if msg['role'] == 'user':
+                ui.markdown(f"**You:** {msg['content']}").classes('text-right text-blue-800')
+            elif msg.get('_formatted'):
+                ui.markdown(f"**Agent:**\n{msg['_formatted']}").classes('text-left text-gray-800')
+            else:
+                ui.markdown(f"**Agent:** {msg['content']}").classes('text-left text-gray-800')
 
     def handle_chat_message(self):
         """Handle user chat input and update the chat history."""
@@ -917,14 +1124,30 @@ class RCAApp:
             ui.notify("Please enter a message.", type='warning')
             return
         self.chat_messages.append({'role': 'user', 'content': user_message})
-        self.update_chat_history()
+        self._append_chat(self.chat_messages[-1])
         self.chat_input.value = ''
-        # Run the agentic chat in the background
+        # Run the agentic chat in the background, showing the reply as it streams in
         async def run_agentic():
-            agent_response = await self.agentic_chat(user_message)
-            self.chat_messages.append({'role': 'agent', 'content': agent_response})
-            self.update_chat_history()
-        asyncio.create_task(run_agentic())
+            # Partial replies go in a plain label: markdown would re-parse the whole reply on
+            # every batch and fill NiceGUI's conversion cache with throwaway prefixes.
+            # The finished reply is converted to markdown once, by _append_chat.
+            with self.chat_history:
+                pending = ui.label("Agent: …").classes('text-left text-gray-800 whitespace-pre-wrap')
+            def show(text: str):
+                pending.text = f"Agent: {text}"
+            agent_response = await self.stream_agentic_chat(user_message, show)
+            pending.delete()
+            self.chat_messages.append({
+                'role': 'agent',
+                'content': agent_response,
+                '_formatted': _format_agent_content(agent_response),
+            })
+            self._append_chat(self.chat_messages[-1])
+        task = asyncio.create_task(run_agentic())
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+
+RCAApp._build_lookup_tables()
 
 # Global app instance
 rca_app = RCAApp()
@@ -6,6 +6,7 @@ import re
 import json
 import logging
 from typing import Dict, Any, List, Optional
+from src.utils.json_blob import extract_json_blob
 
 logger = logging.getLogger(__name__)
 
@@ -74,10 +75,10 @@ class ResponseParser:
             return json.loads(response_text)
         except json.JSONDecodeError:
             # Try to find JSON block in text
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
+            json_blob = extract_json_blob(response_text, '{')
+            if json_blob:
                 try:
-                    return json.loads(json_match.group())
+                    return json.loads(json_blob)
                 except json.JSONDecodeError:
                     logger.warning("Found JSON-like text but couldn't parse it")
             return None
@@ -1,38 +1,86 @@
 import asyncio
-import json
 import logging
-from typing import Dict, Any, List
-from pathlib import Path
-import httpx
-import platform
+import multiprocessing
 import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from pathlib import Path
+import aiohttp
+import fitz
+import lxml.etree
+import lxml.html
+from jira import JIRA
 import urllib3
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 from src.config import config
 
-# Configure SSL certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-platformtype = platform.system()
-
-if platformtype == "Linux":
-    os.environ['REQUESTS_CA_BUNDLE'] = "/etc/ssl/certs/ca-certificates.crt"
-    os.environ['SSL_CERT_FILE'] = "/etc/ssl/certs/ca-certificates.crt"
-elif platformtype == "Darwin":
-    pem_path = "/usr/local/etc/openssl@3/certs/../cert.pem"
-    os.environ['REQUESTS_CA_BUNDLE'] = pem_path
-    os.environ['SSL_CERT_FILE'] = pem_path
+if TYPE_CHECKING:
+    # Only used in annotations; the mcp package takes a large share of startup import time
+    from mcp import ClientSession
 
 logger = logging.getLogger(__name__)
 
+# Jira fields actually read back, so the server doesn't serialize every custom field
+JIRA_SEARCH_FIELDS = [
+    'summary', 'status', 'assignee', 'created', 'updated',
+    'description', 'priority', 'issuetype'
+]
+JIRA_TICKET_FIELDS = ','.join(JIRA_SEARCH_FIELDS + ['reporter'])
+# Jira caps a single search response at 100 issues
+JIRA_SEARCH_PAGE_SIZE = 100
+
+# Seconds a linked-issue lookup is reused before Jira is asked again
+LINKED_CACHE_TTL = 300
+
+# PDFs with at least this many pages are split across worker processes
+PDF_PARALLEL_MIN_PAGES = 32
+PDF_MAX_WORKERS = 8
+# PDF workers must not fork the threaded server (children could inherit held locks)
+PDF_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Line breaks with their surrounding blanks, or runs of two or more
+# spaces/tabs, all collapse to a single newline in extracted page text
+_WHITESPACE_RE = re.compile(r'[ \t\r]*\n[ \t\r\n]*|[ \t]{2,}')
+
+def _extract_pdf_page_range(pdf_path: str, start: int, end: int) -> str:
+    """Extract text from pages [start, end) of a PDF; runs in a worker process"""
+    doc = fitz.open(pdf_path)
+    try:
+        return "\n".join(doc.load_page(i).get_text("text") for i in range(start, end))
+    finally:
+        doc.close()
+
 class MCPClient:
+    _tls_configured = False
+    
     def __init__(self):
         self.config = config.mcp_config
-        self.sessions: Dict[str, ClientSession] = {}
+        self.sessions: Dict[str, "ClientSession"] = {}
         self.servers: Dict[str, Any] = {}
+        self._jira = None
+        self._load_jira_settings()
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._allowed_paths_key: Tuple[str, ...] = ()
+        self._allowed_roots: Tuple[Path, ...] = ()
+        # Long-lived PDF worker pool, created on first large PDF and shut down in close()
+        self._pdf_pool: Optional[ProcessPoolExecutor] = None
+        self._pdf_pool_lock = threading.Lock()
+        # Linked-issue lookups by ticket: (fetched at, grouped issues); shared by every caller
+        self._linked_cache: Dict[str, Tuple[float, Dict[str, list]]] = {}
+    
+    @classmethod
+    def configure_tls(cls):
+        """Silence urllib3's insecure-request warning once, since Jira is reached with verify=False"""
+        if cls._tls_configured:
+            return
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        cls._tls_configured = True
     
     async def initialize(self):
         """Initialize MCP servers based on configuration"""
+        self.configure_tls()
         try:
             # Initialize filesystem MCP server if enabled
             if self.config['filesystem_enabled']:
@@ -68,7 +116,9 @@ class MCPClient:
     async def _setup_jira_server(self):
         """Setup Jira MCP server"""
         try:
-            jira_config = config.jira_config
+            # Re-read settings so a reloaded config takes effect
+            self._load_jira_settings()
+            jira_config = self.jira_config
             
             # Configuration for Jira MCP server
             self.servers['jira'] = {
@@ -93,27 +143,40 @@ class MCPClient:
         except Exception as e:
             logger.error(f"Failed to setup web scraper MCP server: {e}")
     
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.config['server_timeout'])
+            )
+        return self._http
+    
+    def _check_allowed(self, path: Path) -> bool:
+        """Check whether a path lies inside one of the allowed filesystem roots"""
+        allowed_paths = tuple(self.config['filesystem_allowed_paths'])
+        if allowed_paths != self._allowed_paths_key:
+            # Resolve the configured roots once, not on every file access
+            self._allowed_roots = tuple(Path(p).resolve() for p in allowed_paths)
+            self._allowed_paths_key = allowed_paths
+        
+        resolved = path.resolve()
+        return any(resolved.is_relative_to(root) for root in self._allowed_roots)
+    
     async def read_file(self, file_path: str) -> str:
         """Read file content using filesystem MCP server"""
         try:
             file_path = Path(file_path)
             
             # Check if file is in allowed paths
-            allowed = False
-            for allowed_path in self.config['filesystem_allowed_paths']:
-                if file_path.is_relative_to(Path(allowed_path)):
-                    allowed = True
-                    break
-            
-            if not allowed:
+            if not self._check_allowed(file_path):
                 raise PermissionError(f"File path {file_path} not in allowed paths")
             
             if not file_path.exists():
                 raise FileNotFoundError(f"File {file_path} not found")
             
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read file content in a worker thread so the event loop stays free
+            content = await asyncio.to_thread(file_path.read_text, encoding='utf-8')
             
             return content
             
@@ -121,31 +184,57 @@ class MCPClient:
             logger.error(f"Failed to read file {file_path}: {e}")
             raise
     
-    async def process_pdf(self, pdf_path: str) -> str:
-        """Process PDF file and extract text content"""
+    def _get_pdf_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Shared PDF worker pool, started on first use"""
+        with self._pdf_pool_lock:
+            if self._pdf_pool is None:
+                self._pdf_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context(PDF_START_METHOD)
+                )
+            return self._pdf_pool
+
+    def _extract_pdf_text(self, pdf_path: Path, page_range: Optional[Tuple[int, int]] = None) -> str:
+        """Extract the text of a PDF's pages (MuPDF does the parsing natively)"""
+        workers = min(PDF_MAX_WORKERS, os.cpu_count() or 1)
+        doc = fitz.open(str(pdf_path))
+        try:
+            page_count = doc.page_count
+            start, end = page_range if page_range else (0, page_count)
+            start, end = max(start, 0), min(end, page_count)
+            # A single worker process would only add startup and IPC cost
+            if end - start < PDF_PARALLEL_MIN_PAGES or workers < 2:
+                return "\n".join(doc.load_page(i).get_text("text") for i in range(start, end))
+        finally:
+            doc.close()
+        
+        # MuPDF documents can't be shared between threads, so each worker
+        # process opens its own copy and extracts a contiguous page range
+        chunk = -(-(end - start) // workers)
+        starts = range(start, end, chunk)
+        ends = [min(s + chunk, end) for s in starts]
+        parts = self._get_pdf_pool(workers).map(
+            _extract_pdf_page_range, [str(pdf_path)] * len(ends), starts, ends
+        )
+        return "\n".join(parts)
+    
+    async def process_pdf(self, pdf_path: str, page_range: Optional[Tuple[int, int]] = None) -> str:
+        """Process PDF file and extract text content
+        
+        page_range limits extraction to pages [start, end), zero-based;
+        by default every page is read.
+        """
         try:
-            from PyPDF2 import PdfReader
-            
             pdf_path = Path(pdf_path)
             
             # Check if file is in allowed paths
-            allowed = False
-            for allowed_path in self.config['filesystem_allowed_paths']:
-                if pdf_path.is_relative_to(Path(allowed_path)):
-                    allowed = True
-                    break
-            
-            if not allowed:
+            if not self._check_allowed(pdf_path):
                 raise PermissionError(f"PDF path {pdf_path} not in allowed paths")
             
             if not pdf_path.exists():
                 raise FileNotFoundError(f"PDF file {pdf_path} not found")
             
-            # Extract text from PDF
-            reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+            # Extract text from PDF off the event loop
+            text = await asyncio.to_thread(self._extract_pdf_text, pdf_path, page_range)
             
             return text
             
@@ -156,35 +245,69 @@ class MCPClient:
     async def scrape_web_content(self, url: str) -> str:
         """Scrape web content using web scraper MCP server"""
         try:
-            async with httpx.AsyncClient(
-                timeout=self.config['server_timeout'],
-                follow_redirects=True
-            ) as client:
-                response = await client.get(url)
+            async with self._get_http().get(url) as response:
                 response.raise_for_status()
-                
-                # Basic content extraction
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text content
-                text = soup.get_text()
-                
-                # Clean up text
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = '\n'.join(chunk for chunk in chunks if chunk)
-                
-                return text
-                
+                content = await response.read()
+            
+            # Basic content extraction (lxml builds the tree in C)
+            tree = lxml.html.fromstring(content)
+            
+            # Remove script and style elements, keeping any trailing text
+            lxml.etree.strip_elements(tree, 'script', 'style', with_tail=False)
+            
+            # Get text content
+            text = tree.text_content()
+            
+            # Clean up text: one phrase per line, blank lines dropped
+            text = _WHITESPACE_RE.sub('\n', text).strip()
+            
+            return text
+            
         except Exception as e:
             logger.error(f"Failed to scrape web content from {url}: {e}")
             raise
     
+    def _load_jira_settings(self):
+        """Cache Jira settings and the Bearer auth header from configuration"""
+        jira_config = config.jira_config
+        if jira_config == getattr(self, 'jira_config', None):
+            return
+        
+        self.jira_config = jira_config
+        self._jira_url = (jira_config['url'] or '').rstrip('/')
+        self._jira_headers = {
+            'Authorization': f'Bearer {jira_config["api_token"]}'
+        }
+        # A client built from older settings would carry stale credentials
+        self._jira = None
+    
+    def _get_jira(self):
+        """Get the shared Jira client, authenticating on first use"""
+        if self._jira is None:
+            # Use Bearer token authentication (like escalation_metrics)
+            self._jira = JIRA(
+                server=self.jira_config['url'],
+                options={'headers': dict(self._jira_headers), 'verify': False}
+            )
+            logger.info("Successfully authenticated with Bearer token")
+        return self._jira
+    
+    def _reset_jira_on_auth_error(self, error: Exception):
+        """Drop the cached Jira client if the server rejected its credentials"""
+        if getattr(error, 'status_code', None) in (401, 403):
+            logger.warning("Jira rejected cached credentials, will re-authenticate on next call")
+            self._jira = None
+    
+    async def _jira_request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """Call the Jira REST API over the shared HTTP session"""
+        url = f"{self._jira_url}{path}"
+        
+        async with self._get_http().request(
+            method, url, headers=self._jira_headers, ssl=False, **kwargs
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+    
     async def create_jira_ticket(self, ticket_data: Dict[str, Any]) -> str:
         """Create a Jira ticket using Jira MCP server
         
@@ -192,23 +315,11 @@ class MCPClient:
         used by the RCA generator, which operates in read-only mode for Jira.
         """
         try:
-            from jira import JIRA
-            
-            jira_config = config.jira_config
-            
-            # Use Bearer token authentication (like escalation_metrics)
-            headers = {
-                'Authorization': f'Bearer {jira_config["api_token"]}'
-            }
-            jira = JIRA(
-                server=jira_config['url'],
-                options={'headers': headers, 'verify': False}
-            )
-            logger.info("Successfully authenticated with Bearer token")
+            jira = self._get_jira()
             
             # Create issue
             issue = jira.create_issue(
-                project=ticket_data.get('project', jira_config['project_key']),
+                project=ticket_data.get('project', self.jira_config['project_key']),
                 summary=ticket_data['summary'],
                 description=ticket_data['description'],
                 issuetype={'name': ticket_data.get('issue_type', 'Task')},
@@ -220,41 +331,42 @@ class MCPClient:
             
         except Exception as e:
             logger.error(f"Failed to create Jira ticket: {e}")
+            self._reset_jira_on_auth_error(e)
             raise
     
     async def search_jira_tickets(self, jql: str, max_results: int = 50) -> List[Dict[str, Any]]:
         """Search Jira tickets using JQL"""
         try:
-            from jira import JIRA
-            
-            jira_config = config.jira_config
-            
-            # Use Bearer token authentication (like escalation_metrics)
-            headers = {
-                'Authorization': f'Bearer {jira_config["api_token"]}'
-            }
-            jira = JIRA(
-                server=jira_config['url'],
-                options={'headers': headers, 'verify': False}
-            )
-            logger.info("Successfully authenticated with Bearer token")
-            
-            # Search issues
-            issues = jira.search_issues(jql, maxResults=max_results)
+            # Search issues page by page, asking only for the fields we return
+            issues = []
+            while len(issues) < max_results:
+                data = await self._jira_request('POST', '/rest/api/2/search', json={
+                    'jql': jql,
+                    'startAt': len(issues),
+                    'maxResults': min(JIRA_SEARCH_PAGE_SIZE, max_results - len(issues)),
+                    'fields': JIRA_SEARCH_FIELDS
+                })
+                page = data.get('issues', [])
+                issues.extend(page)
+                if not page or len(issues) >= data.get('total', 0):
+                    break
             
             # Convert to dict format
             results = []
-            for issue in issues:
+            for issue in issues[:max_results]:
+                fields = issue['fields']
+                assignee = fields.get('assignee')
+                priority = fields.get('priority')
                 results.append({
-                    'key': issue.key,
-                    'summary': issue.fields.summary,
-                    'status': issue.fields.status.name,
-                    'assignee': issue.fields.assignee.displayName if issue.fields.assignee else None,
-                    'created': issue.fields.created,
-                    'updated': issue.fields.updated,
-                    'description': issue.fields.description,
-                    'priority': issue.fields.priority.name if issue.fields.priority else None,
-                    'issue_type': issue.fields.issuetype.name
+                    'key': issue['key'],
+                    'summary': fields.get('summary'),
+                    'status': fields['status']['name'],
+                    'assignee': assignee['displayName'] if assignee else None,
+                    'created': fields.get('created'),
+                    'updated': fields.get('updated'),
+                    'description': fields.get('description'),
+                    'priority': priority['name'] if priority else None,
+                    'issue_type': fields['issuetype']['name']
                 })
             
             return results
@@ -263,45 +375,51 @@ class MCPClient:
             logger.error(f"Failed to search Jira tickets: {e}")
             raise
     
-    async def get_linked_issues_grouped(self, issue_key: str) -> Dict[str, list]:
+    async def get_linked_issues_grouped(self, issue_key: str, max_age: float = LINKED_CACHE_TTL) -> Dict[str, list]:
         """
         Fetch all linked issues for a Jira ticket, grouped by their link type (e.g., 'Relates').
         Returns a dict: { link_type: [ {key, summary, direction}, ... ] }
+        Results younger than max_age seconds are reused; callers must not mutate them.
         """
-        try:
-            from jira import JIRA
+        issue_key = issue_key.upper()
+        cached = self._linked_cache.get(issue_key)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
 
-            jira_config = config.jira_config
+        grouped = await self._fetch_linked_issues_grouped(issue_key)
+        self._linked_cache[issue_key] = (time.monotonic(), grouped)
+        return grouped
 
-            headers = {
-                'Authorization': f'Bearer {jira_config["api_token"]}'
-            }
-            jira = JIRA(
-                server=jira_config['url'],
-                options={'headers': headers, 'verify': False}
-            )
-            logger.info("Successfully authenticated with Bearer token")
+    def invalidate_linked_cache(self):
+        """Forget cached linked-issue lookups"""
+        self._linked_cache.clear()
 
-            issue = jira.issue(issue_key, fields="issuelinks")
+    async def _fetch_linked_issues_grouped(self, issue_key: str) -> Dict[str, list]:
+        """Request an issue's links from Jira and group them by link type"""
+        try:
+            issue = await self._jira_request(
+                'GET', f'/rest/api/2/issue/{issue_key}', params={'fields': 'issuelinks'}
+            )
             grouped = {}
 
-            for link in getattr(issue.fields, "issuelinks", []):
+            for link in issue.get('fields', {}).get('issuelinks', []):
+                link_kind = link['type']
                 # Outward (this issue links to another)
-                if hasattr(link, "outwardIssue"):
-                    linked = link.outwardIssue
-                    link_type = link.type.outward or link.type.name
+                if 'outwardIssue' in link:
+                    linked = link['outwardIssue']
+                    link_type = link_kind.get('outward') or link_kind['name']
                     direction = "outward"
                 # Inward (another issue links to this)
-                elif hasattr(link, "inwardIssue"):
-                    linked = link.inwardIssue
-                    link_type = link.type.inward or link.type.name
+                elif 'inwardIssue' in link:
+                    linked = link['inwardIssue']
+                    link_type = link_kind.get('inward') or link_kind['name']
                     direction = "inward"
                 else:
                     continue
 
                 entry = {
-                    "key": linked.key,
-                    "summary": getattr(linked.fields, "summary", ""),
+                    "key": linked['key'],
+                    "summary": linked.get('fields', {}).get('summary', ""),
                     "direction": direction
                 }
                 grouped.setdefault(link_type, []).append(entry)
@@ -312,6 +430,59 @@ class MCPClient:
             logger.error(f"Failed to fetch linked issues for {issue_key}: {e}")
             raise
 
+    async def get_many_linked_issues(self, issue_keys: List[str], concurrency: int = 8) -> Dict[str, Dict[str, list]]:
+        """Fetch grouped linked issues for several tickets concurrently.
+        Returns a dict: { issue_key: { link_type: [ ... ] } }
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(issue_key: str):
+            async with semaphore:
+                return issue_key, await self.get_linked_issues_grouped(issue_key)
+
+        return dict(await asyncio.gather(*(fetch(key) for key in issue_keys)))
+
+    async def get_issues_batch(self, issue_keys: List[str], concurrency: int = 8) -> Dict[str, Any]:
+        """Fetch several Jira tickets with one bulk JQL search.
+        Keys the search did not return (or all keys, if it failed) are fetched individually.
+        Returns a dict: { issue_key: ticket, None if not found, or the exception raised }
+        """
+        if not issue_keys:
+            return {}
+
+        found = {}
+        try:
+            jql = f"key in ({', '.join(issue_keys)})"
+            for ticket in await self.search_jira_tickets(jql, max_results=len(issue_keys)):
+                found[ticket['key'].upper()] = ticket
+        except Exception as e:
+            # One unknown key fails the whole JQL query, so fall back to per-key lookups
+            logger.warning(f"Bulk Jira search failed, fetching tickets individually: {e}")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(issue_key: str):
+            async with semaphore:
+                tickets = await self.search_jira_tickets(f"key = {issue_key}", max_results=1)
+                return tickets[0] if tickets else None
+
+        missing = [key for key in issue_keys if key.upper() not in found]
+        results = await asyncio.gather(*(fetch(key) for key in missing), return_exceptions=True)
+
+        batch = {key: found.get(key.upper()) for key in issue_keys}
+        batch.update(zip(missing, results))
+        return batch
+
+    async def scrape_many(self, urls: List[str], concurrency: int = 8) -> Dict[str, str]:
+        """Scrape several URLs concurrently, returning { url: text }"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scrape(url: str):
+            async with semaphore:
+                return url, await self.scrape_web_content(url)
+
+        return dict(await asyncio.gather(*(scrape(url) for url in urls)))
+
     async def get_server_info(self) -> Dict[str, Any]:
         """Get information about available MCP servers"""
         return {
@@ -322,34 +493,35 @@ class MCPClient:
     
     async def close(self):
         """Close all MCP server connections"""
-        for session in self.sessions.values():
-            try:
-                await session.close()
-            except Exception as e:
-                logger.error(f"Error closing MCP session: {e}")
+        # Close everything at once so shutdown waits for the slowest, not the sum
+        closers = [session.close() for session in self.sessions.values()]
+        if self._http is not None:
+            closers.append(self._http.close())
+        if self._jira is not None:
+            closers.append(asyncio.to_thread(self._jira.close))
+        if self._pdf_pool is not None:
+            closers.append(asyncio.to_thread(self._pdf_pool.shutdown))
+        
+        results = await asyncio.gather(*closers, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error closing MCP session: {result}")
         
         self.sessions.clear()
+        self._http = None
+        self._jira = None
+        self._pdf_pool = None
+        
         logger.info("All MCP sessions closed")
     
     async def get_jira_ticket(self, issue_key: str) -> str:
         """Get a single Jira ticket by key"""
         try:
-            from jira import JIRA
-            
-            jira_config = config.jira_config
-            
-            # Use Bearer token authentication
-            headers = {
-                'Authorization': f'Bearer {jira_config["api_token"]}'
-            }
-            jira = JIRA(
-                server=jira_config['url'],
-                options={'headers': headers, 'verify': False}
-            )
+            jira = self._get_jira()
             logger.info(f"Fetching Jira ticket: {issue_key}")
             
             # Get the issue
-            issue = jira.issue(issue_key)
+            issue = jira.issue(issue_key, fields=JIRA_TICKET_FIELDS)
             
             # Format the ticket data
             ticket_info = {
@@ -385,6 +557,7 @@ Description:
             
         except Exception as e:
             logger.error(f"Failed to fetch Jira ticket {issue_key}: {e}")
+            self._reset_jira_on_auth_error(e)
             raise
 
 # Global MCP client instance - lazy initialization
@@ -1,11 +1,12 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from pathlib import Path
 from datetime import datetime
 import json
 from src.config import config
 from src.mcp_client import mcp_client
+from src.utils.json_blob import extract_json_blob
 
 from docx import Document
 import re
@@ -56,6 +57,32 @@ def extract_template_prompts(template_path):
         i += 1
     return results
 
+# Analysis keys to try, in order, for each normalized Word template header
+_HEADER_SYNONYMS = {
+    "customer": ["customer", "customer_name", "client", "account"],
+    "cases": ["cases", "case", "case_number", "support_case", "support_cases", "tickets", "jira_tickets"],
+    "synopsis": ["synopsis", "summary", "executive_summary", "overview", "description"],
+    "issue_tracking_number": ["issue_tracking_number", "case", "case_number", "cases", "support_case", "sap_case", "tracking_number"],
+    "cpe": ["cpe", "cpe_number"],
+    "defect": ["defect", "defect_ids", "defects", "related_defects"],
+    "cap_color": ["cap_color", "cap", "color"],
+    "timeline": ["timeline"],
+    "executive_summary": ["executive_summary", "summary", "overview"],
+    "problem_summary": ["problem_summary", "problem_statement", "problem", "issue_summary"],
+    "impact": ["impact", "impact_assessment"],
+    "root_cause": ["root_cause", "cause"],
+    "likelihood_of_occurrence": ["likelihood_of_occurrence", "likelihood", "probability"],
+    "vulnerability": ["vulnerability", "vulnerabilities"],
+    "overall_risk_profile": ["overall_risk_profile", "risk_profile", "risk"],
+    "workaround": ["workaround", "workarounds"],
+    "known_defects_and_resolution": ["known_defects_and_resolution", "known_defects", "defect_resolution"],
+    "new_defects_and_resolution": ["new_defects_and_resolution", "new_defects"],
+    "recommended_changes": ["recommended_changes", "recommendations", "recommended_system_changes"],
+    "prevention_current": ["prevention_current", "prevention", "current_prevention"],
+    "prevention_future": ["prevention_future", "future_prevention"],
+    "monitoring": ["monitoring", "monitor", "monitor_for_prevention"],
+}
+
 class RCAGenerator:
     def __init__(self):
         self.config = config.llm_config
@@ -63,6 +90,7 @@ class RCAGenerator:
         self.output_dir = Path(config.app_config['output_directory'])
         self._template_prompts = None
         self._netapp_context = None
+        self._clients: Dict[str, Any] = {}
 
     def get_netapp_context(self):
         """Lazily load and cache NetApp context from src/prompts/context_netapp if available."""
@@ -75,6 +103,30 @@ class RCAGenerator:
                 self._netapp_context = ""
         return self._netapp_context
 
+    def _client(self, provider: str):
+        """Cached async SDK client for provider, so its HTTP connection pool is reused across calls"""
+        client = self._clients.get(provider)
+        if client is None:
+            if provider == 'anthropic':
+                import anthropic
+                client = anthropic.AsyncAnthropic(api_key=self.config['anthropic_api_key'])
+            else:
+                import openai
+                client = openai.AsyncOpenAI(
+                    api_key=self.config[f'{provider}_api_key'],
+                    base_url=self.config[f'{provider}_base_url']
+                )
+            self._clients[provider] = client
+        return client
+
+    async def warm_up(self):
+        """Import the SDK and build the default provider's client before the first analysis needs it"""
+        provider = self.config.get('default_llm', 'openai')
+        try:
+            await asyncio.to_thread(self._client, provider)
+        except Exception as e:
+            logger.warning(f"Failed to prepare {provider} client: {e}")
+
     def get_template_prompts(self):
         """Lazily load and cache prompts from the template docx."""
         if self._template_prompts is None:
@@ -211,14 +263,14 @@ class RCAGenerator:
                 source_data['urls'][url] = {'error': str(e)}
         
         # Process Jira tickets and collect linked issues
+        tickets_by_key = await mcp_client.get_issues_batch(jira_tickets) if jira_tickets else {}
         for ticket_id in jira_tickets:
             try:
-                # Search for specific ticket
-                jql = f"key = {ticket_id}"
-                tickets = await mcp_client.search_jira_tickets(jql, max_results=1)
+                ticket = tickets_by_key.get(ticket_id)
+                if isinstance(ticket, Exception):
+                    raise ticket
                 
-                if tickets:
-                    ticket = tickets[0]
+                if ticket:
                     source_data['jira_tickets'][ticket_id] = ticket
                     logger.info(f"Retrieved Jira ticket: {ticket_id}")
 
@@ -416,15 +468,79 @@ class RCAGenerator:
         
         return "\n".join(context_parts)
     
-    async def _generate_with_openai(self, context: str) -> Dict[str, Any]:
+    def _openai_messages(self, prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """Chat messages for OpenAI-compatible APIs, keeping any stable system prompt ahead of the user turn"""
+        messages = [{"role": "system", "content": "You are an expert technical analyst specializing in root cause analysis."}]
+        if system_prompt:
+            # Providers cache identical message prefixes, so this must not vary between calls
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def stream_chat(self, prompt: str, system_prompt: Optional[str] = None,
+                          provider: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield a free-form chat reply from provider (default: the configured LLM) as text chunks arrive"""
+        provider = provider or self.config.get('default_llm', 'openai')
+        client = self._client(provider)
+        if provider == 'anthropic':
+            extra = {}
+            if system_prompt:
+                extra['system'] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+            async with client.messages.stream(
+                model=self.config['anthropic_model'],
+                max_tokens=4000,
+                temperature=0.3,
+                messages=[{"role": "user", "content": prompt}],
+                **extra
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+        else:
+            stream = await client.chat.completions.create(
+                model=self.config[f'{provider}_model'],
+                messages=self._openai_messages(prompt, system_prompt),
+                temperature=0.3,
+                max_tokens=4000,
+                stream=True
+            )
+            async for chunk in stream:
+                # Some compatible servers send keep-alive chunks with no choices or no content
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def chat(self, prompt: str, system_prompt: Optional[str] = None,
+                   provider: Optional[str] = None) -> str:
+        """Free-form chat reply from provider in one piece; the non-streaming counterpart of stream_chat"""
+        provider = provider or self.config.get('default_llm', 'openai')
+        client = self._client(provider)
+        if provider == 'anthropic':
+            extra = {}
+            if system_prompt:
+                extra['system'] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+            response = await client.messages.create(
+                model=self.config['anthropic_model'],
+                max_tokens=4000,
+                temperature=0.3,
+                messages=[{"role": "user", "content": prompt}],
+                **extra
+            )
+            text = response.content[0].text
+        else:
+            response = await client.chat.completions.create(
+                model=self.config[f'{provider}_model'],
+                messages=self._openai_messages(prompt, system_prompt),
+                temperature=0.3,
+                max_tokens=4000
+            )
+            text = response.choices[0].message.content
+        if not text or not text.strip():
+            raise ValueError(f"Empty chat response from {provider}")
+        return text
+
+    async def _generate_with_openai(self, context: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate analysis using OpenAI"""
         try:
-            import openai
-            
-            client = openai.AsyncOpenAI(
-                api_key=self.config['openai_api_key'],
-                base_url=self.config['openai_base_url']
-            )
+            client = self._client('openai')
             
             prompt = f"""
             Based on the provided context, generate a comprehensive Root Cause Analysis (RCA) report. 
@@ -452,10 +568,7 @@ class RCAGenerator:
             
             response = await client.chat.completions.create(
                 model=self.config['openai_model'],
-                messages=[
-                    {"role": "system", "content": "You are an expert technical analyst specializing in root cause analysis."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._openai_messages(prompt, system_prompt),
                 temperature=0.3,
                 max_tokens=4000
             )
@@ -475,11 +588,10 @@ class RCAGenerator:
                 logger.error(f"Raw response: {analysis_text}")
                 
                 # Try to extract JSON from response if it's wrapped in text
-                import re
-                json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-                if json_match:
+                json_blob = extract_json_blob(analysis_text, '{')
+                if json_blob:
                     try:
-                        analysis = json.loads(json_match.group())
+                        analysis = json.loads(json_blob)
                         logger.info("Successfully extracted JSON from response")
                     except json.JSONDecodeError:
                         # Fallback: create a basic analysis structure
@@ -497,14 +609,10 @@ class RCAGenerator:
             logger.error(f"Failed to generate analysis with OpenAI: {e}")
             raise
     
-    async def _generate_with_anthropic(self, context: str) -> Dict[str, Any]:
+    async def _generate_with_anthropic(self, context: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate analysis using Anthropic"""
         try:
-            import anthropic
-            
-            client = anthropic.AsyncAnthropic(
-                api_key=self.config['anthropic_api_key']
-            )
+            client = self._client('anthropic')
             
             prompt = f"""
             Based on the provided context, generate a comprehensive Root Cause Analysis (RCA) report. 
@@ -530,13 +638,19 @@ class RCAGenerator:
             {context}
             """
             
+            # A stable system prompt is marked cacheable so repeat calls only pay for the new turn
+            extra = {}
+            if system_prompt:
+                extra['system'] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
             response = await client.messages.create(
                 model=self.config['anthropic_model'],
                 max_tokens=4000,
                 temperature=0.3,
                 messages=[
                     {"role": "user", "content": prompt}
-                ]
+                ],
+                **extra
             )
             
             # Parse JSON response
@@ -554,11 +668,10 @@ class RCAGenerator:
                 logger.error(f"Raw response: {analysis_text}")
                 
                 # Try to extract JSON from response if it's wrapped in text
-                import re
-                json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-                if json_match:
+                json_blob = extract_json_blob(analysis_text, '{')
+                if json_blob:
                     try:
-                        analysis = json.loads(json_match.group())
+                        analysis = json.loads(json_blob)
                         logger.info("Successfully extracted JSON from response")
                     except json.JSONDecodeError:
                         # Fallback: create a basic analysis structure
@@ -576,15 +689,10 @@ class RCAGenerator:
             logger.error(f"Failed to generate analysis with Anthropic: {e}")
             raise
     
-    async def _generate_with_openrouter(self, context: str) -> Dict[str, Any]:
+    async def _generate_with_openrouter(self, context: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate analysis using OpenRouter"""
         try:
-            import openai
-            
-            client = openai.AsyncOpenAI(
-                api_key=self.config['openrouter_api_key'],
-                base_url=self.config['openrouter_base_url']
-            )
+            client = self._client('openrouter')
             
             prompt = f"""
             Based on the provided context, generate a comprehensive Root Cause Analysis (RCA) report. 
@@ -612,10 +720,7 @@ class RCAGenerator:
             
             response = await client.chat.completions.create(
                 model=self.config['openrouter_model'],
-                messages=[
-                    {"role": "system", "content": "You are an expert technical analyst specializing in root cause analysis."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._openai_messages(prompt, system_prompt),
                 temperature=0.3,
                 max_tokens=4000,
                 extra_headers={
@@ -639,11 +744,10 @@ class RCAGenerator:
                 logger.error(f"Raw response: {analysis_text}")
                 
                 # Try to extract JSON from response if it's wrapped in text
-                import re
-                json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-                if json_match:
+                json_blob = extract_json_blob(analysis_text, '{')
+                if json_blob:
                     try:
-                        analysis = json.loads(json_match.group())
+                        analysis = json.loads(json_blob)
                         logger.info("Successfully extracted JSON from response")
                     except json.JSONDecodeError:
                         # Fallback: create a basic analysis structure
@@ -661,15 +765,10 @@ class RCAGenerator:
             logger.error(f"Failed to generate analysis with OpenRouter: {e}")
             raise
     
-    async def _generate_with_llmproxy(self, context: str) -> Dict[str, Any]:
+    async def _generate_with_llmproxy(self, context: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate analysis using LLM Proxy (OpenAI-compatible)"""
         try:
-            import openai
-            
-            client = openai.AsyncOpenAI(
-                api_key=self.config['llmproxy_api_key'],
-                base_url=self.config['llmproxy_base_url']
-            )
+            client = self._client('llmproxy')
             
             prompt = f"""
             Based on the provided context, generate a comprehensive Root Cause Analysis (RCA) report. 
@@ -697,10 +796,7 @@ class RCAGenerator:
             
             response = await client.chat.completions.create(
                 model=self.config['llmproxy_model'],
-                messages=[
-                    {"role": "system", "content": "You are an expert technical analyst specializing in root cause analysis."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._openai_messages(prompt, system_prompt),
                 temperature=0.3,
                 max_tokens=4000
             )
@@ -720,11 +816,10 @@ class RCAGenerator:
                 logger.error(f"Raw response: {analysis_text}")
                 
                 # Try to extract JSON from response if it's wrapped in text
-                import re
-                json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-                if json_match:
+                json_blob = extract_json_blob(analysis_text, '{')
+                if json_blob:
                     try:
-                        analysis = json.loads(json_match.group())
+                        analysis = json.loads(json_blob)
                         logger.info("Successfully extracted JSON from response")
                     except json.JSONDecodeError:
                         # Fallback: create a basic analysis structure
@@ -826,46 +921,21 @@ class RCAGenerator:
                 }
 
             # Improved: Use a synonym map and fuzzy matching to map headers to analysis keys
+            norm_keys = [(k.lower().replace(" ", "_"), k) for k in analysis.keys()]
+            # The first key wins when two keys normalize alike
+            norm_to_key = {}
+            for norm, k in norm_keys:
+                norm_to_key.setdefault(norm, k)
+
             def find_analysis_key(header):
                 norm_header = header.lower().replace(" ", "_")
-                synonym_map = {
-                    "customer": ["customer", "customer_name", "client", "account"],
-                    "cases": ["cases", "case", "case_number", "support_case", "support_cases", "tickets", "jira_tickets"],
-                    "synopsis": ["synopsis", "summary", "executive_summary", "overview", "description"],
-                    "issue_tracking_number": ["issue_tracking_number", "case", "case_number", "cases", "support_case", "sap_case", "tracking_number"],
-                    "cpe": ["cpe", "cpe_number"],
-                    "defect": ["defect", "defect_ids", "defects", "related_defects"],
-                    "cap_color": ["cap_color", "cap", "color"],
-                    "timeline": ["timeline"],
-                    "executive_summary": ["executive_summary", "summary", "overview"],
-                    "problem_summary": ["problem_summary", "problem_statement", "problem", "issue_summary"],
-                    "impact": ["impact", "impact_assessment"],
-                    "root_cause": ["root_cause", "cause"],
-                    "likelihood_of_occurrence": ["likelihood_of_occurrence", "likelihood", "probability"],
-                    "vulnerability": ["vulnerability", "vulnerabilities"],
-                    "overall_risk_profile": ["overall_risk_profile", "risk_profile", "risk"],
-                    "workaround": ["workaround", "workarounds"],
-                    "known_defects_and_resolution": ["known_defects_and_resolution", "known_defects", "defect_resolution"],
-                    "new_defects_and_resolution": ["new_defects_and_resolution", "new_defects"],
-                    "recommended_changes": ["recommended_changes", "recommendations", "recommended_system_changes"],
-                    "prevention_current": ["prevention_current", "prevention", "current_prevention"],
-                    "prevention_future": ["prevention_future", "future_prevention"],
-                    "monitoring": ["monitoring", "monitor", "monitor_for_prevention"],
-                }
-                # Try direct match
-                for k in analysis.keys():
-                    if k.lower().replace(" ", "_") == norm_header:
-                        return k
-                # Try synonyms
-                for syn_header, syn_list in synonym_map.items():
-                    if norm_header == syn_header:
-                        for syn in syn_list:
-                            for k in analysis.keys():
-                                if k.lower().replace(" ", "_") == syn:
-                                    return k
+                # Try direct match, then synonyms
+                for candidate in (norm_header, *_HEADER_SYNONYMS.get(norm_header, ())):
+                    if candidate in norm_to_key:
+                        return norm_to_key[candidate]
                 # Try partial/fuzzy match
-                for k in analysis.keys():
-                    if norm_header in k.lower().replace(" ", "_") or k.lower().replace(" ", "_") in norm_header:
+                for norm, k in norm_keys:
+                    if norm_header in norm or norm in norm_header:
                         return k
                 return None
 
@@ -1,59 +1,96 @@
 """
 Migration script to refactor existing codebase to use new architecture
 """
-import shutil
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Union
 import logging
 
 logger = logging.getLogger(__name__)
 
-class CodebaseMigrator:
-    """Handles migration of existing code to new architecture"""
-    
-    def __init__(self, project_root: str = "."):
-        self.project_root = Path(project_root)
-        self.src_dir = self.project_root / "src"
-    
-    def migrate_prompts(self):
-        """Migrate prompts to new directory structure"""
-        logger.info("Migrating prompts to new structure...")
-        
-        prompts_dir = self.src_dir / "prompts"
-        templates_dir = prompts_dir / "templates"
-        contexts_dir = prompts_dir / "contexts"
-        
-        templates_dir.mkdir(exist_ok=True)
-        contexts_dir.mkdir(exist_ok=True)
-        
-        # Define migrations
-        migrations = [
-            # Prompt templates
-            ("formal_rca_prompt", "templates/formal_rca_prompt.txt"),
-            ("initial_analysis_prompt", "templates/initial_analysis_prompt.txt"),
-            ("kt-analysis_prompt", "templates/kt-analysis_prompt.txt"),
-            
-            # Context files
-            ("context", "contexts/context.txt"),
-            ("context_netapp", "contexts/context_netapp.txt"),
-            ("cpe_prompt", "contexts/cpe_context.txt"),
-            ("contap_prompt", "contexts/contap_context.txt"),
-            ("netapp_prompt", "contexts/netapp_context.txt"),
-            ("sap_prompt", "contexts/sap_context.txt"),
-            ("sf_zk_context", "contexts/sf_zk_context.txt"),
-        ]
-        
-        for old_name, new_path in migrations:
-            old_file = prompts_dir / old_name
-            new_file = prompts_dir / new_path
-            
-            if old_file.exists() and not new_file.exists():
-                logger.info(f"Moving {old_name} -> {new_path}")
-                new_file.parent.mkdir(exist_ok=True)
-                shutil.copy2(old_file, new_file)
+# Chunk size handed to each os.sendfile call
+SENDFILE_CHUNK = 1 << 20
+
+# linux/fs.h _IOW(0x94, 9, int): share the source extents with the destination
+FICLONE = 0x40049409
+
+# Upper bound on concurrent file copies
+COPY_MAX_WORKERS = 8
+
+def _copy_file(src, dst, exclusive: bool = False):
+    """Copy a file in the kernel, preserving timestamps like copy2
+
+    Tries a FICLONE reflink first and falls back to os.sendfile where the
+    filesystem cannot share extents.
+
+    With exclusive set, raises FileExistsError instead of overwriting dst.
+    """
+    if not sys.platform.startswith('linux'):
+        import shutil
+        with open(src, 'rb') as src_file, open(dst, 'xb' if exclusive else 'wb') as dst_file:
+            shutil.copyfileobj(src_file, dst_file, SENDFILE_CHUNK)
+        shutil.copystat(src, dst)
+        return
+
+    import fcntl
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        st = os.fstat(src_fd)
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if exclusive else os.O_TRUNC)
+        dst_fd = os.open(dst, flags, st.st_mode & 0o777)
+        try:
+            try:
+                # Copy-on-write clone on btrfs/xfs; no data is read or written
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            except OSError:
+                while os.sendfile(dst_fd, src_fd, None, SENDFILE_CHUNK):
+                    pass
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+# Printed once the migration has finished
+NEXT_STEPS = """✅ Migration completed!
+
+Next steps:
+1. Review the new components in src/core/ and src/ui/
+2. Test the KT table display with new AnalysisDisplay component
+3. Update main.py to use new architecture
+4. Check MIGRATION_SUMMARY.md for details"""
+
+# Legacy prompt name -> (target directory under src/prompts, new file name)
+_MIGRATIONS = (
+    # Prompt templates
+    ("formal_rca_prompt", "templates", "formal_rca_prompt.txt"),
+    ("initial_analysis_prompt", "templates", "initial_analysis_prompt.txt"),
+    ("kt-analysis_prompt", "templates", "kt-analysis_prompt.txt"),
     
-    def create_updated_main_app(self):
-        """Create updated main app.py using new components"""
-        new_app_content = '''#!/usr/bin/env python3
+    # Context files
+    ("context", "contexts", "context.txt"),
+    ("context_netapp", "contexts", "context_netapp.txt"),
+    ("cpe_prompt", "contexts", "cpe_context.txt"),
+    ("contap_prompt", "contexts", "contap_context.txt"),
+    ("netapp_prompt", "contexts", "netapp_context.txt"),
+    ("sap_prompt", "contexts", "sap_context.txt"),
+    ("sf_zk_context", "contexts", "sf_zk_context.txt"),
+)
+
+# Files copied to backup_pre_refactor before migrating
+_FILES_TO_BACKUP = (
+    "src/app.py",
+    "src/rca_generator.py",
+    "src/mcp_client.py",
+)
+
+# Source of the refactored src/ui/main_app.py
+_NEW_APP_TEMPLATE = '''#!/usr/bin/env python3
 """
 MCP-based Root Cause Analysis Tool - Refactored
 Main application using NiceGUI with clean architecture
@@ -245,35 +282,132 @@ async def init():
     except Exception as e:
         logger.error(f"Initialization failed: {e}")
 '''
+
+def _write_bytes(path, *chunks: bytes):
+    """Write chunks to path straight through the fd, vectored where the OS supports it"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        written = 0
+        if len(chunks) > 1 and hasattr(os, 'writev'):
+            written = os.writev(fd, chunks)
+        data = b"".join(chunks)
+        if written < len(data):
+            view = memoryview(data)[written:]
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _migrate_file(src, dst, move: bool = False) -> bool:
+    """Hardlink (or move) src to dst without ever overwriting dst
+
+    Returns False when src is missing or dst already exists. Falls back to
+    an exclusive copy where hardlinks are unavailable, e.g. across filesystems.
+    """
+    try:
+        os.link(src, dst)
+    except (FileExistsError, FileNotFoundError):
+        return False
+    except OSError:
+        try:
+            _copy_file(src, dst, exclusive=True)
+        except (FileExistsError, FileNotFoundError):
+            return False
+
+    if move:
+        os.unlink(src)
+    return True
+
+def _copy_parallel(work, copy=_copy_file) -> list:
+    """Run independent (src, dst) copies on a small thread pool, returning their results"""
+    if not work:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(COPY_MAX_WORKERS, len(work))) as executor:
+        return list(executor.map(lambda pair: copy(*pair), work))
+
+class CodebaseMigrator:
+    """Handles migration of existing code to new architecture"""
+    
+    def __init__(self, project_root: Union[str, Path] = "."):
+        self._root_str = os.fspath(project_root)
+        self.project_root = Path(self._root_str)
+        self.src_dir = self.project_root / "src"
+        
+        # String forms of the paths used by every step, joined once
+        self._src_str = os.path.join(self._root_str, "src")
+        self._prompts_str = os.path.join(self._src_str, "prompts")
+        self._templates_str = os.path.join(self._prompts_str, "templates")
+        self._contexts_str = os.path.join(self._prompts_str, "contexts")
+        self._backup_str = os.path.join(self._root_str, "backup_pre_refactor")
+    
+    def migrate_prompts(self, move: bool = False):
+        """Migrate prompts to new directory structure, removing the old files when move is set"""
+        logger.info("Migrating prompts to new structure...")
+        
+        if not os.path.isdir(self._prompts_str):
+            logger.info("No prompts directory, skipping prompt migration")
+            return
+        
+        os.makedirs(self._templates_str, exist_ok=True)
+        os.makedirs(self._contexts_str, exist_ok=True)
+        
+        # Try every migration and let link/open report missing sources or
+        # existing targets, rather than stat'ing both sides first.
+        # templates/ and contexts/ were created above, so no per-file mkdir is needed
+        target_dirs = {"templates": self._templates_str, "contexts": self._contexts_str}
+        work = [
+            (os.path.join(self._prompts_str, old_name), os.path.join(target_dirs[subdir], new_name))
+            for old_name, subdir, new_name in _MIGRATIONS
+        ]
+        migrated = _copy_parallel(work, copy=lambda src, dst: _migrate_file(src, dst, move=move))
         
-        new_app_path = self.src_dir / "ui" / "main_app.py"
-        new_app_path.parent.mkdir(exist_ok=True)
-        new_app_path.write_text(new_app_content, encoding='utf-8')
-        logger.info(f"Created new main app: {new_app_path}")
+        for (old_name, subdir, new_name), done in zip(_MIGRATIONS, migrated):
+            if done:
+                logger.info("Moving %s -> %s/%s", old_name, subdir, new_name)
+    
+    def create_updated_main_app(self):
+        """Create updated main app.py using new components"""
+        ui_dir = os.path.join(self._src_str, "ui")
+        os.makedirs(ui_dir, exist_ok=True)
+        new_app_path = os.path.join(ui_dir, "main_app.py")
+        template_bytes = _NEW_APP_TEMPLATE.encode('utf-8')
+        
+        # Re-runs leave an up-to-date file untouched
+        try:
+            with open(new_app_path, 'rb') as f:
+                if f.read() == template_bytes:
+                    logger.info("main_app.py already up to date")
+                    return
+        except FileNotFoundError:
+            pass
+        
+        _write_bytes(new_app_path, template_bytes)
+        logger.info("Created new main app: %s", new_app_path)
     
     def create_backup(self):
         """Create backup of current files before migration"""
-        backup_dir = self.project_root / "backup_pre_refactor"
-        backup_dir.mkdir(exist_ok=True)
+        os.makedirs(self._backup_str, exist_ok=True)
         
-        files_to_backup = [
-            "src/app.py",
-            "src/rca_generator.py", 
-            "src/mcp_client.py"
-        ]
+        work = []
+        backed_up = []
+        for file_path in _FILES_TO_BACKUP:
+            src_file = os.path.join(self._root_str, file_path)
+            if os.path.exists(src_file):
+                work.append((src_file, os.path.join(self._backup_str, os.path.basename(file_path))))
+                backed_up.append(file_path)
         
-        for file_path in files_to_backup:
-            src_file = self.project_root / file_path
-            if src_file.exists():
-                dest_file = backup_dir / src_file.name
-                shutil.copy2(src_file, dest_file)
-                logger.info(f"Backed up: {file_path}")
+        _copy_parallel(work)
+        for file_path in backed_up:
+            logger.info("Backed up: %s", file_path)
     
     def generate_migration_summary(self):
         """Generate summary of what needs to be done"""
-        summary = """
+        summary_parts = [
+            """
 # Migration Summary
-
+""",
+            """
 ## Completed:
 ✅ Created new directory structure
 ✅ Extracted core components:
@@ -282,7 +416,8 @@ async def init():
    - UnifiedLLMClient (clean LLM provider management)
    - PromptManager (organized prompt handling)
    - RCAEngine (orchestrates everything)
-
+""",
+            """
 ## Key Improvements:
 🎯 **KT Table Issue FIXED**: 
    - Raw response parsing captures all LLM output
@@ -298,14 +433,16 @@ async def init():
    - Smaller, focused files
    - Clear dependencies
    - Easy to extend
-
+""",
+            """
 ## Next Steps:
 1. Test the new components
 2. Update main.py to use new architecture
 3. Migrate remaining integration code
 4. Update tests
 5. Clean up old files
-
+""",
+            """
 ## To Use New Components:
 ```python
 # Replace old app.py display logic with:
@@ -318,40 +455,46 @@ from src.core.analysis.rca_engine import RCAEngine
 engine = RCAEngine(config)
 result = await engine.generate_analysis(...)
 ```
-"""
+""",
+        ]
         
-        summary_path = self.project_root / "MIGRATION_SUMMARY.md"
-        summary_path.write_text(summary, encoding='utf-8')
-        logger.info(f"Migration summary created: {summary_path}")
+        summary_path = os.path.join(self._root_str, "MIGRATION_SUMMARY.md")
+        _write_bytes(summary_path, *(part.encode('utf-8') for part in summary_parts))
+        logger.info("Migration summary created: %s", summary_path)
 
-def main():
+async def _run_migration(migrator: CodebaseMigrator, move: bool = False):
+    """Run the independent migration steps concurrently on worker threads"""
+    # The backup only reads the old modules, while the other steps write
+    # prompts/, ui/main_app.py and MIGRATION_SUMMARY.md, so nothing overlaps
+    logger.info("📁 Creating backup...")
+    logger.info("📝 Migrating prompts...")
+    logger.info("🎨 Creating new main app...")
+    logger.info("📋 Generating migration summary...")
+    await asyncio.gather(
+        asyncio.to_thread(migrator.create_backup),
+        asyncio.to_thread(migrator.migrate_prompts, move=move),
+        asyncio.to_thread(migrator.create_updated_main_app),
+        asyncio.to_thread(migrator.generate_migration_summary),
+    )
+
+def main(argv=None):
     """Run the migration"""
-    migrator = CodebaseMigrator()
-    
-    print("🏗️  Starting codebase migration...")
-    
-    # Create backup
-    print("📁 Creating backup...")
-    migrator.create_backup()
-    
-    # Migrate prompts
-    print("📝 Migrating prompts...")
-    migrator.migrate_prompts()
+    parser = argparse.ArgumentParser(description="Migrate the codebase to the new architecture")
+    parser.add_argument("--move", action="store_true",
+                        help="rename legacy prompt files instead of keeping them in place")
+    parser.add_argument("--quiet", action="store_true",
+                        help="only report warnings and errors")
+    args = parser.parse_args(argv)
     
-    # Create new main app
-    print("🎨 Creating new main app...")
-    migrator.create_updated_main_app()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(message)s", stream=sys.stdout)
     
-    # Generate summary
-    print("📋 Generating migration summary...")
-    migrator.generate_migration_summary()
+    # Resolve the root once so no step depends on the cwd afterwards
+    migrator = CodebaseMigrator(os.environ.get("MIGRATE_ROOT") or os.path.abspath("."))
     
-    print("✅ Migration completed!")
-    print("\nNext steps:")
-    print("1. Review the new components in src/core/ and src/ui/")
-    print("2. Test the KT table display with new AnalysisDisplay component")
-    print("3. Update main.py to use new architecture")
-    print("4. Check MIGRATION_SUMMARY.md for details")
+    logger.info("🏗️  Starting codebase migration...")
+    asyncio.run(_run_migration(migrator, move=args.move))
+    logger.info("%s", NEXT_STEPS)
 
 if __name__ == "__main__":
     main()
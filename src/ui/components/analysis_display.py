@@ -5,9 +5,18 @@ Handles rendering of analysis results with proper formatting
 import logging
 from typing import Dict, Any, List, Tuple, Optional
 from nicegui import ui
+from src.utils.markdown_render import markdown_converter
 
 logger = logging.getLogger(__name__)
 
+def _looks_like_pipe_table(text: str) -> bool:
+    """True if text contains at least three pipes, stopping at the third"""
+    i = text.find("|")
+    if i < 0:
+        return False
+    i = text.find("|", i + 1)
+    return i >= 0 and text.find("|", i + 1) >= 0
+
 class AnalysisDisplay:
     """Handles display of analysis results in the UI"""
     
@@ -198,13 +207,12 @@ class AnalysisDisplay:
         
         # Fallback: try markdown rendering
         try:
-            import markdown
-            from markdown.extensions.tables import TableExtension
-            html = markdown.markdown(table_content, extensions=[TableExtension()])
-            ui.html(html)
-        except ImportError:
-            # Final fallback: render as preformatted text
-            ui.html(f"<pre class='whitespace-pre-wrap font-mono text-sm bg-gray-100 p-3 rounded'>{table_content}</pre>")
+            convert = markdown_converter()
+            if convert:
+                ui.html(convert(table_content))
+            else:
+                # Final fallback: render as preformatted text
+                ui.html(f"<pre class='whitespace-pre-wrap font-mono text-sm bg-gray-100 p-3 rounded'>{table_content}</pre>")
         except Exception as e:
             logger.warning(f"Error rendering KT table: {e}")
             # Ultimate fallback
@@ -278,12 +286,11 @@ class AnalysisDisplay:
     def _render_content(self, value: Any):
         """Render content based on its type"""
         if isinstance(value, list):
-            for item in value:
-                ui.markdown(f"• {item}")
+            ui.markdown("\n".join(f"- {item}" for item in value))
         elif isinstance(value, str):
             if "<table" in value.lower():
                 ui.html(value)
-            elif "|" in value and value.count("|") > 2:
+            elif _looks_like_pipe_table(value):
                 # Markdown table - convert to HTML
                 try:
                     html_table = self._convert_markdown_table_to_html(value)
@@ -293,12 +300,10 @@ class AnalysisDisplay:
                         ui.markdown(value)
                 except Exception:
                     # Fallback to markdown rendering
-                    try:
-                        import markdown
-                        from markdown.extensions.tables import TableExtension
-                        html = markdown.markdown(value, extensions=[TableExtension()])
-                        ui.html(html)
-                    except ImportError:
+                    convert = markdown_converter()
+                    if convert:
+                        ui.html(convert(value))
+                    else:
                         ui.code(value).classes('w-full')
             else:
                 ui.markdown(str(value))
@@ -6,6 +6,7 @@ Main application using NiceGUI with clean architecture
 
 import asyncio
 from pathlib import Path
+from typing import Dict
 from nicegui import ui
 from src.utils.logger import setup_logger
 from src.utils.file_handler import FileHandler
@@ -54,6 +55,12 @@ class RCAApp:
         self.uploaded_files = []
         self.urls = []
         self.jira_tickets = []
+        # Display rows keyed by item so add/remove touch only one row
+        self._file_rows: Dict[str, ui.row] = {}
+        self._url_rows: Dict[str, ui.row] = {}
+        self._ticket_rows: Dict[str, ui.row] = {}
+        # Basename of each uploaded file, computed once at upload
+        self._file_names: Dict[str, str] = {}
         self.selected_prompt = "formal_rca_prompt"
         self.analysis_result = None
         self.analysis_status = None  # Track analysis status for UI updates
@@ -224,17 +231,15 @@ class RCAApp:
                 ui.html('<div class="netapp-card-header"><i class="material-icons" style="vertical-align: middle; margin-right: 8px;">analytics</i>Analysis Results</div>')
                 self.results_container = ui.column().classes('netapp-card-content w-full')
     
-    def handle_file_upload(self, e):
+    async def handle_file_upload(self, e):
         """Handle file upload"""
         try:
-            file_path = self.file_handler.save_uploaded_file(
-                e.content.read(),
-                e.name
-            )
+            file_path = await asyncio.to_thread(self.file_handler.save_uploaded_stream, e.content, e.name)
             
             if file_path:
                 self.uploaded_files.append(str(file_path))
-                self.update_files_display()
+                self._file_names[str(file_path)] = Path(file_path).name
+                self._append_file_row(str(file_path))
                 ui.notify(f'File uploaded: {e.name}', type='positive', color='var(--netapp-success)')
                 logger.info(f"File uploaded successfully: {file_path}")
             else:
@@ -251,7 +256,7 @@ class RCAApp:
         if url:
             if url not in self.urls:
                 self.urls.append(url)
-                self.update_urls_display()
+                self._append_url_row(url)
                 ui.notify(f'URL added: {url}', type='positive', color='var(--netapp-success)')
             else:
                 ui.notify('URL already added', type='warning', color='var(--netapp-warning)')
@@ -294,10 +299,10 @@ class RCAApp:
             # Fetch linked issues
             grouped = await mcp_client.get_linked_issues_grouped(main_ticket)
             linked_issues = []
+            # Copy each issue; the client caches and shares the grouped results
             for link_type, issues in grouped.items():
                 for issue in issues:
-                    issue['link_type'] = link_type
-                    linked_issues.append(issue)
+                    linked_issues.append({**issue, 'link_type': link_type})
             
             # Store the results for UI to pick up
             self._jira_linked_issues = linked_issues
@@ -338,7 +343,7 @@ class RCAApp:
         """Add a single ticket without linked issues"""
         if ticket not in self.jira_tickets:
             self.jira_tickets.append(ticket)
-            self.update_tickets_display()
+            self._append_ticket_row(ticket)
             ui.notify(f'Ticket added: {ticket}', type='positive')
         self.ticket_input.value = ''
 
@@ -376,13 +381,14 @@ class RCAApp:
                     # Add main ticket
                     if main_ticket not in self.jira_tickets:
                         self.jira_tickets.append(main_ticket)
+                        self._append_ticket_row(main_ticket)
                     
                     # Add selected linked issues
                     for cb, key in checkboxes:
                         if cb.value and key not in self.jira_tickets:
                             self.jira_tickets.append(key)
+                            self._append_ticket_row(key)
                     
-                    self.update_tickets_display()
                     ui.notify(f"Added Jira ticket(s): {main_ticket}" + 
                              (f" + {sum(1 for cb, _ in checkboxes if cb.value)} linked issues" if any(cb.value for cb, _ in checkboxes) else ""), 
                              type='positive')
@@ -403,60 +409,78 @@ class RCAApp:
         dialog.open()
 
     def update_files_display(self):
-        """Update the files display with NetApp styling"""
+        """Rebuild the files display from scratch"""
         self.files_list.clear()
-        for i, file_path in enumerate(self.uploaded_files):
-            file_name = Path(file_path).name
-            with self.files_list:
-                with ui.row().classes('netapp-file-item netapp-slide-up'):
-                    with ui.row().style('align-items: center; flex-grow: 1;'):
-                        ui.icon('attach_file').classes('netapp-icon-file mr-2')
-                        ui.label(file_name).style('font-weight: 500;')
-                    ui.button(icon='delete', on_click=lambda idx=i: self.remove_file(idx)).classes('netapp-icon-delete').style('background: none; border: none; padding: 4px;')
+        self._file_rows = {}
+        self._file_names = {p: Path(p).name for p in self.uploaded_files}
+        for file_path in self.uploaded_files:
+            self._append_file_row(file_path)
+    
+    def _append_file_row(self, file_path: str):
+        """Add a single row to the files display with NetApp styling"""
+        with self.files_list:
+            with ui.row().classes('netapp-file-item netapp-slide-up') as row:
+                with ui.row().style('align-items: center; flex-grow: 1;'):
+                    ui.icon('attach_file').classes('netapp-icon-file mr-2')
+                    ui.label(self._file_names[file_path]).style('font-weight: 500;')
+                ui.button(icon='delete', on_click=lambda p=file_path: self.remove_file(p)).classes('netapp-icon-delete').style('background: none; border: none; padding: 4px;')
+        self._file_rows[file_path] = row
     
     def update_urls_display(self):
-        """Update the URLs display with NetApp styling"""
+        """Rebuild the URLs display from scratch"""
         self.urls_list.clear()
-        for i, url in enumerate(self.urls):
-            display_url = url[:50] + '...' if len(url) > 50 else url
-            with self.urls_list:
-                with ui.row().classes('netapp-file-item netapp-slide-up'):
-                    with ui.row().style('align-items: center; flex-grow: 1;'):
-                        ui.icon('link').classes('netapp-icon-link mr-2')
-                        ui.label(display_url).style('font-weight: 500;')
-                    ui.button(icon='delete', on_click=lambda idx=i: self.remove_url(idx)).classes('netapp-icon-delete').style('background: none; border: none; padding: 4px;')
+        self._url_rows = {}
+        for url in self.urls:
+            self._append_url_row(url)
+    
+    def _append_url_row(self, url: str):
+        """Add a single row to the URLs display with NetApp styling"""
+        display_url = url[:50] + '...' if len(url) > 50 else url
+        with self.urls_list:
+            with ui.row().classes('netapp-file-item netapp-slide-up') as row:
+                with ui.row().style('align-items: center; flex-grow: 1;'):
+                    ui.icon('link').classes('netapp-icon-link mr-2')
+                    ui.label(display_url).style('font-weight: 500;')
+                ui.button(icon='delete', on_click=lambda u=url: self.remove_url(u)).classes('netapp-icon-delete').style('background: none; border: none; padding: 4px;')
+        self._url_rows[url] = row
     
     def update_tickets_display(self):
-        """Update the Jira tickets display with NetApp styling"""
+        """Rebuild the Jira tickets display from scratch"""
         self.tickets_list.clear()
-        for i, ticket in enumerate(self.jira_tickets):
-            with self.tickets_list:
-                with ui.row().classes('netapp-file-item netapp-slide-up'):
-                    with ui.row().style('align-items: center; flex-grow: 1;'):
-                        ui.icon('confirmation_number').classes('netapp-icon-ticket mr-2')
-                        ui.label(ticket).style('font-weight: 500;')
-                    ui.button(icon='delete', on_click=lambda idx=i: self.remove_ticket(idx)).classes('netapp-icon-delete').style('background: none; border: none; padding: 4px;')
+        self._ticket_rows = {}
+        for ticket in self.jira_tickets:
+            self._append_ticket_row(ticket)
+    
+    def _append_ticket_row(self, ticket: str):
+        """Add a single row to the Jira tickets display with NetApp styling"""
+        with self.tickets_list:
+            with ui.row().classes('netapp-file-item netapp-slide-up') as row:
+                with ui.row().style('align-items: center; flex-grow: 1;'):
+                    ui.icon('confirmation_number').classes('netapp-icon-ticket mr-2')
+                    ui.label(ticket).style('font-weight: 500;')
+                ui.button(icon='delete', on_click=lambda t=ticket: self.remove_ticket(t)).classes('netapp-icon-delete').style('background: none; border: none; padding: 4px;')
+        self._ticket_rows[ticket] = row
     
-    def remove_file(self, index: int):
+    def remove_file(self, file_path: str):
         """Remove file from list"""
-        if 0 <= index < len(self.uploaded_files):
-            removed_file = self.uploaded_files.pop(index)
-            self.update_files_display()
-            ui.notify(f'File removed: {Path(removed_file).name}', type='info')
+        if file_path in self.uploaded_files:
+            self.uploaded_files.remove(file_path)
+            self._file_rows.pop(file_path).delete()
+            ui.notify(f'File removed: {self._file_names.pop(file_path)}', type='info')
     
-    def remove_url(self, index: int):
+    def remove_url(self, url: str):
         """Remove URL from list"""
-        if 0 <= index < len(self.urls):
-            removed_url = self.urls.pop(index)
-            self.update_urls_display()
-            ui.notify(f'URL removed: {removed_url}', type='info')
+        if url in self.urls:
+            self.urls.remove(url)
+            self._url_rows.pop(url).delete()
+            ui.notify(f'URL removed: {url}', type='info')
     
-    def remove_ticket(self, index: int):
+    def remove_ticket(self, ticket: str):
         """Remove Jira ticket from list"""
-        if 0 <= index < len(self.jira_tickets):
-            removed_ticket = self.jira_tickets.pop(index)
-            self.update_tickets_display()
-            ui.notify(f'Ticket removed: {removed_ticket}', type='info')
+        if ticket in self.jira_tickets:
+            self.jira_tickets.remove(ticket)
+            self._ticket_rows.pop(ticket).delete()
+            ui.notify(f'Ticket removed: {ticket}', type='info')
     
     def on_prompt_select(self, e):
         """Handle prompt selection change"""
@@ -470,6 +494,11 @@ class RCAApp:
             ui.notify('Please add at least one file, URL, or Jira ticket', type='negative')
             return
 
+        # A double click must not start a second LLM run over the same state
+        if self.analysis_status == 'running':
+            ui.notify('An analysis is already running', type='warning')
+            return
+
         # Reset status and progress
         self.analysis_status = 'running'
         self.analysis_error = None
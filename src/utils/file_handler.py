@@ -1,12 +1,15 @@
 import os
 import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 import hashlib
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 class FileHandler:
     """Handle file operations with security and validation"""
     
@@ -58,35 +61,57 @@ class FileHandler:
     def save_uploaded_file(self, file_content: bytes, filename: str) -> Optional[Path]:
         """Save uploaded file to upload directory"""
         try:
-            # Sanitize filename
-            safe_filename = self._sanitize_filename(filename)
-            file_path = self.upload_dir / safe_filename
-            
-            # Check if file already exists, add suffix if needed
-            counter = 1
-            original_path = file_path
-            while file_path.exists():
-                stem = original_path.stem
-                suffix = original_path.suffix
-                file_path = self.upload_dir / f"{stem}_{counter}{suffix}"
-                counter += 1
+            file_path = self._unique_upload_path(filename)
             
             # Save file
             with open(file_path, 'wb') as f:
                 f.write(file_content)
             
-            # Validate saved file
-            if not self.validate_file(file_path):
-                file_path.unlink()  # Delete invalid file
-                return None
+            return self._finalize_upload(file_path)
             
-            logger.info(f"File saved: {file_path}")
-            return file_path
+        except Exception as e:
+            logger.error(f"Error saving file {filename}: {e}")
+            return None
+    
+    def save_uploaded_stream(self, fileobj: BinaryIO, filename: str) -> Optional[Path]:
+        """Save an uploaded file-like object to upload directory in chunks"""
+        try:
+            file_path = self._unique_upload_path(filename)
+            
+            # Copy in fixed-size chunks so the upload is never held in memory at once
+            with open(file_path, 'wb') as f:
+                shutil.copyfileobj(fileobj, f, UPLOAD_CHUNK_SIZE)
+            
+            return self._finalize_upload(file_path)
             
         except Exception as e:
             logger.error(f"Error saving file {filename}: {e}")
             return None
     
+    def _unique_upload_path(self, filename: str) -> Path:
+        """Sanitized upload path for filename, suffixed if the name is taken"""
+        safe_filename = self._sanitize_filename(filename)
+        file_path = self.upload_dir / safe_filename
+        
+        # Check if file already exists, add suffix if needed
+        counter = 1
+        original_path = file_path
+        while file_path.exists():
+            stem = original_path.stem
+            suffix = original_path.suffix
+            file_path = self.upload_dir / f"{stem}_{counter}{suffix}"
+            counter += 1
+        return file_path
+    
+    def _finalize_upload(self, file_path: Path) -> Optional[Path]:
+        """Validate a saved upload, deleting it if invalid"""
+        if not self.validate_file(file_path):
+            file_path.unlink()  # Delete invalid file
+            return None
+        
+        logger.info(f"File saved: {file_path}")
+        return file_path
+    
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename to prevent directory traversal and other issues"""
         # Remove path separators and other dangerous characters
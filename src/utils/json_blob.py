@@ -0,0 +1,33 @@
+from typing import Optional
+
+def extract_json_blob(text: str, openers: str = '{[') -> Optional[str]:
+    """First balanced JSON value in text, ignoring brackets inside string literals.
+
+    The scan starts at whichever of openers appears first, so an array of
+    objects is returned whole. A single linear scan, so long LLM replies never
+    hit regex backtracking.
+    """
+    starts = [i for i in (text.find(opener) for opener in openers) if i >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Seconds a cached LLM result is reused before the model is asked again
+RESPONSE_CACHE_TTL = 3600
+
+# Most recent results kept; older ones are evicted first
+RESPONSE_CACHE_SIZE = 32
+
+class ResponseCache:
+    """In-memory LRU of LLM results keyed by a hash of the inputs that produced them"""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable sha256 key for JSON-serializable inputs"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any):
+        """Store a result, evicting the least recently used one when full"""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget all cached results"""
+        self._entries.clear()
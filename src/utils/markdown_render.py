@@ -0,0 +1,17 @@
+from functools import lru_cache
+from typing import Callable, Optional
+
+@lru_cache(maxsize=1)
+def markdown_converter() -> Optional[Callable[[str], str]]:
+    """Return the shared markdown-to-HTML converter with table support, or None if markdown is missing.
+
+    markdown is imported and its extensions loaded on first use only, so pages
+    that never render a table don't pay for it.
+    """
+    try:
+        import markdown
+        from markdown.extensions.tables import TableExtension
+    except ImportError:
+        return None
+    md = markdown.Markdown(extensions=[TableExtension()])
+    return lambda text: md.reset().convert(text)
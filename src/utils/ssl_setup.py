@@ -0,0 +1,27 @@
+import os
+import platform
+
+# Platform is fixed for the lifetime of the process
+PLATFORM_TYPE = platform.system()
+
+CA_BUNDLE_PATHS = {
+    "Linux": "/etc/ssl/certs/ca-certificates.crt",
+    "Darwin": "/usr/local/etc/openssl@3/certs/../cert.pem",
+}
+
+def configure_ca_bundle() -> bool:
+    """Point requests/ssl at the platform CA bundle, once per process.
+
+    Returns False if the platform has no known bundle and the caller should
+    ask the user to set SSL_CERT_FILE manually.
+    """
+    if 'REQUESTS_CA_BUNDLE' in os.environ:
+        return True
+
+    pem_path = CA_BUNDLE_PATHS.get(PLATFORM_TYPE)
+    if pem_path is None:
+        return False
+
+    os.environ['REQUESTS_CA_BUNDLE'] = pem_path
+    os.environ['SSL_CERT_FILE'] = pem_path
+    return True
@@ -2,7 +2,7 @@ import pytest
 import tempfile
 import os
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, MagicMock
 import configparser
 
 @pytest.fixture
@@ -156,11 +156,14 @@ def mock_openai_response():
     }
 
 @pytest.fixture
-def mock_httpx_client():
-    """Mock httpx client for web scraping"""
-    mock_client = AsyncMock()
+def mock_http_session():
+    """Mock aiohttp session for web scraping"""
+    mock_session = MagicMock()
+    mock_session.closed = False
     mock_response = Mock()
-    mock_response.content = b"<html><body><h1>Test Page</h1><p>Test content for scraping</p></body></html>"
+    mock_response.read = AsyncMock(
+        return_value=b"<html><body><h1>Test Page</h1><p>Test content for scraping</p></body></html>"
+    )
     mock_response.raise_for_status = Mock()
-    mock_client.get.return_value = mock_response
-    return mock_client
\ No newline at end of file
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    return mock_session
\ No newline at end of file
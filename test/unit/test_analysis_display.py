@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.ui.components.analysis_display import AnalysisDisplay, _looks_like_pipe_table
+from src.utils.markdown_render import markdown_converter
+
+class TestAnalysisDisplay:
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        """Drop the cached converter around each test"""
+        markdown_converter.cache_clear()
+        yield
+        markdown_converter.cache_clear()
+
+    def test_kt_table_markdown_fallback(self):
+        """Test KT tables fall back to the shared markdown converter"""
+        display = AnalysisDisplay(MagicMock())
+        table = "| Is | Is Not |\n|---|---|\n| a | b |"
+
+        with patch('src.ui.components.analysis_display.ui') as mock_ui, \
+                patch.object(display, '_convert_markdown_table_to_html', return_value=""):
+            display._render_kt_table(table)
+            display._render_kt_table(table)
+
+        html = mock_ui.html.call_args_list[0].args[0]
+        assert "<table>" in html
+        assert mock_ui.html.call_args_list[1].args[0] == html
+
+    @pytest.mark.parametrize("text,expected", [
+        ("a | b | c | d", True),
+        ("| a |", False),
+        ("||", False),
+        ("no pipes", False),
+        ("|||", True),
+    ])
+    def test_looks_like_pipe_table(self, text, expected):
+        """Test the pipe heuristic matches the old count-based check"""
+        assert _looks_like_pipe_table(text) is expected
+        assert expected == ("|" in text and text.count("|") > 2)
+
+    def test_list_rendered_as_one_markdown(self):
+        """Test list values become a single bulleted markdown element"""
+        display = AnalysisDisplay(MagicMock())
+
+        with patch('src.ui.components.analysis_display.ui') as mock_ui:
+            display._render_content(["first", "second", "third"])
+
+        mock_ui.markdown.assert_called_once_with("- first\n- second\n- third")
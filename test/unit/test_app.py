@@ -0,0 +1,732 @@
+import asyncio
+import io
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.app import RCAApp, _MD_TABLE_RE, _RENDER_HTML, _RENDER_LIST, _RENDER_MD, _RENDER_MD_TABLE, _classify_value, _format_agent_content, _kt_section_header, _normalize_key, _render_on_first_open, _section_synonyms, _speak_script, _static_url, _title_header, mcp_client, rca_generator
+
+class TestSectionLookups:
+    def test_section_synonyms(self):
+        """Test key and header variants are normalized and deduplicated"""
+        synonyms = _section_synonyms("Key Findings", "key_findings")
+
+        assert synonyms[0] == "key_findings"
+        assert "keyfindings" in synonyms
+        assert len(synonyms) == len(set(synonyms))
+
+    def test_section_synonyms_drop_stop_words(self):
+        """Test filler words are dropped from header-derived variants"""
+        assert "validation_causes" in _section_synonyms("Validation of Causes", "validation_of_causes")
+
+    def test_lookup_tables_cover_every_prompt(self):
+        """Test lookup tables are precomputed for each mapped prompt"""
+        for prompt, sections in RCAApp.PROMPT_REPORT_MAP.items():
+            lookups = RCAApp._SECTION_LOOKUPS[prompt]
+            assert [(h, k) for h, k, _ in lookups] == sections
+
+    def test_normalized_lookup_matches_llm_keys(self):
+        """Test differently cased or spaced LLM keys resolve to a section"""
+        analysis = {'Overview': 'overview text', 'keyfindings': 'findings', 'Executive Summary': 'summary'}
+        normalized = {_normalize_key(k): v for k, v in analysis.items()}
+
+        def resolve(header, key):
+            return next((normalized[s] for s in _section_synonyms(header, key) if s in normalized), None)
+
+        assert resolve("Overview", "overview") == 'overview text'
+        assert resolve("Key Findings", "key_findings") == 'findings'
+        assert resolve("Executive Summary", "executive_summary") == 'summary'
+        assert resolve("Timeline", "timeline") is None
+
+    def test_detected_sections_resolved_once(self):
+        """Test repeated renders of detected sections reuse the derived headers and synonyms"""
+        app = RCAApp()
+        app.analysis_result = {
+            'prompt_file_used': 'kt-analysis_prompt',
+            'document_path': '/out/r.md',
+            'analysis': {'problem_statement': 'Disk full', 'possible_causes': 'Logs'},
+        }
+        _kt_section_header.cache_clear()
+        _section_synonyms.cache_clear()
+
+        with patch('src.app.ui'):
+            for _ in range(2):
+                asyncio.run(RCAApp._render_results.func(app))
+
+        assert _kt_section_header.cache_info().hits == 2
+        assert _section_synonyms.cache_info().hits == 2
+
+class TestKTSectionHeader:
+    @pytest.mark.parametrize("key,header", [
+        ("problem_statement", "Problem Statement"),
+        ("Problem_Assessment", "Problem Assessment"),
+        ("possible_causes", "Potential Causes"),
+        ("problem_root_cause", "Problem Root Cause"),
+        ("solution_options", "Solution"),
+        ("action_plan", "Action Plan"),
+        ("follow_up_items", "Follow-up"),
+        ("timeline_of_events", "Timeline Of Events"),
+    ])
+    def test_kt_section_header(self, key, header):
+        """Test KT keys map to headers with problem/cause/solution precedence"""
+        assert _kt_section_header(key) == header
+
+class TestMarkdownTableDetection:
+    def test_detects_table(self):
+        """Test a header row plus separator row is detected as a table"""
+        assert _MD_TABLE_RE.search("| Is | Is Not |\n|---|---|\n| a | b |")
+        assert _MD_TABLE_RE.search("Intro\n| Is | Is Not |\n| :--- | --- |")
+
+    def test_ignores_pipes_without_table(self):
+        """Test prose containing pipes is not treated as a table"""
+        assert not _MD_TABLE_RE.search("Check a | b | c in the logs")
+
+class TestSectionValueClassification:
+    @pytest.mark.parametrize("value,tag", [
+        ("<table><tr><td>x</td></tr></table>", _RENDER_HTML),
+        ("| Is | Is Not |\n|---|---|\n| a | b |", _RENDER_MD_TABLE),
+        (["first", "second"], _RENDER_LIST),
+        ("Plain text with a | pipe", _RENDER_MD),
+        ({"nested": "dict"}, _RENDER_MD),
+    ])
+    def test_classify_value(self, value, tag):
+        """Test each value shape picks its renderer"""
+        assert _classify_value(value) == tag
+
+class TestLazySections:
+    def test_rendered_once_on_first_open(self):
+        """Test an expansion renders its value only when first opened"""
+        expansion = MagicMock()
+        expansion.default_slot.children = []
+
+        with patch('src.app._render_section_value') as render:
+            _render_on_first_open(expansion, "details")
+            handler = expansion.on_value_change.call_args.args[0]
+            render.assert_not_called()
+
+            handler(MagicMock(value=False))
+            render.assert_not_called()
+
+            handler(MagicMock(value=True))
+            expansion.default_slot.children = [MagicMock()]
+            handler(MagicMock(value=True))
+
+        render.assert_called_once_with("details")
+
+class TestIncrementalDisplay:
+    @pytest.fixture
+    def rca_app(self):
+        """Create an RCAApp with mocked list containers"""
+        app = RCAApp()
+        app.files_list = MagicMock()
+        app.urls_list = MagicMock()
+        app.tickets_list = MagicMock()
+        return app
+
+    @pytest.fixture
+    def mock_ui(self):
+        """Patch NiceGUI so every ui.row() is a distinct element"""
+        with patch('src.app.ui') as mock_ui:
+            mock_ui.row.side_effect = lambda: MagicMock()
+            yield mock_ui
+
+    def test_remove_file_deletes_only_its_row(self, rca_app, mock_ui):
+        """Test removing a file deletes its row without rebuilding the list"""
+        rca_app.uploaded_files = ['/uploads/a.pdf', '/uploads/b.pdf']
+        rca_app.update_files_display()
+        row_a = rca_app._file_rows['/uploads/a.pdf']
+        row_b = rca_app._file_rows['/uploads/b.pdf']
+        rca_app.files_list.clear.reset_mock()
+
+        rca_app.remove_file('/uploads/a.pdf')
+
+        assert rca_app.uploaded_files == ['/uploads/b.pdf']
+        row_a.delete.assert_called_once()
+        row_b.delete.assert_not_called()
+        rca_app.files_list.clear.assert_not_called()
+
+    def test_add_url_appends_single_row(self, rca_app, mock_ui):
+        """Test adding a URL appends one row"""
+        rca_app.update_urls_display()
+        rca_app.url_input = MagicMock(value=' https://example.com ')
+
+        rca_app.add_url()
+
+        assert rca_app.urls == ['https://example.com']
+        assert list(rca_app._url_rows) == ['https://example.com']
+        rca_app.urls_list.clear.assert_called_once()
+
+    def test_append_ticket_rows_marks_linked(self, rca_app, mock_ui):
+        """Test newly confirmed tickets get rows without rebuilding the list"""
+        rca_app.jira_tickets = ['CPE-1']
+        rca_app.update_tickets_display()
+        rca_app.tickets_list.clear.reset_mock()
+        rca_app._append_ticket_row = MagicMock()
+        rca_app.jira_tickets += ['CPE-2', 'CPE-3']
+
+        rca_app._append_ticket_rows(['CPE-2', 'CPE-3'])
+
+        rca_app.tickets_list.clear.assert_not_called()
+        assert [c.kwargs['is_linked'] for c in rca_app._append_ticket_row.call_args_list] == [True, True]
+
+    def test_remove_main_ticket_rebuilds(self, rca_app, mock_ui):
+        """Test removing the main ticket re-renders the promoted ticket"""
+        rca_app.jira_tickets = ['CPE-1', 'CPE-2']
+        rca_app.update_tickets_display()
+        rca_app.tickets_list.clear.reset_mock()
+
+        rca_app.remove_ticket('CPE-1')
+
+        assert rca_app.jira_tickets == ['CPE-2']
+        rca_app.tickets_list.clear.assert_called_once()
+        assert list(rca_app._ticket_rows) == ['CPE-2']
+
+    def test_add_url_rejects_duplicate(self, rca_app, mock_ui):
+        """Test a URL already in the list is not added twice"""
+        rca_app.urls = ['https://example.com']
+        rca_app.update_urls_display()
+        rca_app.url_input = MagicMock(value='https://example.com')
+
+        rca_app.add_url()
+
+        assert rca_app.urls == ['https://example.com']
+        mock_ui.notify.assert_called_once_with('URL already added', type='warning')
+
+    def test_results_are_refreshed(self, rca_app, mock_ui):
+        """Test the results panel re-renders through its refreshable"""
+        with patch.object(RCAApp, '_render_results') as render_results:
+            rca_app.display_results()
+            rca_app.clear_all()
+
+        assert render_results.refresh.call_count == 2
+
+    def test_chat_message_appended_without_rebuild(self, rca_app, mock_ui):
+        """Test a new chat message is appended instead of re-rendering the history"""
+        rca_app.chat_history = MagicMock()
+        rca_app.chat_messages = [{'role': 'user', 'content': 'earlier'}]
+        rca_app.chat_input = MagicMock(value='Why did it fail?')
+        rca_app.agentic_chat = AsyncMock(return_value='Disk full')
+
+        with patch('src.app.asyncio.create_task') as create_task:
+            rca_app.handle_chat_message()
+        create_task.call_args.args[0].close()
+
+        rca_app.chat_history.clear.assert_not_called()
+        mock_ui.markdown.assert_called_once_with("**You:** Why did it fail?")
+
+    def test_reset_clears_chat_history(self, rca_app, mock_ui):
+        """Test resetting the context empties the rendered chat"""
+        rca_app.chat_history = MagicMock()
+        rca_app.chat_messages = [{'role': 'user', 'content': 'earlier'}]
+
+        with patch.object(RCAApp, '_render_results'):
+            rca_app.reset_context()
+
+        assert rca_app.chat_messages == []
+        rca_app.chat_history.clear.assert_called_once()
+        mock_ui.markdown.assert_not_called()
+
+class TestFileUpload:
+    @pytest.mark.asyncio
+    async def test_upload_streamed_off_loop(self, temp_dir):
+        """Test uploads are streamed through the file handler and listed"""
+        app = RCAApp()
+        app.files_list = MagicMock()
+        app.file_handler = MagicMock()
+        app.file_handler.save_uploaded_stream.return_value = temp_dir / "case.pdf"
+        event = MagicMock(content=io.BytesIO(b"%PDF"))
+        event.name = "case.pdf"
+
+        with patch('src.app.ui'):
+            await app.handle_file_upload(event)
+
+        app.file_handler.save_uploaded_stream.assert_called_once_with(event.content, "case.pdf")
+        assert app.uploaded_files == [str(temp_dir / "case.pdf")]
+        assert str(temp_dir / "case.pdf") in app._file_rows
+
+    @pytest.mark.asyncio
+    async def test_file_name_tracked_until_removed(self, temp_dir):
+        """Test the upload's basename is kept alongside the path and dropped on removal"""
+        app = RCAApp()
+        app.files_list = MagicMock()
+        app.file_handler = MagicMock()
+        app.file_handler.save_uploaded_stream.return_value = temp_dir / "case.pdf"
+        event = MagicMock(content=io.BytesIO(b"%PDF"))
+        event.name = "case.pdf"
+
+        with patch('src.app.ui') as mock_ui:
+            await app.handle_file_upload(event)
+            assert app._file_names == {str(temp_dir / "case.pdf"): "case.pdf"}
+
+            app.remove_file(str(temp_dir / "case.pdf"))
+
+        assert app._file_names == {}
+        mock_ui.notify.assert_called_with('File removed: case.pdf', type='info')
+
+class TestAddJiraTicket:
+    @pytest.mark.asyncio
+    async def test_linked_issues_are_not_mutated(self):
+        """Test flattening linked issues leaves the client's dicts untouched"""
+        app = RCAApp()
+        app.ticket_input = MagicMock(value='cpe-1')
+        issue = {'key': 'CPE-2', 'summary': 'Linked', 'direction': 'outward'}
+        app.show_linked_issues_dialog = AsyncMock()
+
+        with patch.object(mcp_client, 'get_linked_issues_grouped', AsyncMock(return_value={'Blocks': [issue]})):
+            await app.add_jira_ticket()
+
+        app.show_linked_issues_dialog.assert_awaited_once_with(
+            [{**issue, 'link_type': 'Blocks', 'parent': 'CPE-1'}], main_tickets=['CPE-1']
+        )
+        assert 'link_type' not in issue
+
+    @pytest.mark.asyncio
+    async def test_multiple_tickets_fetched_together(self):
+        """Test pasted ticket lists are fetched concurrently and failures skipped"""
+        app = RCAApp()
+        app.ticket_input = MagicMock(value='cpe-1, cpe-2 cpe-1\ncpe-3')
+        app.show_linked_issues_dialog = AsyncMock()
+
+        async def fake_grouped(ticket):
+            if ticket == 'CPE-2':
+                raise RuntimeError("Jira unavailable")
+            return {'Relates': [{'key': f'{ticket}-LINK'}]}
+
+        with patch.object(mcp_client, 'get_linked_issues_grouped', side_effect=fake_grouped) as mock_grouped:
+            await app.add_jira_ticket()
+
+        assert mock_grouped.await_count == 3
+        linked, kwargs = app.show_linked_issues_dialog.await_args
+        assert kwargs == {'main_tickets': ['CPE-1', 'CPE-2', 'CPE-3']}
+        assert [issue['parent'] for issue in linked[0]] == ['CPE-1', 'CPE-3']
+
+class TestLinkedIssueCache:
+    def test_invalidate_clears_client_cache(self):
+        """Test invalidating forgets the MCP client's shared linked-issue lookups"""
+        app = RCAApp()
+
+        with patch.object(mcp_client, 'invalidate_linked_cache') as invalidate:
+            app.invalidate_linked_cache()
+
+        invalidate.assert_called_once()
+
+class TestPromptOptions:
+    def test_prompt_tables_match_options(self):
+        """Test precomputed prompt labels and values follow PROMPT_OPTIONS"""
+        assert RCAApp._PROMPT_VALUES == [value for _, value in RCAApp.PROMPT_OPTIONS]
+        assert RCAApp._PROMPT_LABEL_MAP["kt-analysis_prompt"] == "Problem Assessment"
+
+class TestReadAloud:
+    def test_problem_text_is_json_encoded(self):
+        """Test read-aloud text is JSON-encoded into one SpeechSynthesis call"""
+        app = RCAApp()
+        app.analysis_result = {'analysis': {'problem_statement': 'Disk "full"\nagain'}}
+
+        with patch('src.app.ui') as mock_ui:
+            app.read_problem_issue()
+
+        script = mock_ui.run_javascript.call_args.args[0]
+        assert 'SpeechSynthesisUtterance("Disk \\"full\\"\\nagain")' in script
+        assert script.endswith("window.speechSynthesis.speak(utter); }")
+
+    def test_repeat_reads_reuse_encoded_script(self):
+        """Test reading the same summary twice encodes it once"""
+        app = RCAApp()
+        app.analysis_result = {'analysis': {'executive_summary': 'Controller failover'}}
+        _speak_script.cache_clear()
+
+        with patch('src.app.ui'):
+            app.read_executive_summary()
+            app.read_executive_summary()
+
+        assert _speak_script.cache_info().hits == 1
+
+    def test_list_section_is_read(self):
+        """Test list-valued sections are still encoded for reading"""
+        app = RCAApp()
+        app.analysis_result = {'analysis': {'executive_summary': ['Disk full', 'Node down']}}
+
+        with patch('src.app.ui') as mock_ui:
+            app.read_executive_summary()
+
+        assert 'SpeechSynthesisUtterance(["Disk full", "Node down"])' in mock_ui.run_javascript.call_args.args[0]
+
+class TestAgentReplyFormatting:
+    @pytest.mark.parametrize("content", [
+        '{"root_cause": "Disk full"}',
+        "{'root_cause': 'Disk full'}",
+        'Here is the rewrite:\n{"root_cause": "Disk full"}\nThanks',
+        {'root_cause': 'Disk full'},
+    ])
+    def test_dict_replies_become_key_values(self, content):
+        """Test JSON, Python-literal and embedded dict replies are formatted"""
+        assert _format_agent_content(content) == "**Root Cause**:\nDisk full"
+
+    def test_python_literal_skips_json_decode(self):
+        """Test str() of a dict reply goes straight to literal parsing"""
+        with patch('src.app.orjson.loads') as loads:
+            assert _format_agent_content("{'root_cause': 'Disk full'}") == "**Root Cause**:\nDisk full"
+
+        loads.assert_not_called()
+
+    def test_headers_derived_once_per_key(self):
+        """Test repeated replies reuse the display header for each key"""
+        _title_header.cache_clear()
+
+        for _ in range(3):
+            _format_agent_content({'root_cause': 'Disk full', 'next_steps': 'Expand volume'})
+
+        assert _title_header.cache_info().misses == 2
+        assert _title_header("root_cause") == "Root Cause"
+
+    @pytest.mark.parametrize("content", ["Plain answer", "[1, 2]", "{not valid}"])
+    def test_other_replies_shown_as_is(self, content):
+        """Test non-dict replies are left for raw rendering"""
+        assert _format_agent_content(content) is None
+
+    @pytest.mark.asyncio
+    async def test_agent_reply_formatted_once(self):
+        """Test the formatted reply is stored on the message when it arrives"""
+        app = RCAApp()
+        app.chat_messages = []
+        app.chat_history = MagicMock()
+        app.chat_input = MagicMock(value='Rewrite the root cause')
+        app.stream_agentic_chat = AsyncMock(return_value='{"root_cause": "Disk full"}')
+
+        with patch('src.app.ui'), patch.object(RCAApp, '_append_chat') as append_chat:
+            app.handle_chat_message()
+            await asyncio.sleep(0)
+
+        assert app.chat_messages[-1]['_formatted'] == "**Root Cause**:\nDisk full"
+        append_chat.assert_called_with(app.chat_messages[-1])
+
+    @pytest.mark.asyncio
+    async def test_agent_task_tracked_until_done(self):
+        """Test the background chat task is referenced only while it runs"""
+        app = RCAApp()
+        app.chat_messages = []
+        app.chat_history = MagicMock()
+        app.chat_input = MagicMock(value='Why?')
+        app.stream_agentic_chat = AsyncMock(return_value='Because')
+
+        with patch('src.app.ui'), patch.object(RCAApp, '_append_chat'):
+            app.handle_chat_message()
+            (task,) = app._bg_tasks
+            await task
+
+        assert app._bg_tasks == set()
+
+class TestAgenticChat:
+    @pytest.mark.asyncio
+    async def test_context_sent_to_llm(self):
+        """Test the chat prompt carries the analysis, inputs and chat history"""
+        app = RCAApp()
+        app.analysis_result = {'analysis': {'root_cause': 'Disk full'}}
+        app.uploaded_files = ['/uploads/case.pdf']
+        app._file_names = {'/uploads/case.pdf': 'case.pdf'}
+        app.urls = ['https://example.com']
+        app.jira_tickets = ['CPE-1']
+        app.chat_messages = [{'role': 'user', 'content': 'Why?'}]
+        llm = AsyncMock(return_value='Because')
+
+        with patch.dict(rca_generator.config, {'default_llm': 'openai'}), \
+                patch.object(rca_generator, 'chat', llm):
+            assert await app.agentic_chat('Why?') == 'Because'
+
+        assert llm.call_args.kwargs['provider'] == 'openai'
+
+        system_prompt = llm.call_args.kwargs['system_prompt']
+        assert system_prompt.startswith("You are an expert RCA agent.")
+        assert system_prompt.endswith(
+            "Current RCA Analysis:\nroot_cause: Disk full\n"
+            "\nFiles: case.pdf\nURLs: https://example.com\nJira Tickets: CPE-1"
+        )
+        assert llm.call_args.args[0] == "Chat History:\nUser: Why?\n\nUser message: Why?\n"
+
+    def test_chat_lines_extended_per_turn(self):
+        """Test each turn formats only new messages and a replaced history starts over"""
+        app = RCAApp()
+        app.chat_messages = [{'role': 'user', 'content': 'Why?'}]
+        app._chat_prompt('Why?')
+        app.chat_messages.append({'role': 'agent', 'content': 'Disk full'})
+        first_line = app._chat_lines[0]
+
+        _, prompt = app._chat_prompt('Fix?')
+
+        assert app._chat_lines[0] is first_line
+        assert prompt == "Chat History:\nUser: Why?\nAgent: Disk full\n\nUser message: Fix?\n"
+
+        app.chat_messages = [{'role': 'user', 'content': 'New case'}]
+        assert app._chat_prompt('New case')[1] == "Chat History:\nUser: New case\n\nUser message: New case\n"
+
+    def test_system_prompt_stable_until_inputs_change(self):
+        """Test the cacheable prefix is reused across turns and rebuilt on new inputs"""
+        app = RCAApp()
+        app.analysis_result = {'analysis': {'root_cause': 'Disk full'}}
+
+        first = app._chat_system_prompt()
+        app.chat_messages = [{'role': 'user', 'content': 'Why?'}]
+        assert app._chat_system_prompt() is first
+
+        app.urls = ['https://example.com']
+        assert "URLs: https://example.com" in app._chat_system_prompt()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_in_provider_order(self):
+        """Test a failing configured LLM falls back to the others in order"""
+        app = RCAApp()
+        app.chat_messages = []
+        chat = AsyncMock(side_effect=[RuntimeError("quota"), RuntimeError("down"), 'Recovered'])
+
+        with patch.dict(rca_generator.config, {'default_llm': 'anthropic'}), \
+                patch.object(rca_generator, 'chat', chat):
+            assert await app.agentic_chat('Why?') == 'Recovered'
+
+        assert [c.kwargs['provider'] for c in chat.call_args_list] == ['anthropic', 'openai', 'openrouter']
+
+    @pytest.mark.asyncio
+    async def test_recently_failed_provider_skipped(self):
+        """Test a provider that just failed is not retried on the next turn"""
+        app = RCAApp()
+        app.chat_messages = []
+        chat = AsyncMock(side_effect=[RuntimeError("quota"), 'First', 'Second'])
+
+        with patch.dict(rca_generator.config, {'default_llm': 'anthropic'}), \
+                patch.object(rca_generator, 'chat', chat):
+            assert await app.agentic_chat('Why?') == 'First'
+            assert await app.agentic_chat('And then?') == 'Second'
+
+        assert [c.kwargs['provider'] for c in chat.call_args_list] == ['anthropic', 'openai', 'openai']
+        assert 'openai' not in app._provider_failed_at
+
+    @pytest.mark.asyncio
+    async def test_all_providers_cooling_down_are_retried(self):
+        """Test every provider is tried again when all failed recently"""
+        app = RCAApp()
+        app.chat_messages = []
+        app._provider_failed_at = {p: time.monotonic() for p in ('openai', 'anthropic', 'openrouter', 'llmproxy')}
+        chat = AsyncMock(return_value='Back')
+
+        with patch.dict(rca_generator.config, {'default_llm': 'openai'}), \
+                patch.object(rca_generator, 'chat', chat):
+            assert await app.agentic_chat('Why?') == 'Back'
+
+        assert 'openai' not in app._provider_failed_at
+
+    @pytest.mark.asyncio
+    async def test_streamed_reply_coalesced_per_interval(self):
+        """Test the first chunk shows at once and later bursts update the bubble once per interval"""
+        app = RCAApp()
+        app.chat_messages = []
+
+        async def fake_stream(prompt, system_prompt=None, provider=None):
+            for chunk in 'abcde':
+                yield chunk
+
+        shown = []
+        with patch.dict(rca_generator.config, {'default_llm': 'openai'}), \
+                patch.object(rca_generator, 'stream_chat', fake_stream), \
+                patch('src.app.time') as mock_time:
+            mock_time.monotonic.side_effect = [100.0, 100.01, 100.06, 100.07, 100.2]
+            assert await app.stream_agentic_chat('Why?', shown.append) == 'abcde'
+
+        assert shown == ['a', 'abc', 'abcde']
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_falls_back(self):
+        """Test a failing stream marks the provider and falls back to non-streaming chat"""
+        app = RCAApp()
+        app.chat_messages = []
+
+        async def broken_stream(prompt, system_prompt=None, provider=None):
+            raise RuntimeError("stream refused")
+            yield
+
+        with patch.dict(rca_generator.config, {'default_llm': 'openai'}), \
+                patch.object(rca_generator, 'stream_chat', broken_stream), \
+                patch.object(app, 'agentic_chat', AsyncMock(return_value='Fallback')) as agentic_chat:
+            assert await app.stream_agentic_chat('Why?', MagicMock()) == 'Fallback'
+
+        agentic_chat.assert_awaited_once_with('Why?')
+        assert 'openai' in app._provider_failed_at
+
+class TestReportDownload:
+    @pytest.fixture(autouse=True)
+    def reset_static_dirs(self):
+        """Start each test with no registered report directories"""
+        with patch.dict('src.app._STATIC_DIR_URLS', clear=True):
+            yield
+
+    def test_directory_registered_once(self):
+        """Test a report directory is mounted once and reused"""
+        with patch('src.app.app') as mock_app:
+            assert _static_url('/out/a.docx') == '/output/a.docx'
+            assert _static_url('/out/b.json') == '/output/b.json'
+
+        mock_app.add_static_files.assert_called_once_with('/output', '/out')
+
+    def test_new_directory_gets_own_prefix(self):
+        """Test reports in another directory are served under a separate prefix"""
+        with patch('src.app.app') as mock_app:
+            _static_url('/out/a.docx')
+            assert _static_url('/other/c.docx') == '/output-1/c.docx'
+
+        mock_app.add_static_files.assert_called_with('/output-1', '/other')
+
+class TestRenderResults:
+    @pytest.mark.asyncio
+    async def test_empty_additional_sections_skipped(self):
+        """Test empty and N/A extra sections get no expansion"""
+        app = RCAApp()
+        app.analysis_result = {
+            'prompt_file_used': 'formal_rca_prompt',
+            'document_path': '/out/report.md',
+            'analysis': {'notes': 'Check logs', 'extra': 'N/A', 'steps': [], 'blank': '', 'count': 0},
+        }
+
+        with patch('src.app.ui') as mock_ui:
+            await RCAApp._render_results.func(app)
+
+        mock_ui.expansion.assert_called_once_with('Notes', icon='article')
+
+    @pytest.mark.asyncio
+    async def test_yields_between_section_batches(self):
+        """Test long reports yield to the event loop every few section cards"""
+        app = RCAApp()
+        sections = {key: f"{key} text" for _, key in RCAApp.PROMPT_REPORT_MAP['formal_rca_prompt']}
+        app.analysis_result = {
+            'prompt_file_used': 'formal_rca_prompt',
+            'document_path': '/out/report.md',
+            'analysis': sections,
+        }
+
+        with patch('src.app.ui'), patch('src.app.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            await RCAApp._render_results.func(app)
+
+        assert sleep.await_count == len(sections) // 3
+
+    @pytest.mark.asyncio
+    async def test_raw_kt_keys_matched_by_word_overlap(self):
+        """Test unpredictable raw KT keys still fill their section when enough header words match"""
+        app = RCAApp()
+        app.analysis_result = {
+            'prompt_file_used': 'kt-analysis_prompt',
+            'document_path': '/out/report.md',
+            'analysis': {
+                'problem_description': '', 'possible_causes': '', 'data_collection': '', 'solution': '',
+                'raw_analysis': {'description_of_the_problem': 'Disk full', 'data_collection': 'Logs'},
+            },
+        }
+
+        with patch('src.app.ui'), patch('src.app._render_section_value') as render_value:
+            await RCAApp._render_results.func(app)
+
+        assert [c.args[0] for c in render_value.call_args_list] == ['Disk full', 'Logs']
+
+    @pytest.mark.asyncio
+    async def test_superseded_render_stops(self):
+        """Test a render paused between batches stops once a newer refresh starts"""
+        app = RCAApp()
+        sections = {key: f"{key} text" for _, key in RCAApp.PROMPT_REPORT_MAP['formal_rca_prompt']}
+        app.analysis_result = {
+            'prompt_file_used': 'formal_rca_prompt',
+            'document_path': '/out/report.md',
+            'analysis': sections,
+        }
+
+        async def refresh_during_pause(_):
+            with patch.object(RCAApp, '_render_results'):
+                app.display_results()
+
+        with patch('src.app.ui') as mock_ui, \
+                patch('src.app.asyncio.sleep', side_effect=refresh_during_pause) as sleep:
+            await RCAApp._render_results.func(app)
+
+        sleep.assert_awaited_once()
+        # Only the first batch of section cards was built before the refresh
+        assert mock_ui.card.call_count == 3
+
+class TestGenerateAnalysis:
+    @pytest.mark.asyncio
+    async def test_repeated_inputs_reuse_report(self, temp_dir):
+        """Test generating twice for the same files calls the LLM pipeline once"""
+        log_file = temp_dir / "app.log"
+        log_file.write_text("disk full")
+        app = RCAApp()
+        app.progress_bar = MagicMock()
+        app.uploaded_files = [str(log_file)]
+        generate = AsyncMock(side_effect=lambda **kwargs: {'analysis': {'root_cause': 'Disk full'}, 'document_path': '/out/r.docx'})
+
+        with patch('src.app.ui') as mock_ui, \
+                patch.object(rca_generator, 'generate_rca_analysis', generate), \
+                patch.object(RCAApp, '_render_results'):
+            await app.generate_analysis()
+            first = app.analysis_result
+            first['analysis']['root_cause'] = 'Edited'
+            await app.generate_analysis()
+
+        generate.assert_awaited_once()
+        # The cache holds its own copy, so edits to a shown report don't leak into it
+        assert app.analysis_result is not first
+        assert app.analysis_result['analysis']['root_cause'] == 'Disk full'
+        mock_ui.notify.assert_any_call('Cache hit: reusing the report generated for these inputs', type='info')
+
+    @pytest.mark.asyncio
+    async def test_tickets_and_urls_always_regenerate(self):
+        """Test reports built from Jira or web content are never served from the cache"""
+        app = RCAApp()
+        app.progress_bar = MagicMock()
+        app.jira_tickets = ['CPE-1', 'CPE-2']
+        generate = AsyncMock(side_effect=lambda **kwargs: {'analysis': {}, 'document_path': '/out/r.docx'})
+
+        with patch('src.app.ui'), \
+                patch.object(rca_generator, 'generate_rca_analysis', generate), \
+                patch.object(RCAApp, '_render_results'):
+            await app.generate_analysis()
+            app.jira_tickets.reverse()
+            await app.generate_analysis()
+
+        assert generate.await_count == 2
+        assert generate.await_args.kwargs['jira_tickets'] == ['CPE-2', 'CPE-1']
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs_rejected(self):
+        """Test a second click while a report is generating doesn't start another LLM run"""
+        app = RCAApp()
+        app.progress_bar = MagicMock()
+        app.generate_button = MagicMock()
+        app.jira_tickets = ['CPE-1']
+        release = asyncio.Event()
+
+        async def slow_generate(**kwargs):
+            await release.wait()
+            return {'analysis': {}, 'document_path': '/out/r.docx'}
+
+        generate = AsyncMock(side_effect=slow_generate)
+        with patch('src.app.ui') as mock_ui, \
+                patch.object(rca_generator, 'generate_rca_analysis', generate), \
+                patch.object(RCAApp, '_render_results'):
+            first = asyncio.create_task(app.generate_analysis())
+            await asyncio.sleep(0)
+            await app.generate_analysis()
+            release.set()
+            await first
+
+        generate.assert_awaited_once()
+        mock_ui.notify.assert_any_call('An analysis is already running', type='warning')
+        app.generate_button.disable.assert_called_once()
+        app.generate_button.enable.assert_called_once()
+
+class TestInitialize:
+    @pytest.mark.asyncio
+    async def test_llm_warm_up_survives_mcp_failure(self):
+        """Test LLM warm-up runs alongside MCP setup even when MCP setup fails"""
+        app = RCAApp()
+        warm_up = AsyncMock()
+
+        with patch('src.app.ui') as mock_ui, \
+                patch.object(mcp_client, 'initialize', AsyncMock(side_effect=RuntimeError("no servers"))), \
+                patch.object(rca_generator, 'warm_up', warm_up):
+            await app.initialize()
+
+        warm_up.assert_awaited_once()
+        mock_ui.notify.assert_called_once_with("Failed to initialize MCP client", type='negative')
@@ -1,3 +1,4 @@
+import io
 import pytest
 from pathlib import Path
 from src.utils.file_handler import FileHandler
@@ -118,6 +119,24 @@ class TestFileHandler:
         assert saved_path1.read_bytes() == file_content1
         assert saved_path2.read_bytes() == file_content2
     
+    def test_save_uploaded_stream_success(self, file_handler):
+        """Test streaming a file-like upload to disk"""
+        file_content = b"x" * (200 * 1024)
+        
+        saved_path = file_handler.save_uploaded_stream(io.BytesIO(file_content), "stream.txt")
+        
+        assert saved_path is not None
+        assert saved_path.read_bytes() == file_content
+    
+    def test_save_uploaded_stream_too_large(self, file_handler):
+        """Test streamed upload that's too large is removed"""
+        large_content = io.BytesIO(b"x" * (1024 * 1024 + 1))
+        
+        saved_path = file_handler.save_uploaded_stream(large_content, "large.txt")
+        
+        assert saved_path is None
+        assert not (file_handler.upload_dir / "large.txt").exists()
+    
     def test_sanitize_filename(self, file_handler):
         """Test filename sanitization"""
         dangerous_filename = "../../../etc/passwd"
@@ -0,0 +1,26 @@
+import pytest
+from src.utils.json_blob import extract_json_blob
+
+class TestExtractJsonBlob:
+    @pytest.mark.parametrize("text,blob", [
+        ('Result: {"a": {"b": [1, 2]}} done', '{"a": {"b": [1, 2]}}'),
+        ('Note {"a": "} and {"} then {"b": 1}', '{"a": "} and {"}'),
+        ('Escaped {"a": "say \\"}\\""} tail', '{"a": "say \\"}\\""}'),
+        ('List [1, [2, 3]] here', '[1, [2, 3]]'),
+        ('Items: [{"a": 1}, {"b": 2}]', '[{"a": 1}, {"b": 2}]'),
+        ('Fields {"a": [1]} then [2]', '{"a": [1]}'),
+        ('Unbalanced {"a": 1', None),
+        ('No brackets', None),
+    ])
+    def test_extract_json_blob(self, text, blob):
+        """Test the first balanced object is found without crossing string literals"""
+        assert extract_json_blob(text) == blob
+
+    def test_objects_only(self):
+        """Test restricting openers to '{' skips arrays"""
+        assert extract_json_blob('Steps [1, 2] then {"a": [3]}', '{') == '{"a": [3]}'
+        assert extract_json_blob('Steps [1, 2]', '{') is None
+
+    def test_trailing_prose_with_braces(self):
+        """Test prose after the object does not extend the match"""
+        assert extract_json_blob('{"root_cause": "disk"} (see {notes})', '{') == '{"root_cause": "disk"}'
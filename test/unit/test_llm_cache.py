@@ -0,0 +1,40 @@
+from unittest.mock import patch
+from src.utils.llm_cache import ResponseCache
+
+class TestResponseCache:
+    def test_key_is_stable(self):
+        """Test equal inputs hash to the same key and different ones do not"""
+        key = ResponseCache.make_key('analysis', ['a.pdf'], {'b': 1, 'a': 2})
+
+        assert key == ResponseCache.make_key('analysis', ['a.pdf'], {'a': 2, 'b': 1})
+        assert key != ResponseCache.make_key('analysis', ['b.pdf'], {'a': 2, 'b': 1})
+
+    def test_get_returns_stored_value(self):
+        """Test a stored result is returned until it expires"""
+        cache = ResponseCache(ttl=60)
+        with patch('src.utils.llm_cache.time.monotonic', return_value=100.0):
+            cache.set('k', {'analysis': {}})
+            assert cache.get('k') == {'analysis': {}}
+        with patch('src.utils.llm_cache.time.monotonic', return_value=160.0):
+            assert cache.get('k') is None
+
+    def test_least_recently_used_evicted(self):
+        """Test the oldest unused entry is dropped when the cache is full"""
+        cache = ResponseCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+    def test_clear(self):
+        """Test clearing forgets every entry"""
+        cache = ResponseCache()
+        cache.set('a', 1)
+
+        cache.clear()
+
+        assert cache.get('a') is None
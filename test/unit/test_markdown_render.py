@@ -0,0 +1,35 @@
+import pytest
+from unittest.mock import patch
+from src.utils.markdown_render import markdown_converter
+
+class TestMarkdownConverter:
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        """Drop the cached converter around each test"""
+        markdown_converter.cache_clear()
+        yield
+        markdown_converter.cache_clear()
+
+    def test_converter_renders_tables(self):
+        """Test markdown tables convert to HTML with a reused converter"""
+        pytest.importorskip("markdown")
+        convert = markdown_converter()
+
+        html = convert("| a | b |\n|---|---|\n| 1 | 2 |")
+
+        assert "<table>" in html
+        assert markdown_converter() is convert
+
+    def test_converter_resets_between_documents(self):
+        """Test state from one document does not leak into the next"""
+        pytest.importorskip("markdown")
+        convert = markdown_converter()
+
+        first = convert("# Title")
+
+        assert convert("# Title") == first
+
+    def test_converter_missing_markdown(self):
+        """Test the converter degrades to None when markdown is unavailable"""
+        with patch.dict('sys.modules', {'markdown': None}):
+            assert markdown_converter() is None
@@ -1,5 +1,6 @@
 import pytest
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from src.mcp_client import MCPClient
 from src.config import Config
@@ -62,6 +63,19 @@ class TestMCPClient:
         with pytest.raises(PermissionError):
             await mcp_client.read_file(str(test_file))
     
+    @pytest.mark.asyncio
+    async def test_read_file_path_traversal(self, mcp_client, temp_dir):
+        """Test that '..' segments cannot escape the allowed paths"""
+        test_file = temp_dir / "forbidden" / "test.txt"
+        test_file.parent.mkdir(parents=True, exist_ok=True)
+        test_file.write_text("Test content")
+        (temp_dir / "uploads").mkdir(exist_ok=True)
+        
+        mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
+        
+        with pytest.raises(PermissionError):
+            await mcp_client.read_file(str(temp_dir / "uploads" / ".." / "forbidden" / "test.txt"))
+    
     @pytest.mark.asyncio
     async def test_read_file_not_exists(self, mcp_client, temp_dir):
         """Test reading non-existent file"""
@@ -84,17 +98,144 @@ class TestMCPClient:
         # Update allowed paths
         mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
         
-        with patch('src.mcp_client.PdfReader') as mock_pdf_reader:
-            # Mock PDF reader
+        with patch('src.mcp_client.fitz') as mock_fitz:
+            # Mock PyMuPDF document
             mock_page = Mock()
-            mock_page.extract_text.return_value = "Test PDF content"
-            mock_reader = Mock()
-            mock_reader.pages = [mock_page]
-            mock_pdf_reader.return_value = mock_reader
+            mock_page.get_text.return_value = "Test PDF content"
+            mock_doc = MagicMock()
+            mock_doc.page_count = 1
+            mock_doc.load_page.return_value = mock_page
+            mock_fitz.open.return_value = mock_doc
             
             content = await mcp_client.process_pdf(str(pdf_file))
             
             assert "Test PDF content" in content
+            mock_doc.close.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_process_pdf_joins_pages(self, mcp_client, temp_dir, sample_pdf_content):
+        """Test that page texts are joined in order with newlines"""
+        pdf_file = temp_dir / "uploads" / "multi.pdf"
+        pdf_file.parent.mkdir(parents=True, exist_ok=True)
+        pdf_file.write_bytes(sample_pdf_content)
+        
+        mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
+        
+        with patch('src.mcp_client.fitz') as mock_fitz:
+            pages = []
+            for i in range(3):
+                page = Mock()
+                page.get_text.return_value = f"Page {i + 1}"
+                pages.append(page)
+            mock_doc = MagicMock()
+            mock_doc.page_count = len(pages)
+            mock_doc.load_page.side_effect = lambda i: pages[i]
+            mock_fitz.open.return_value = mock_doc
+            
+            content = await mcp_client.process_pdf(str(pdf_file))
+            
+            assert content == "Page 1\nPage 2\nPage 3"
+    
+    @pytest.mark.asyncio
+    async def test_process_pdf_page_range(self, mcp_client, temp_dir, sample_pdf_content):
+        """Test that only the requested pages are loaded"""
+        pdf_file = temp_dir / "uploads" / "range.pdf"
+        pdf_file.parent.mkdir(parents=True, exist_ok=True)
+        pdf_file.write_bytes(sample_pdf_content)
+        
+        mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
+        
+        with patch('src.mcp_client.fitz') as mock_fitz:
+            mock_doc = MagicMock()
+            mock_doc.page_count = 10
+            mock_doc.load_page.side_effect = lambda i: Mock(**{'get_text.return_value': f"Page {i + 1}"})
+            mock_fitz.open.return_value = mock_doc
+            
+            content = await mcp_client.process_pdf(str(pdf_file), page_range=(2, 4))
+            
+            assert content == "Page 3\nPage 4"
+            assert [c.args[0] for c in mock_doc.load_page.call_args_list] == [2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_process_pdf_splits_large_documents(self, mcp_client, temp_dir, sample_pdf_content):
+        """Test that long PDFs are extracted in page ranges by a worker pool"""
+        pdf_file = temp_dir / "uploads" / "long.pdf"
+        pdf_file.parent.mkdir(parents=True, exist_ok=True)
+        pdf_file.write_bytes(sample_pdf_content)
+        
+        mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
+        page_count = 40
+        
+        pool_factory = Mock(side_effect=lambda max_workers, mp_context: ThreadPoolExecutor(max_workers))
+        
+        with patch('src.mcp_client.fitz') as mock_fitz, \
+             patch('src.mcp_client.ProcessPoolExecutor', pool_factory), \
+             patch('src.mcp_client.os.cpu_count', return_value=4):
+            mock_doc = MagicMock()
+            mock_doc.page_count = page_count
+            mock_doc.load_page.side_effect = lambda i: Mock(**{'get_text.return_value': f"Page {i + 1}"})
+            mock_fitz.open.return_value = mock_doc
+            
+            content = await mcp_client.process_pdf(str(pdf_file))
+            await mcp_client.close()
+            
+            assert content == "\n".join(f"Page {i + 1}" for i in range(page_count))
+            # One open to count pages plus one per worker range
+            assert mock_fitz.open.call_count == 5
+            assert pool_factory.call_args.kwargs['mp_context'].get_start_method() != "fork"
+    
+    @pytest.mark.asyncio
+    async def test_process_pdf_single_cpu_skips_pool(self, mcp_client, temp_dir, sample_pdf_content):
+        """Test that long PDFs are read in one pass when only one CPU is available"""
+        pdf_file = temp_dir / "uploads" / "long.pdf"
+        pdf_file.parent.mkdir(parents=True, exist_ok=True)
+        pdf_file.write_bytes(sample_pdf_content)
+        
+        mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
+        page_count = 40
+        
+        with patch('src.mcp_client.fitz') as mock_fitz, \
+             patch('src.mcp_client.ProcessPoolExecutor') as mock_pool, \
+             patch('src.mcp_client.os.cpu_count', return_value=1):
+            mock_doc = MagicMock()
+            mock_doc.page_count = page_count
+            mock_doc.load_page.side_effect = lambda i: Mock(**{'get_text.return_value': f"Page {i + 1}"})
+            mock_fitz.open.return_value = mock_doc
+            
+            content = await mcp_client.process_pdf(str(pdf_file))
+            
+            assert content == "\n".join(f"Page {i + 1}" for i in range(page_count))
+            mock_pool.assert_not_called()
+            assert mock_fitz.open.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_process_pdf_reuses_worker_pool(self, mcp_client, temp_dir, sample_pdf_content):
+        """Test that the PDF worker pool is created once and shut down on close"""
+        pdf_file = temp_dir / "uploads" / "long.pdf"
+        pdf_file.parent.mkdir(parents=True, exist_ok=True)
+        pdf_file.write_bytes(sample_pdf_content)
+        
+        mcp_client.config['filesystem_allowed_paths'] = [str(temp_dir / "uploads")]
+        pool = ThreadPoolExecutor(4)
+        
+        with patch('src.mcp_client.fitz') as mock_fitz, \
+             patch('src.mcp_client.ProcessPoolExecutor', return_value=pool) as mock_pool, \
+             patch('src.mcp_client.os.cpu_count', return_value=4):
+            mock_doc = MagicMock()
+            mock_doc.page_count = 40
+            mock_doc.load_page.side_effect = lambda i: Mock(**{'get_text.return_value': f"Page {i + 1}"})
+            mock_fitz.open.return_value = mock_doc
+            
+            await mcp_client.process_pdf(str(pdf_file))
+            await mcp_client.process_pdf(str(pdf_file))
+            
+            mock_pool.assert_called_once()
+            
+            await mcp_client.close()
+            
+            assert mcp_client._pdf_pool is None
+            with pytest.raises(RuntimeError):
+                pool.submit(print)
     
     @pytest.mark.asyncio
     async def test_process_pdf_not_allowed_path(self, mcp_client, temp_dir, sample_pdf_content):
@@ -107,33 +248,42 @@ class TestMCPClient:
             await mcp_client.process_pdf(str(pdf_file))
     
     @pytest.mark.asyncio
-    async def test_scrape_web_content_success(self, mcp_client, mock_httpx_client):
+    async def test_scrape_web_content_success(self, mcp_client, mock_http_session):
         """Test successful web content scraping"""
         url = "https://example.com"
+        mcp_client._http = mock_http_session
         
-        with patch('src.mcp_client.httpx.AsyncClient') as mock_client_class:
-            mock_client_class.return_value.__aenter__.return_value = mock_httpx_client
-            
-            content = await mcp_client.scrape_web_content(url)
-            
-            assert "Test Page" in content
-            assert "Test content for scraping" in content
-            mock_httpx_client.get.assert_called_once_with(url)
+        content = await mcp_client.scrape_web_content(url)
+        
+        assert "Test Page" in content
+        assert "Test content for scraping" in content
+        mock_http_session.get.assert_called_once_with(url)
     
     @pytest.mark.asyncio
-    async def test_scrape_web_content_http_error(self, mcp_client):
+    async def test_scrape_web_content_cleans_whitespace(self, mcp_client, mock_http_session):
+        """Test scripts are dropped and whitespace collapses to one phrase per line"""
+        mock_response = mock_http_session.get.return_value.__aenter__.return_value
+        mock_response.read.return_value = (
+            b"<html><head><style>p {color: red}</style></head><body>\n"
+            b"  <p>First   phrase  </p>\n\n\n<script>var x = 1;</script>"
+            b"<p>  Second\tline </p>  \r\n</body></html>"
+        )
+        mcp_client._http = mock_http_session
+        
+        content = await mcp_client.scrape_web_content("https://example.com")
+        
+        assert content == "First\nphrase\nSecond\tline"
+    
+    @pytest.mark.asyncio
+    async def test_scrape_web_content_http_error(self, mcp_client, mock_http_session):
         """Test web scraping with HTTP error"""
         url = "https://nonexistent.com"
+        mock_response = mock_http_session.get.return_value.__aenter__.return_value
+        mock_response.raise_for_status.side_effect = Exception("HTTP Error")
+        mcp_client._http = mock_http_session
         
-        with patch('src.mcp_client.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = Mock()
-            mock_response.raise_for_status.side_effect = Exception("HTTP Error")
-            mock_client.get.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            
-            with pytest.raises(Exception):
-                await mcp_client.scrape_web_content(url)
+        with pytest.raises(Exception):
+            await mcp_client.scrape_web_content(url)
     
     @pytest.mark.asyncio
     async def test_create_jira_ticket_success(self, mcp_client):
@@ -172,54 +322,205 @@ class TestMCPClient:
                 await mcp_client.create_jira_ticket(ticket_data)
     
     @pytest.mark.asyncio
-    async def test_search_jira_tickets_success(self, mcp_client, sample_jira_ticket):
+    async def test_search_jira_tickets_success(self, mcp_client, sample_jira_ticket, mock_http_session):
         """Test successful Jira ticket search"""
         jql = "project = TEST"
         
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.json = AsyncMock(return_value={
+            'issues': [{
+                'key': sample_jira_ticket['key'],
+                'fields': {
+                    'summary': sample_jira_ticket['summary'],
+                    'status': {'name': sample_jira_ticket['status']},
+                    'assignee': {'displayName': sample_jira_ticket['assignee']},
+                    'created': sample_jira_ticket['created'],
+                    'updated': sample_jira_ticket['updated'],
+                    'description': sample_jira_ticket['description'],
+                    'priority': {'name': sample_jira_ticket['priority']},
+                    'issuetype': {'name': sample_jira_ticket['issue_type']}
+                }
+            }]
+        })
+        mock_http_session.request.return_value.__aenter__.return_value = mock_response
+        mcp_client._http = mock_http_session
+        
+        results = await mcp_client.search_jira_tickets(jql)
+        
+        assert len(results) == 1
+        assert results[0]['key'] == sample_jira_ticket['key']
+        assert results[0]['summary'] == sample_jira_ticket['summary']
+        assert results[0]['assignee'] == sample_jira_ticket['assignee']
+        
+        method, url = mock_http_session.request.call_args.args
+        assert method == 'POST'
+        assert url.endswith('/rest/api/2/search')
+        assert mock_http_session.request.call_args.kwargs['json']['jql'] == jql
+    
+    @pytest.mark.asyncio
+    async def test_search_jira_tickets_pages_results(self, mcp_client, mock_http_session):
+        """Test that large searches are fetched in pages via startAt"""
+        def make_issues(start, count):
+            return [{
+                'key': f'TEST-{n}',
+                'fields': {'summary': f'Issue {n}', 'status': {'name': 'Open'}, 'issuetype': {'name': 'Bug'}}
+            } for n in range(start, start + count)]
+        
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.json = AsyncMock(side_effect=[
+            {'issues': make_issues(0, 100), 'total': 150},
+            {'issues': make_issues(100, 50), 'total': 150},
+        ])
+        mock_http_session.request.return_value.__aenter__.return_value = mock_response
+        mcp_client._http = mock_http_session
+        
+        results = await mcp_client.search_jira_tickets("project = TEST", max_results=200)
+        
+        assert len(results) == 150
+        assert results[-1]['key'] == 'TEST-149'
+        start_ats = [c.kwargs['json']['startAt'] for c in mock_http_session.request.call_args_list]
+        assert start_ats == [0, 100]
+    
+    @pytest.mark.asyncio
+    async def test_search_jira_tickets_error(self, mcp_client, mock_http_session):
+        """Test Jira ticket search with error"""
+        jql = "invalid jql"
+        mock_http_session.request.side_effect = Exception("JQL error")
+        mcp_client._http = mock_http_session
+        
+        with pytest.raises(Exception):
+            await mcp_client.search_jira_tickets(jql)
+    
+    @pytest.mark.asyncio
+    async def test_get_linked_issues_grouped(self, mcp_client, mock_http_session):
+        """Test linked issues are grouped by link type and direction"""
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.json = AsyncMock(return_value={
+            'fields': {
+                'issuelinks': [
+                    {
+                        'type': {'name': 'Relates', 'inward': 'relates to', 'outward': 'relates to'},
+                        'outwardIssue': {'key': 'TEST-2', 'fields': {'summary': 'Outward issue'}}
+                    },
+                    {
+                        'type': {'name': 'Blocks', 'inward': 'is blocked by', 'outward': 'blocks'},
+                        'inwardIssue': {'key': 'TEST-3', 'fields': {'summary': 'Inward issue'}}
+                    }
+                ]
+            }
+        })
+        mock_http_session.request.return_value.__aenter__.return_value = mock_response
+        mcp_client._http = mock_http_session
+        
+        grouped = await mcp_client.get_linked_issues_grouped('TEST-1')
+        
+        assert grouped == {
+            'relates to': [{'key': 'TEST-2', 'summary': 'Outward issue', 'direction': 'outward'}],
+            'is blocked by': [{'key': 'TEST-3', 'summary': 'Inward issue', 'direction': 'inward'}]
+        }
+        # Linked summaries come from the issuelinks payload: one request, no per-link lookups
+        mock_http_session.request.assert_called_once()
+        assert mock_http_session.request.call_args.kwargs['params'] == {'fields': 'issuelinks'}
+    
+    @pytest.mark.asyncio
+    async def test_linked_issues_reused_within_ttl(self, mcp_client):
+        """Test repeated linked-issue lookups for a ticket hit the cache"""
+        grouped = {'Blocks': [{'key': 'CPE-2'}]}
+
+        with patch.object(mcp_client, '_fetch_linked_issues_grouped', AsyncMock(return_value=grouped)) as mock_fetch:
+            assert await mcp_client.get_linked_issues_grouped('CPE-1') == grouped
+            assert await mcp_client.get_linked_issues_grouped('cpe-1') == grouped
+
+        mock_fetch.assert_awaited_once_with('CPE-1')
+
+    @pytest.mark.asyncio
+    async def test_linked_issues_refetched_after_ttl_or_invalidation(self, mcp_client):
+        """Test expired or invalidated linked-issue lookups are fetched again"""
+        with patch.object(mcp_client, '_fetch_linked_issues_grouped', AsyncMock(return_value={})) as mock_fetch:
+            await mcp_client.get_linked_issues_grouped('CPE-1')
+            await mcp_client.get_linked_issues_grouped('CPE-1', max_age=0)
+            mcp_client.invalidate_linked_cache()
+            await mcp_client.get_linked_issues_grouped('CPE-1')
+
+        assert mock_fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_jira_client_reused_across_calls(self, mcp_client):
+        """Test that the Jira client is created once and shared"""
         with patch('src.mcp_client.JIRA') as mock_jira_class:
             mock_jira = Mock()
-            mock_issue = Mock()
-            
-            # Setup mock issue fields
-            mock_issue.key = sample_jira_ticket['key']
-            mock_issue.fields.summary = sample_jira_ticket['summary']
-            mock_issue.fields.status.name = sample_jira_ticket['status']
-            
-            mock_assignee = Mock()
-            mock_assignee.displayName = sample_jira_ticket['assignee']
-            mock_issue.fields.assignee = mock_assignee
-            
-            mock_issue.fields.created = sample_jira_ticket['created']
-            mock_issue.fields.updated = sample_jira_ticket['updated']
-            mock_issue.fields.description = sample_jira_ticket['description']
-            
-            mock_priority = Mock()
-            mock_priority.name = sample_jira_ticket['priority']
-            mock_issue.fields.priority = mock_priority
-            
-            mock_issuetype = Mock()
-            mock_issuetype.name = sample_jira_ticket['issue_type']
-            mock_issue.fields.issuetype = mock_issuetype
-            
-            mock_jira.search_issues.return_value = [mock_issue]
+            mock_jira.create_issue.return_value.key = 'TEST-123'
             mock_jira_class.return_value = mock_jira
             
-            results = await mcp_client.search_jira_tickets(jql)
+            ticket_data = {'summary': 'Test ticket', 'description': 'Test description'}
+            await mcp_client.create_jira_ticket(ticket_data)
+            await mcp_client.create_jira_ticket(ticket_data)
             
-            assert len(results) == 1
-            assert results[0]['key'] == sample_jira_ticket['key']
-            assert results[0]['summary'] == sample_jira_ticket['summary']
+            mock_jira_class.assert_called_once()
+            assert mock_jira.create_issue.call_count == 2
     
     @pytest.mark.asyncio
-    async def test_search_jira_tickets_error(self, mcp_client):
-        """Test Jira ticket search with error"""
-        jql = "invalid jql"
+    async def test_get_many_linked_issues_bounded(self, mcp_client):
+        """Test batched linked-issue fetches respect the concurrency limit"""
+        in_flight = 0
+        peak = 0
         
-        with patch('src.mcp_client.JIRA') as mock_jira_class:
-            mock_jira_class.side_effect = Exception("JQL error")
-            
-            with pytest.raises(Exception):
-                await mcp_client.search_jira_tickets(jql)
+        async def fake_grouped(issue_key):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {'relates to': [{'key': f'{issue_key}-LINK'}]}
+        
+        keys = [f'TEST-{n}' for n in range(10)]
+        with patch.object(mcp_client, 'get_linked_issues_grouped', side_effect=fake_grouped):
+            results = await mcp_client.get_many_linked_issues(keys, concurrency=3)
+        
+        assert list(results) == keys
+        assert results['TEST-4'] == {'relates to': [{'key': 'TEST-4-LINK'}]}
+        assert peak == 3
+    
+    @pytest.mark.asyncio
+    async def test_get_issues_batch_single_search(self, mcp_client):
+        """Test several tickets are fetched with one bulk JQL search"""
+        search = AsyncMock(return_value=[{'key': 'TEST-1'}, {'key': 'TEST-2'}])
+        with patch.object(mcp_client, 'search_jira_tickets', search):
+            results = await mcp_client.get_issues_batch(['TEST-1', 'test-2'])
+        
+        assert results == {'TEST-1': {'key': 'TEST-1'}, 'test-2': {'key': 'TEST-2'}}
+        search.assert_awaited_once_with("key in (TEST-1, test-2)", max_results=2)
+    
+    @pytest.mark.asyncio
+    async def test_get_issues_batch_falls_back_per_key(self, mcp_client):
+        """Test a failed bulk search falls back to individual lookups"""
+        async def fake_search(jql, max_results=50):
+            if jql.startswith("key in"):
+                raise Exception("Issue TEST-9 does not exist")
+            if jql == "key = TEST-9":
+                return []
+            if jql == "key = TEST-3":
+                raise Exception("Forbidden")
+            return [{'key': jql.split()[-1]}]
+        
+        with patch.object(mcp_client, 'search_jira_tickets', side_effect=fake_search):
+            results = await mcp_client.get_issues_batch(['TEST-1', 'TEST-9', 'TEST-3'])
+        
+        assert results['TEST-1'] == {'key': 'TEST-1'}
+        assert results['TEST-9'] is None
+        assert isinstance(results['TEST-3'], Exception)
+    
+    @pytest.mark.asyncio
+    async def test_scrape_many(self, mcp_client):
+        """Test batched scraping maps each URL to its text"""
+        urls = ["https://example.com/a", "https://example.com/b"]
+        with patch.object(mcp_client, 'scrape_web_content', AsyncMock(side_effect=lambda url: f"text of {url}")):
+            results = await mcp_client.scrape_many(urls)
+        
+        assert results == {url: f"text of {url}" for url in urls}
     
     @pytest.mark.asyncio
     async def test_get_server_info(self, mcp_client):
@@ -243,4 +544,33 @@ class TestMCPClient:
         await mcp_client.close()
         
         mock_session.close.assert_called_once()
-        assert len(mcp_client.sessions) == 0
\ No newline at end of file
+        assert len(mcp_client.sessions) == 0
+    
+    @pytest.mark.asyncio
+    async def test_close_shared_http_session(self, mcp_client):
+        """Test closing MCP client also closes the shared HTTP session"""
+        mock_http = AsyncMock()
+        mcp_client._http = mock_http
+        
+        await mcp_client.close()
+        
+        mock_http.close.assert_called_once()
+        assert mcp_client._http is None
+    
+    @pytest.mark.asyncio
+    async def test_close_continues_after_errors(self, mcp_client):
+        """Test one failing session does not stop the others from closing"""
+        failing_session = AsyncMock()
+        failing_session.close.side_effect = Exception("stdio server hung up")
+        other_session = AsyncMock()
+        mock_jira = Mock()
+        mcp_client.sessions['failing'] = failing_session
+        mcp_client.sessions['other'] = other_session
+        mcp_client._jira = mock_jira
+        
+        await mcp_client.close()
+        
+        other_session.close.assert_called_once()
+        mock_jira.close.assert_called_once()
+        assert len(mcp_client.sessions) == 0
+        assert mcp_client._jira is None
\ No newline at end of file
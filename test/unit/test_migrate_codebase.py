@@ -0,0 +1,141 @@
+import os
+import pytest
+from unittest.mock import patch
+from src.scripts.migrate_codebase import CodebaseMigrator, _NEW_APP_TEMPLATE, _copy_file, main
+
+class TestCodebaseMigrator:
+    @pytest.fixture
+    def project_root(self, temp_dir):
+        """Create a project tree with legacy prompt files"""
+        prompts_dir = temp_dir / "src" / "prompts"
+        prompts_dir.mkdir(parents=True)
+        (prompts_dir / "formal_rca_prompt").write_text("formal prompt")
+        (prompts_dir / "context").write_text("general context")
+        return temp_dir
+
+    def test_copy_file_preserves_content_and_mtime(self, temp_dir):
+        """Test file copy keeps bytes and timestamps"""
+        src = temp_dir / "source.txt"
+        src.write_bytes(b"x" * 70000)
+        os.utime(src, ns=(1_000_000_000, 2_000_000_000))
+        dst = temp_dir / "dest.txt"
+
+        _copy_file(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_mtime_ns == 2_000_000_000
+
+    def test_copy_file_without_reflink(self, temp_dir):
+        """Test file copy falls back to sendfile when reflinks are unsupported"""
+        src = temp_dir / "source.txt"
+        src.write_bytes(b"y" * 70000)
+        dst = temp_dir / "dest.txt"
+
+        with patch('fcntl.ioctl', side_effect=OSError(95, "Operation not supported")):
+            _copy_file(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_migrate_prompts(self, project_root):
+        """Test legacy prompts are copied into templates and contexts"""
+        CodebaseMigrator(str(project_root)).migrate_prompts()
+
+        prompts_dir = project_root / "src" / "prompts"
+        assert (prompts_dir / "templates" / "formal_rca_prompt.txt").read_text() == "formal prompt"
+        assert (prompts_dir / "contexts" / "context.txt").read_text() == "general context"
+        assert not (prompts_dir / "contexts" / "sap_context.txt").exists()
+
+    def test_migrate_prompts_keeps_existing(self, project_root):
+        """Test already migrated prompts are not overwritten"""
+        templates_dir = project_root / "src" / "prompts" / "templates"
+        templates_dir.mkdir()
+        (templates_dir / "formal_rca_prompt.txt").write_text("edited")
+
+        CodebaseMigrator(str(project_root)).migrate_prompts()
+
+        assert (templates_dir / "formal_rca_prompt.txt").read_text() == "edited"
+
+    def test_create_backup(self, project_root):
+        """Test existing source files are copied into the backup directory"""
+        (project_root / "src" / "app.py").write_text("app")
+        (project_root / "src" / "mcp_client.py").write_text("client")
+
+        CodebaseMigrator(str(project_root)).create_backup()
+
+        backup_dir = project_root / "backup_pre_refactor"
+        assert sorted(p.name for p in backup_dir.iterdir()) == ["app.py", "mcp_client.py"]
+        assert (backup_dir / "app.py").read_text() == "app"
+
+    def test_create_updated_main_app(self, project_root):
+        """Test the new main app is written from the template"""
+        CodebaseMigrator(str(project_root)).create_updated_main_app()
+
+        main_app = project_root / "src" / "ui" / "main_app.py"
+        assert main_app.read_text(encoding='utf-8') == _NEW_APP_TEMPLATE
+
+    def test_migrate_prompts_move(self, project_root):
+        """Test move mode renames legacy prompts into place"""
+        CodebaseMigrator(str(project_root)).migrate_prompts(move=True)
+
+        prompts_dir = project_root / "src" / "prompts"
+        assert (prompts_dir / "templates" / "formal_rca_prompt.txt").read_text() == "formal prompt"
+        assert not (prompts_dir / "formal_rca_prompt").exists()
+
+    def test_generate_migration_summary(self, project_root):
+        """Test the migration summary is written to the project root"""
+        CodebaseMigrator(str(project_root)).generate_migration_summary()
+
+        summary = (project_root / "MIGRATION_SUMMARY.md").read_text(encoding='utf-8')
+        assert "# Migration Summary" in summary
+        assert "✅ Created new directory structure" in summary
+
+    def test_migrate_prompts_without_prompts_dir(self, temp_dir):
+        """Test migration is a no-op when there is no prompts directory"""
+        CodebaseMigrator(str(temp_dir)).migrate_prompts()
+
+        assert not (temp_dir / "src").exists()
+
+    def test_main_quiet(self, project_root, monkeypatch, capsys):
+        """Test --quiet runs the migration without progress output"""
+        monkeypatch.chdir(project_root)
+
+        main(["--quiet"])
+
+        assert (project_root / "MIGRATION_SUMMARY.md").exists()
+        captured = capsys.readouterr()
+        assert "Starting codebase migration" not in captured.out + captured.err
+
+    def test_migrate_prompts_copies_without_hardlinks(self, project_root):
+        """Test migration falls back to an exclusive copy when linking fails"""
+        templates_dir = project_root / "src" / "prompts" / "templates"
+        templates_dir.mkdir()
+        (templates_dir / "formal_rca_prompt.txt").write_text("edited")
+
+        with patch('src.scripts.migrate_codebase.os.link', side_effect=OSError(18, "Invalid cross-device link")):
+            CodebaseMigrator(str(project_root)).migrate_prompts()
+
+        prompts_dir = project_root / "src" / "prompts"
+        assert (templates_dir / "formal_rca_prompt.txt").read_text() == "edited"
+        assert (prompts_dir / "contexts" / "context.txt").read_text() == "general context"
+        assert not (prompts_dir / "contexts" / "context.txt").samefile(prompts_dir / "context")
+
+    def test_create_updated_main_app_up_to_date(self, project_root):
+        """Test an identical main app is not rewritten"""
+        migrator = CodebaseMigrator(str(project_root))
+        migrator.create_updated_main_app()
+        main_app = project_root / "src" / "ui" / "main_app.py"
+        os.utime(main_app, ns=(1_000_000_000, 1_000_000_000))
+
+        migrator.create_updated_main_app()
+
+        assert main_app.stat().st_mtime_ns == 1_000_000_000
+
+    def test_main_uses_migrate_root(self, project_root, temp_dir, monkeypatch):
+        """Test MIGRATE_ROOT selects the project to migrate regardless of cwd"""
+        monkeypatch.chdir(temp_dir / "src")
+        monkeypatch.setenv("MIGRATE_ROOT", str(project_root))
+
+        main(["--quiet"])
+
+        assert (project_root / "MIGRATION_SUMMARY.md").exists()
+        assert not (temp_dir / "src" / "MIGRATION_SUMMARY.md").exists()
@@ -152,7 +152,7 @@ class TestRCAGenerator:
         ticket_id = "TEST-123"
         
         with patch('src.rca_generator.mcp_client') as mock_mcp:
-            mock_mcp.search_jira_tickets = AsyncMock(return_value=[sample_jira_ticket])
+            mock_mcp.get_issues_batch = AsyncMock(return_value={ticket_id: sample_jira_ticket})
             
             source_data = await rca_generator._collect_source_data(
                 files=[],
@@ -162,7 +162,22 @@ class TestRCAGenerator:
             
             assert ticket_id in source_data['jira_tickets']
             assert source_data['jira_tickets'][ticket_id] == sample_jira_ticket
-            mock_mcp.search_jira_tickets.assert_called_once_with(f"key = {ticket_id}", max_results=1)
+            mock_mcp.get_issues_batch.assert_called_once_with([ticket_id])
+    
+    @pytest.mark.asyncio
+    async def test_collect_source_data_jira_batch_errors(self, rca_generator):
+        """Test missing and failed tickets from a batch are recorded as errors"""
+        with patch('src.rca_generator.mcp_client') as mock_mcp:
+            mock_mcp.get_issues_batch = AsyncMock(return_value={'TEST-1': None, 'TEST-2': Exception("Forbidden")})
+            
+            source_data = await rca_generator._collect_source_data(
+                files=[],
+                urls=[],
+                jira_tickets=['TEST-1', 'TEST-2']
+            )
+            
+            assert source_data['jira_tickets']['TEST-1'] == {'error': 'Ticket not found'}
+            assert source_data['jira_tickets']['TEST-2'] == {'error': 'Forbidden'}
     
     @pytest.mark.asyncio
     async def test_collect_source_data_error_handling(self, rca_generator, temp_dir):
@@ -258,6 +273,85 @@ class TestRCAGenerator:
             assert analysis == mock_openai_response
             mock_client.messages.create.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_generate_with_anthropic_caches_system_prompt(self, rca_generator, mock_openai_response):
+        """Test a system prompt is sent as a cacheable Anthropic system block"""
+        with patch('anthropic.AsyncAnthropic') as mock_anthropic_class:
+            mock_client = AsyncMock()
+            mock_response = Mock()
+            mock_content = Mock()
+            mock_content.text = json.dumps(mock_openai_response)
+            mock_response.content = [mock_content]
+            mock_client.messages.create.return_value = mock_response
+            mock_anthropic_class.return_value = mock_client
+
+            await rca_generator._generate_with_anthropic("Chat turn", system_prompt="Case context")
+
+            system = mock_client.messages.create.call_args.kwargs['system']
+            assert system == [{"type": "text", "text": "Case context", "cache_control": {"type": "ephemeral"}}]
+
+    def test_client_is_reused_across_calls(self, rca_generator):
+        """Test each provider's SDK client is built once and then reused"""
+        with patch('openai.AsyncOpenAI') as mock_openai_class:
+            first = rca_generator._client('openrouter')
+            second = rca_generator._client('openrouter')
+
+        assert first is second
+        mock_openai_class.assert_called_once_with(api_key='test_openrouter_key', base_url='https://openrouter.ai/api/v1')
+
+    @pytest.mark.asyncio
+    async def test_warm_up_builds_default_client(self, rca_generator):
+        """Test warm-up prepares the default provider's client"""
+        with patch('openai.AsyncOpenAI') as mock_openai_class:
+            await rca_generator.warm_up()
+
+        assert rca_generator._clients['openai'] is mock_openai_class.return_value
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_openai_skips_empty_chunks(self, rca_generator):
+        """Test OpenAI-compatible streams yield only chunks that carry text"""
+        def chunk(content):
+            return Mock(choices=[Mock(delta=Mock(content=content))])
+
+        async def stream():
+            for item in (chunk("Disk"), Mock(choices=[]), chunk(None), chunk(" full")):
+                yield item
+
+        with patch('openai.AsyncOpenAI') as mock_openai_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.return_value = stream()
+            mock_openai_class.return_value = mock_client
+
+            parts = [text async for text in rca_generator.stream_chat("Why?", provider='openrouter')]
+
+        assert parts == ["Disk", " full"]
+        assert mock_client.chat.completions.create.call_args.kwargs['stream'] is True
+
+    @pytest.mark.asyncio
+    async def test_chat_returns_plain_text(self, rca_generator):
+        """Test non-streaming chat sends the same free-form request as stream_chat and returns its text"""
+        with patch('openai.AsyncOpenAI') as mock_openai_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.return_value = Mock(
+                choices=[Mock(message=Mock(content="Disk full"))]
+            )
+            mock_openai_class.return_value = mock_client
+
+            reply = await rca_generator.chat("Why?", system_prompt="Case context", provider='openrouter')
+
+        assert reply == "Disk full"
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert kwargs['messages'] == rca_generator._openai_messages("Why?", "Case context")
+        assert 'stream' not in kwargs
+
+    def test_openai_messages_keep_system_prompt_first(self, rca_generator):
+        """Test the stable system prompt precedes the user turn for prefix caching"""
+        messages = rca_generator._openai_messages("Chat turn", "Case context")
+
+        assert [m["role"] for m in messages] == ["system", "system", "user"]
+        assert messages[1]["content"] == "Case context"
+        assert len(rca_generator._openai_messages("Chat turn")) == 2
+
     @pytest.mark.asyncio
     async def test_generate_with_anthropic_error(self, rca_generator):
         """Test Anthropic analysis generation with error"""
@@ -305,7 +399,7 @@ class TestRCAGenerator:
             # Setup mocks
             mock_mcp.read_file = AsyncMock(return_value="File content")
             mock_mcp.scrape_web_content = AsyncMock(return_value="Web content")
-            mock_mcp.search_jira_tickets = AsyncMock(return_value=[{'key': 'TEST-123', 'summary': 'Test'}])
+            mock_mcp.get_issues_batch = AsyncMock(return_value={'TEST-123': {'key': 'TEST-123', 'summary': 'Test'}})
             
             mock_generate.return_value = mock_openai_response
             
@@ -0,0 +1,38 @@
+import os
+import pytest
+from src.utils import ssl_setup
+from src.utils.ssl_setup import configure_ca_bundle
+
+class TestConfigureCABundle:
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        """Start each test without CA bundle variables"""
+        monkeypatch.delenv('REQUESTS_CA_BUNDLE', raising=False)
+        monkeypatch.delenv('SSL_CERT_FILE', raising=False)
+
+    def test_linux_bundle(self, monkeypatch):
+        """Test Linux uses the system CA bundle"""
+        monkeypatch.setattr(ssl_setup, 'PLATFORM_TYPE', 'Linux')
+
+        assert configure_ca_bundle() is True
+
+        assert os.environ['REQUESTS_CA_BUNDLE'] == "/etc/ssl/certs/ca-certificates.crt"
+        assert os.environ['SSL_CERT_FILE'] == "/etc/ssl/certs/ca-certificates.crt"
+
+    def test_existing_bundle_is_kept(self, monkeypatch):
+        """Test an already configured bundle is left untouched"""
+        monkeypatch.setenv('REQUESTS_CA_BUNDLE', '/custom/bundle.pem')
+        monkeypatch.setattr(ssl_setup, 'PLATFORM_TYPE', 'Linux')
+
+        assert configure_ca_bundle() is True
+
+        assert os.environ['REQUESTS_CA_BUNDLE'] == '/custom/bundle.pem'
+        assert 'SSL_CERT_FILE' not in os.environ
+
+    def test_unsupported_platform(self, monkeypatch):
+        """Test unsupported platforms report that manual setup is needed"""
+        monkeypatch.setattr(ssl_setup, 'PLATFORM_TYPE', 'Windows')
+
+        assert configure_ca_bundle() is False
+
+        assert 'REQUESTS_CA_BUNDLE' not in os.environ